@@ -0,0 +1,255 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Reproducible benchmark of every search algorithm on the shipped maps and on maps GraphMaker generates with fixed
+# seeds. Every (map, search_algo) pair runs in a fresh process, so its peak memory is its own. The contraction
+# hierarchy of the 'ch' search is built in pure Python, which takes minutes at 100000 nodes and hours at 1000000, so
+# by default 'ch' only runs on maps of at most MAX_CH_NODES nodes.
+# Usage:
+#   python benchmark.py                                   # everything, results in benchmark.json
+#   python benchmark.py --sizes 100000 --algos ch --max-ch-nodes 0   # 'ch' on a 100000 node map too, no limit
+#   python benchmark.py --sizes 1000 10000 --algos best a_star --out new.json
+#   python benchmark.py --compare baseline.json           # run, then compare with a saved baseline
+#   python benchmark.py --results new.json --compare baseline.json   # compare two saved runs, no run
+
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # there is no resource module on Windows: peak memory is then not reported
+    resource = None
+
+import contraction
+import graphmaker
+import landmarks
+import roadmap
+import searcher
+
+SHIPPED_MAPS = ('tenNode.txt', '30node.txt', '300node.txt', 'samplemap.txt')
+GENERATED_SIZES = (1000, 10000, 100000, 1000000)
+SEARCH_ALGOS = ('breadth', 'depth', 'best', 'a_star', 'alt', 'bidirectional', 'bidirectional_a_star', 'ch')
+MAX_CH_NODES = 10000
+# metrics compared against the baseline: name, key path into a result, and the smallest increase (seconds or MB)
+# that can count as a regression, so timer noise on tiny maps does not. The p99 latency is reported but not
+# compared: with a few dozen queries it is just the slowest one
+METRICS = (('load_time', ('load_time',), 0.001), ('preprocess_time', ('preprocess_time',), 0.001),
+           ('latency_p50', ('latency', 'p50'), 0.0005), ('latency_p90', ('latency', 'p90'), 0.0005),
+           ('peak_memory_mb', ('peak_memory_mb',), 1.0))
+
+
+def generatedMap(node_count, seed, maps_dir):
+    """
+    Returns the file of the GraphMaker map with node_count nodes made with seed, generating it into maps_dir
+    the first time it is asked for
+    """
+    name = os.path.join(maps_dir, 'graphmaker_%d_seed%d' % (node_count, seed))
+    if not os.path.exists(name + '.txt'):
+        os.makedirs(maps_dir, exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            graphmaker.GraphMaker(node_count, seed=seed).export(name)
+    return name + '.txt'
+
+
+def queryPairs(road_map, count, seed):
+    """
+    Returns the fixed query set of a map: count (start_label, goal_label) pairs picked with seed
+    """
+    rng = random.Random(seed)
+    return [(rng.choice(road_map.labels), rng.choice(road_map.labels)) for _ in range(count)]
+
+
+def peakMemory():
+    """
+    Returns the peak resident memory of this process so far in MB, None where it cannot be read
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def runOne(map_file, search_algo, query_count, seed, max_ch_nodes=MAX_CH_NODES):
+    """
+    Benchmarks search_algo on map_file: loads the map, builds the preprocessing the search_algo needs (landmarks
+    for 'alt', the contraction hierarchy for 'ch'; always built, never read from or saved next to the map_file, so
+    every run times the same work) and runs the fixed query set
+    :param max_ch_nodes:
+        largest map (in nodes) to run the 'ch' search on, 0 for no limit
+    :return:
+        dictionary of the results, see run; None when the 'ch' search was skipped for the size of the map
+    """
+    started = time.perf_counter()
+    road_map = roadmap.RoadMap(map_file)
+    load_time = time.perf_counter() - started
+    if search_algo == 'ch' and max_ch_nodes and len(road_map) > max_ch_nodes:
+        return None
+    s = searcher.Searcher(search_algo, road_map, False, quiet=True)
+    preprocess_time = None
+    if search_algo in ('alt', 'ch'):
+        started = time.perf_counter()
+        if search_algo == 'alt':
+            s.landmark_tables = landmarks.build(road_map)
+        else:
+            s.contraction_hierarchy = contraction.build(road_map)
+        preprocess_time = time.perf_counter() - started
+    latencies, expanded, found = [], [], 0
+    for start_label, goal_label in queryPairs(road_map, query_count, seed):
+        started = time.perf_counter()
+        result = s.query(start_label, goal_label)
+        latencies.append(time.perf_counter() - started)
+        expanded.append(result.summary['searched_nodes'])
+        found += bool(result.found)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]).tolist() if latencies else (0.0, 0.0, 0.0)
+    return {'map': os.path.basename(map_file), 'nodes': len(road_map), 'edges': len(road_map.edge_values),
+            'search_algo': search_algo, 'queries': len(latencies), 'found': found,
+            'load_time': load_time, 'preprocess_time': preprocess_time,
+            'latency': {'mean': float(np.mean(latencies)) if latencies else 0.0, 'p50': p50, 'p90': p90,
+                        'p99': p99, 'max': max(latencies, default=0.0)},
+            'nodes_expanded': {'mean': float(np.mean(expanded)) if expanded else 0.0, 'total': sum(expanded)},
+            'peak_memory_mb': peakMemory()}
+
+
+def run(map_files, search_algos, query_count=20, seed=1, max_ch_nodes=MAX_CH_NODES):
+    """
+    Runs runOne for every map_file and search_algo, each in a fresh process; the 'ch' search only on the maps of at
+    most max_ch_nodes nodes (0 for no limit)
+    :return:
+        list of dictionaries with the map, its nodes and edges, the search_algo, the load and preprocessing
+        times (seconds, the preprocessing None for the searches that need none), the per query latency
+        mean/p50/p90/p99/max (seconds), the nodes expanded (mean and total), the number of queries that reached
+        their goal and the peak memory (MB) of the process
+    """
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for map_file in map_files:
+        for search_algo in search_algos:
+            with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(runOne, map_file, search_algo, query_count, seed, max_ch_nodes).result()
+            if result is None:
+                print('%-28s %-21s skipped: more than %d nodes (see --max-ch-nodes)' %
+                      (os.path.basename(map_file), search_algo, max_ch_nodes))
+                continue
+            print('%-28s %-21s p50= %9.3f ms ; expanded= %10.1f ; load= %7.3f s ; peak= %s MB' %
+                  (result['map'], search_algo, result['latency']['p50'] * 1000, result['nodes_expanded']['mean'],
+                   result['load_time'], 'n/a' if result['peak_memory_mb'] is None else
+                   '%.1f' % result['peak_memory_mb']))
+            results.append(result)
+    return results
+
+
+def metric(result, path):
+    """
+    Returns the value at the key path in a result, None if it is missing
+    """
+    for key in path:
+        if result is None:
+            return None
+        result = result.get(key)
+    return result
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares the results of two runs, (map, search_algo) by (map, search_algo)
+    :param threshold:
+        relative increase of a time or memory metric counted as a regression, when it is also more than the
+        noise floor of the metric (see METRICS)
+    :return:
+        list of dictionaries with the map, search_algo, metric, baseline and current values, their ratio and
+        whether it is a regression; a change in the nodes expanded (which does not depend on timing) always is
+    """
+    old = {(r['map'], r['search_algo']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = old.get((result['map'], result['search_algo']))
+        if before is None:
+            continue
+        for name, path, floor in METRICS:
+            a, b = metric(before, path), metric(result, path)
+            if a is None or b is None:
+                continue
+            ratio = b / a if a else (1.0 if b == a else float('inf'))
+            rows.append({'map': result['map'], 'search_algo': result['search_algo'], 'metric': name,
+                         'baseline': a, 'current': b, 'ratio': ratio,
+                         'regression': ratio > 1 + threshold and b - a > floor})
+        a, b = before['nodes_expanded']['total'], result['nodes_expanded']['total']
+        rows.append({'map': result['map'], 'search_algo': result['search_algo'], 'metric': 'nodes_expanded',
+                     'baseline': a, 'current': b, 'ratio': b / a if a else 1.0, 'regression': a != b})
+    return rows
+
+
+def printComparison(rows):
+    """
+    Prints the rows of a comparison, regressions marked with '!'
+    """
+    for row in rows:
+        print('%s %-28s %-21s %-16s %12.6g -> %12.6g  x%.2f' %
+              ('!' if row['regression'] else ' ', row['map'], row['search_algo'], row['metric'], row['baseline'],
+               row['current'], row['ratio']))
+    print(sum(row['regression'] for row in rows), 'regressions in', len(rows), 'comparisons')
+
+
+def environment():
+    """
+    Returns a dictionary describing the machine and library versions the benchmark ran with
+    """
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'processor': platform.processor(), 'cpu_count': os.cpu_count(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def main(argv=None):
+    """
+    Runs the benchmark (or reads saved results) and compares them with a baseline, as asked on the command line
+    :return:
+        exit status: 1 if the comparison found a regression, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks the search algorithms on fixed maps and queries.')
+    parser.add_argument('--maps', nargs='*', default=list(SHIPPED_MAPS), help='map files to run')
+    parser.add_argument('--sizes', nargs='*', type=int, default=list(GENERATED_SIZES),
+                        help='node counts of the GraphMaker maps to generate and run')
+    parser.add_argument('--algos', nargs='*', default=list(SEARCH_ALGOS), help='search algorithms to run')
+    parser.add_argument('--max-ch-nodes', type=int, default=MAX_CH_NODES,
+                        help='largest map (in nodes) to run the \'ch\' search on, 0 for no limit')
+    parser.add_argument('--queries', type=int, default=20, help='number of queries per map')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the generated maps and the query sets')
+    parser.add_argument('--maps-dir', default='benchmaps', help='directory the generated maps are kept in')
+    parser.add_argument('--out', default='benchmark.json', help='file to write the results to')
+    parser.add_argument('--results', help='compare these saved results instead of running the benchmark')
+    parser.add_argument('--compare', help='baseline results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative increase of a time or memory metric counted as a regression')
+    args = parser.parse_args(argv)
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        map_files = args.maps + [generatedMap(n, args.seed, args.maps_dir) for n in args.sizes]
+        current = {'environment': environment(), 'queries': args.queries, 'seed': args.seed,
+                   'results': run(map_files, args.algos, args.queries, args.seed, args.max_ch_nodes)}
+        with open(args.out, 'w') as f:
+            json.dump(current, f, indent=1)
+        print('Wrote', args.out)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        printComparison(rows)
+        return 1 if any(row['regression'] for row in rows) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
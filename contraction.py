@@ -0,0 +1,232 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import heapq
+import time
+
+import numpy as np
+
+import roadmap
+
+SUFFIX = '.ch.npz'
+# witness searches follow paths of at most HOP_LIMIT edges when contracting a node, ESTIMATE_HOP_LIMIT when estimating
+# the first priorities, and settle at most SETTLE_PER_HOP * hops * hops nodes (see settleLimit)
+HOP_LIMIT = 7
+ESTIMATE_HOP_LIMIT = 2
+SETTLE_PER_HOP = 10
+
+
+class ContractionHierarchy:
+    """A class to represent a contraction hierarchy of a RoadMap.
+    ...
+    The nodes are contracted one by one, least important first. Contracting a node removes it from the
+    graph and, for every pair of its neighbours whose shortest path ran through it, adds a shortcut edge
+    between them (unless a witness search finds another path that is no longer). Every node keeps the edges
+    it had when it was contracted: they all lead to nodes contracted later, i.e. up the hierarchy. A shortest
+    path query then only has to search upward from both ends, and the shortcuts it takes are unpacked into
+    the edges of the map through the node each one skips.
+
+    Attributes
+    ----------
+    rank : numpy.ndarray
+        position of every node in the contraction order
+    up_offsets : numpy.ndarray
+        start of the upward row of every node in up_targets/up_weights, plus the end of the last row
+    up_targets : numpy.ndarray
+        node id at the upper end of every upward edge
+    up_weights : numpy.ndarray
+        value of every upward edge, the path cost of the edges it stands for
+    middle : dict
+        node id a shortcut skips, with the (lower node id, higher node id) pair of the shortcut as the key
+    shortcut_count : int
+        number of shortcuts in the hierarchy
+    build_time : float
+        seconds the preprocessing took
+    """
+
+    def __init__(self, rank, up_offsets, up_targets, up_weights, middle, build_time):
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.middle = middle
+        self.shortcut_count = len(middle)
+        self.build_time = build_time
+
+    def unpack(self, road_map, node1, node2):
+        """
+        Returns the edges of the map an upward edge stands for, as a list of (node id, edge value) pairs:
+        every node after node1 on the way to node2, with the value of the edge leading to it
+        """
+        edges = []
+        pending = [(node1, node2)]
+        while pending:
+            u, v = pending.pop()
+            m = self.middle.get((u, v) if u < v else (v, u))
+            if m is None:
+                edges.append((v, road_map.edgeValue(u, v)))
+            else:
+                pending.append((m, v))
+                pending.append((u, m))
+        return edges
+
+    def save(self, path, fingerprint):
+        """
+        Writes the hierarchy to path (a .npz file)
+        :param fingerprint:
+            fingerprint of the map content the hierarchy was built for
+        """
+        keys = np.array(list(self.middle.keys()), dtype=np.int64).reshape(-1, 2)
+        with open(path, 'wb') as f:
+            np.savez(f, rank=self.rank, up_offsets=self.up_offsets, up_targets=self.up_targets,
+                     up_weights=self.up_weights, middle_keys=keys,
+                     middle_nodes=np.array(list(self.middle.values()), dtype=np.int64),
+                     build_time=self.build_time, fingerprint=np.array(fingerprint))
+
+
+def settleLimit(hop_limit):
+    """
+    Returns the largest number of nodes a witness search of at most hop_limit edges settles. The nodes within a few
+    hops of a node of a road map grow with the square of the hops, so the limit does too; it only cuts short the
+    searches that run into a crowded area, where a witness is rarely missed
+    """
+    return SETTLE_PER_HOP * hop_limit * hop_limit
+
+
+def witnessDistances(graph, source, skip, targets, max_cost, hop_limit):
+    """
+    Runs a small Dijkstra search from source that never passes through skip, to look for witness paths
+    :param targets:
+        node ids the search is looking for (a set or dict); it stops once all of them are settled
+    :param max_cost:
+        the search stops at nodes farther than max_cost
+    :param hop_limit:
+        the search only follows paths of at most hop_limit edges, and stops after settling settleLimit(hop_limit)
+        nodes
+    :return:
+        dict of the path costs found, with node id as the key. A cost may be higher than the shortest one
+        when the search stopped early, but there is always a path that cheap
+    """
+    heappush, heappop, inf = heapq.heappush, heapq.heappop, float('inf')
+    settle_limit = settleLimit(hop_limit)
+    distances = {source: 0.0}
+    heap = [(0.0, 0, source)]
+    left = len(targets)
+    settled = 0
+    while heap:
+        d, hops, u = heappop(heap)
+        if d > distances[u]:
+            continue
+        if d > max_cost:
+            break
+        if u in targets:
+            left -= 1
+            if left == 0:
+                break
+        settled += 1
+        if settled > settle_limit:
+            break
+        if hops == hop_limit:
+            continue
+        for x, w in graph[u].items():
+            w += d
+            if w < distances.get(x, inf) and x != skip:
+                distances[x] = w
+                heappush(heap, (w, hops + 1, x))
+    return distances
+
+
+def shortcutsFor(graph, node_id, hop_limit):
+    """
+    Returns the (node id, node id, path cost) shortcuts contracting node_id needs: one for each pair of its
+    neighbours with no witness path of at most hop_limit edges that is at most as cheap as the path through node_id
+    """
+    neighbours = list(graph[node_id].items())
+    shortcuts = []
+    for i, (u, wu) in enumerate(neighbours[:-1]):
+        targets = {x: wu + wx for x, wx in neighbours[i + 1:]}
+        distances = witnessDistances(graph, u, node_id, targets, max(targets.values()), hop_limit)
+        for x, cost in targets.items():
+            if distances.get(x, float('inf')) > cost:
+                shortcuts.append((u, x, cost))
+    return shortcuts
+
+
+def build(road_map, hop_limit=HOP_LIMIT, estimate_hop_limit=ESTIMATE_HOP_LIMIT):
+    """
+    Contracts every node of the road_map, in the order of the lowest priority: its edge difference (shortcuts added
+    minus edges removed) plus its level (one more than the highest level of the neighbours contracted before it), so
+    the contraction spreads evenly over the map instead of building long chains of shortcuts over shortcuts. The
+    priorities start as estimates and are worked out again, lazily, when a node reaches the top of the queue: it is
+    contracted when it still has the lowest priority, and put back otherwise
+    :param hop_limit:
+        largest number of edges of a witness path when contracting a node; a lower limit builds faster but adds
+        more shortcuts
+    :param estimate_hop_limit:
+        largest number of edges of a witness path when estimating the first priorities
+    """
+    started = time.perf_counter()
+    node_count = len(road_map)
+    graph = [{} for _ in range(node_count)]
+    for (u, v), w in zip(road_map.edge_nodes.tolist(), road_map.edge_values.tolist()):
+        if u != v and w < graph[u].get(v, float('inf')):
+            graph[u][v] = w
+            graph[v][u] = w
+    middle = {}
+    level = [0] * node_count
+    priorities = [len(shortcutsFor(graph, v, estimate_hop_limit)) - len(graph[v]) for v in range(node_count)]
+    heap = [(priority, v) for v, priority in enumerate(priorities)]
+    heapq.heapify(heap)
+    rank = np.full(node_count, -1, dtype=np.int64)
+    up_rows = [None] * node_count
+    order = 0
+    while heap:
+        old_priority, v = heapq.heappop(heap)
+        if rank[v] != -1 or old_priority != priorities[v]:
+            continue
+        shortcuts = shortcutsFor(graph, v, hop_limit)
+        priorities[v] = len(shortcuts) - len(graph[v]) + level[v]
+        if heap and priorities[v] > heap[0][0]:
+            heapq.heappush(heap, (priorities[v], v))
+            continue
+        rank[v] = order
+        order += 1
+        up_rows[v] = sorted(graph[v].items())
+        for u, _ in up_rows[v]:
+            del graph[u][v]
+            level[u] = max(level[u], level[v] + 1)
+        for u, x, cost in shortcuts:
+            if cost < graph[u].get(x, float('inf')):
+                graph[u][x] = cost
+                graph[x][u] = cost
+                middle[(u, x) if u < x else (x, u)] = v
+        graph[v] = {}
+    up_offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in up_rows], out=up_offsets[1:])
+    up_targets = np.array([x for row in up_rows for x, _ in row], dtype=np.int64)
+    up_weights = np.array([w for row in up_rows for _, w in row], dtype=np.float64)
+    return ContractionHierarchy(rank, up_offsets, up_targets, up_weights, middle, time.perf_counter() - started)
+
+
+_loaded_hierarchies = {}
+
+
+def load(road_map):
+    """
+    Returns the ContractionHierarchy of the road_map. It is read from the file next to the map_file when that was
+    written for the same map content (fingerprint); otherwise it is built and written there, so the preprocessing
+    is only done once per map. A map with no file behind it keeps its hierarchy in memory only
+    """
+    hierarchy = _loaded_hierarchies.get(road_map.fingerprint)
+    if hierarchy is not None:
+        return hierarchy
+    saved = roadmap.readIndex(road_map, SUFFIX)
+    if saved is not None:
+        middle = dict(zip(map(tuple, saved['middle_keys'].tolist()), saved['middle_nodes'].tolist()))
+        hierarchy = ContractionHierarchy(saved['rank'], saved['up_offsets'], saved['up_targets'], saved['up_weights'],
+                                         middle, float(saved['build_time']))
+    else:
+        hierarchy = build(road_map)
+        roadmap.writeIndex(road_map, SUFFIX, hierarchy)
+    _loaded_hierarchies[road_map.fingerprint] = hierarchy
+    return hierarchy
@@ -16,18 +16,22 @@ class Edge:
     #  how the edge is labeled.   If label=0, then edge is just labeled with exact straightline distance between
     #  the points.  If label is a value between 0-1, this is viewed as a percentage to distort the distance by.
     #  If label > 1, then is taken as an actual value that you want placed on that edge.
-    def __init__(self, p1,p2, label=0):
+    #  If you already know the (truncated) straightline distance between the points, pass it in as dist.
+    #  index1/index2 are the indices of the end points in the points of a GraphMaker, if the edge belongs to one.
+    def __init__(self, p1,p2, label=0, dist=None, index1=None, index2=None):
         self.p1=p1
         self.p2=p2
         self.x1=p1[0]
         self.y1=p1[1]
         self.x2=p2[0]
         self.y2=p2[1]
-        self.dist= int(graph.distance.euclidean(p1,p2))  # holds straight cartesian dist between points!
+        self.dist= int(graph.distance.euclidean(p1,p2)) if dist is None else dist  # straight cartesian dist!
         self.midx = abs(p1[0] - p2[0]) / 2 + min(p1[0], p2[0])
         self.midy = abs(p1[1] - p2[1]) / 2 + min(p1[1], p2[1])
         self.endlabel1=""
         self.endlabel2=""
+        self.index1=index1
+        self.index2=index2
         self.label=0  # holds the actual edge value of the edge.  Calc'd by distorting the distance
 
         # if a distortion was passed in, randomly distort edge length appropriately.
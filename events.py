@@ -0,0 +1,140 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+
+class SearchSink:
+    """A class to represent a receiver of the events of a Searcher.
+    ...
+    Every event method does nothing; a sink overrides the ones it wants. This base class is the silent sink:
+    a Searcher given one prints nothing at all.
+
+    Attributes
+    ----------
+    tracing : bool
+        Marks if the sink wants the per node events (nodeExplored, childrenInserted, frontierSnapshot).
+        When False the searches never call them, so they cost nothing
+    """
+
+    tracing = False
+
+    def searcherCreated(self, searcher):
+        """
+        A Searcher was created with this sink
+        """
+
+    def startGoalSet(self, searcher):
+        """
+        searcher.setStartGoal set the start_label and goal_nodes
+        """
+
+    def searchStarted(self, searcher):
+        """
+        searcher.go is about to search from the start_label for the goal_nodes
+        """
+
+    def nodeExplored(self, searcher, node_id, direction=None):
+        """
+        The search took node_id off the open_list
+        :param direction:
+            'forward' or 'backward' in the bidirectional searches, None otherwise
+        """
+
+    def childrenInserted(self, searcher, node_id):
+        """
+        The search is inserting the children of node_id into the open_list
+        """
+
+    def frontierSnapshot(self, searcher, state, open_list):
+        """
+        The open_list (node ids, in the order they would be explored) after a node was expanded
+        :param state:
+            SearchState the node ids of open_list belong to
+        """
+
+    def pathFound(self, searcher):
+        """
+        searcher.getPath traced searcher.path back from searcher.goal_node
+        """
+
+    def statsReported(self, searcher):
+        """
+        searcher.printStats was asked for the stats summary of the search to searcher.goal_node
+        """
+
+    def routeChosen(self, searcher, path):
+        """
+        searcher.go chose path as the optimal route among the goal nodes reached
+        """
+
+
+class ConsoleSink(SearchSink):
+    """A class to represent the sink that prints the events of a Searcher, the way a Searcher always has.
+    ...
+    Attributes
+    ----------
+    tracing : bool
+        also prints every node explored, the children inserted and the open_list after each expansion
+        (the verbose trace)
+    """
+
+    def __init__(self, verbose=False):
+        self.tracing = verbose
+
+    def searcherCreated(self, searcher):
+        print('z=Searcher(\'' + searcher.search_algo + '\',\'' + str(searcher.map_file) + '\', hSLD,' +
+              str(searcher.verbose) + ')')
+        print('Loaded search type', '\'' + searcher.search_algo + '\'', 'with map in file:',
+              '\'' + str(searcher.map_file) + '\'')
+
+    def startGoalSet(self, searcher):
+        print('z.setStartGoal(\'' + searcher.start_label + '\',\'' + str(searcher.goal_nodes[:]) + '\')')
+
+    def searchStarted(self, searcher):
+        print('z.go()')
+        print(searcher.search_algo, 'search: from \'' + searcher.start_label + '\' to \'', searcher.goal_nodes[:],
+              '\'')
+        if searcher.search_algo == 'breadth':
+            goal_nodes = searcher.goal_nodes
+            print('\'' + searcher.search_algo + '\' search from: \'' + searcher.start_label + '\' to \'' +
+                  str(goal_nodes[0] if len(goal_nodes) == 1 else goal_nodes) + '\'')
+
+    def nodeExplored(self, searcher, node_id, direction=None):
+        if direction is None:
+            print('Exploring node \'' + searcher.road_map.labels[node_id] + '\'')
+        else:
+            print('Exploring node \'' + searcher.road_map.labels[node_id] + '\'', direction)
+
+    def childrenInserted(self, searcher, node_id):
+        print('Inserting new children ', end='')
+        print([x[0] for x in searcher.getChildren(searcher.road_map.labels[node_id])])
+
+    def frontierSnapshot(self, searcher, state, open_list):
+        labels = searcher.road_map.labels
+        heuristic = searcher.search_algo in ('a_star', 'alt')
+        print('Open list:', [state.toString(ol, labels[ol], heuristic) for ol in open_list])
+
+    def pathFound(self, searcher):
+        print('Success! reached goal node \'' + searcher.road_map.labels[searcher.goal_node] + '\' with path:',
+              searcher.path)
+
+    def statsReported(self, searcher):
+        stats = searcher.stats
+        start_label = searcher.road_map.labels[searcher.start_node]
+        goal_label = searcher.road_map.labels[searcher.goal_node]
+        print('------------------------')
+        print('SEARCH SUMMARY STATS:')
+        print('Search Type: \'' + searcher.search_algo + '\'. Map file: \'' + str(searcher.map_file) + '\'')
+        print('Total Nodes in Graph:', stats.total_nodes)
+        print('Start Node:', '\'' + start_label + '\',', 'Goal Node(s):', '\'' + goal_label + '\'')
+        print('Searched total of', stats.searched_nodes, 'nodes out of total of', stats.total_nodes,
+              'nodes in the graph')
+        print('Ended at \'' + goal_label + '\' with path cost:', stats.totalPathCost())
+        print('Path (' + str(len(searcher.path)) + '):', searcher.path)
+        print('Frontier Size: Average=', stats.averageFrontierSize(), '; Max size=', stats.maxFrontierSize())
+        print('Depth of Search: Average=', stats.averageDepthSize(), '; Max depth=', stats.maxDepthSize())
+        print('Average branching factor=', stats.averageBranchingFactor())
+        print('Order of Node Expansion:', searcher.traversal)
+
+    def routeChosen(self, searcher, path):
+        print()
+        print('The optimal route(lowest path cost/ shortest distance) is', path)
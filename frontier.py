@@ -0,0 +1,175 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import heapq
+from array import array
+
+
+class PriorityFrontier:
+    """A class to represent the open list of the cost ordered searches (best, a_star).
+    ...
+    Nodes (node ids) are kept in a binary heap keyed on (cost, insertion order), so nodes with equal cost
+    come out first-in-first-out, the same order a stable sort of the open list gives.
+    Lowering the cost of a queued node pushes a new entry and marks the old one as stale;
+    stale entries are skipped when they reach the top of the heap.
+
+    Attributes
+    ----------
+    heap : list
+        heap of [cost, order, node_id] entries, stale entries included
+    entries : dict
+        live heap entry of every queued node, with node id as the key
+    pushes : int
+        number of entries pushed, also the insertion order of the next entry, used to break cost ties
+    stale : int
+        number of entries marked as stale
+    popped_at : int
+        number of entries pushed when the last node was popped; the entries pushed since are listed last
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.entries = {}
+        self.pushes = 0
+        self.stale = 0
+        self.popped_at = 0
+
+    def push(self, node_id, cost):
+        """
+        Adds a node to the frontier, or moves it to the new cost if it is already queued
+        :param node_id:
+            node id of the node to be added
+        :param cost:
+            priority of the node, the lowest cost is popped first
+        """
+        old_entry = self.entries.get(node_id)
+        if old_entry is not None:
+            old_entry[2] = None
+            self.stale += 1
+        entry = [cost, self.pushes, node_id]
+        self.pushes += 1
+        self.entries[node_id] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        """
+        Removes and returns the node id of the queued node with the lowest cost
+        """
+        while self.heap:
+            node_id = heapq.heappop(self.heap)[2]
+            if node_id is not None:
+                del self.entries[node_id]
+                self.popped_at = self.pushes
+                return node_id
+        raise IndexError('pop from an empty frontier')
+
+    def peekCost(self):
+        """
+        Returns the cost of the queued node with the lowest cost, without removing it
+        """
+        while self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][0]
+
+    def operationCounts(self):
+        """
+        Returns the number of pushes, pops and stale entries skipped so far. Every entry pushed is either
+        still queued, still on the heap as stale, popped or skipped, so the pops are counted without slowing pop
+        """
+        skipped = self.stale - (len(self.heap) - len(self.entries))
+        popped = self.pushes - self.stale - len(self.entries)
+        return self.pushes, popped + skipped, skipped
+
+    def __contains__(self, node_id):
+        return node_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        """
+        Iterates over the node ids of the queued nodes in the order the sorted open list kept them: the nodes
+        queued before the last pop by cost, then the nodes pushed since (new or moved to a lower cost) in the
+        order they were pushed
+        """
+        entries = sorted(self.entries.values(), key=lambda entry: entry[1])
+        older = sum(1 for entry in entries if entry[1] < self.popped_at)
+        for entry in sorted(entries[:older]) + entries[older:]:
+            yield entry[2]
+
+
+class StackFrontier:
+    """A class to represent the open list of the depth first search.
+    ...
+    A last-in-first-out stack of node ids. Pushing a node that is already on the stack moves it to
+    the top: the new entry is pushed and the old one, further down, is left behind as stale and
+    skipped when it is popped. position gives O(1) membership and stale checks.
+
+    Attributes
+    ----------
+    stack : list
+        node ids, top of the stack last, stale entries included
+    position : array of int
+        index in stack of the live entry of every node, -1 if the node is not on the stack
+    size : int
+        number of live entries on the stack
+    pushes : int
+        number of entries pushed
+    stale : int
+        number of entries left behind as stale
+    """
+
+    def __init__(self, node_count):
+        self.stack = []
+        self.position = array('l', [-1]) * node_count
+        self.size = 0
+        self.pushes = 0
+        self.stale = 0
+
+    def push(self, node_id):
+        """
+        Puts a node on top of the stack, moving it there if it is already on the stack
+        :param node_id:
+            node id of the node to be added
+        """
+        if self.position[node_id] == -1:
+            self.size += 1
+        else:
+            self.stale += 1
+        self.pushes += 1
+        self.position[node_id] = len(self.stack)
+        self.stack.append(node_id)
+
+    def pop(self):
+        """
+        Removes and returns the node id on top of the stack
+        """
+        while self.stack:
+            node_id = self.stack.pop()
+            if self.position[node_id] == len(self.stack):
+                self.position[node_id] = -1
+                self.size -= 1
+                return node_id
+        raise IndexError('pop from an empty frontier')
+
+    def operationCounts(self):
+        """
+        Returns the number of pushes, pops and stale entries skipped so far, counted as in PriorityFrontier
+        """
+        skipped = self.stale - (len(self.stack) - self.size)
+        popped = self.pushes - self.stale - self.size
+        return self.pushes, popped + skipped, skipped
+
+    def __contains__(self, node_id):
+        return self.position[node_id] != -1
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterates over the node ids on the stack from the top down
+        """
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.position[self.stack[i]] == i:
+                yield self.stack[i]
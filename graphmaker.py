@@ -15,6 +15,7 @@
 #
 ## Usage examples:
 ##  x=GraphMaker(20)    # create a new random 20 node map.
+#   x=GraphMaker(1000000, seed=7)    # a reproducible 1M node map: the same seed always gives the same points
 #
 #   x.plot()  # now graphically show it
 #   x.edit()  # enter edit mode.  It repeatedly asks you to add/delete edges.
@@ -24,16 +25,21 @@ __author__ = "Eck Doerry"
 __copyright__ = "Copyright 2018, Northern Arizona University, Flagstaff AZ"
 
 
+import hashlib
+import sys
+
 import numpy as np
 import scipy.spatial as graph
 import matplotlib.pyplot as plt
 from node import Node
 from edge import Edge
+import roadmap
 
 class GraphMaker:
 
-    def __init__(self,nodeCount=10):
+    def __init__(self,nodeCount=10,seed=None):
         self.numNodes=nodeCount  # number of nodes to create in graph.  
+        self.rng=np.random.default_rng(seed)  # random generator of the points. A fixed seed gives reproducible maps
         self.expansion=200  # how wide the graph will be. Basically a factor that increases the x-y extents of plane
         self.mindist = 0.3 * self.expansion  # the minimum separation distance between nodes.  Prevents cluttered graphs
         # distDistortion.  Often you might want to have a graph where the distances are *based on* the actual
@@ -46,12 +52,17 @@ class GraphMaker:
         self.edgeLoss= 0.1
         self.nodes=[] # array of node objects in this graph
         self.edges=[] # array of edges in this graph
+        # lookups kept up to date as the graph changes, so no method has to scan the nodes or edges
+        self.nodeIndex={}  # index in nodes of every node, with its label as the key
+        self.pointIndex={}  # index in nodes of every node, with its (x,y) location as the key
+        self.edgeIndex={}  # position in edges of every edge, keyed on the (lower, higher) indices in nodes of its ends
         self.buildGraph()  # Build the new graph!
 
     # if you don't like the graph generated, just try another one!
     def redo(self,numNodes=-1):
         self.edges=[]
         self.nodes=[]
+        self.edgeIndex={}
         if numNodes>0: self.numNodes=numNodes
         plt.close()
         self.buildGraph()
@@ -77,31 +88,33 @@ class GraphMaker:
 
 
     # This method lets one whack out edges.  So you can edit away edges after you generate the graph!
+    # The last edge is moved into the place of the whacked one, so no other edge has to move
     def whackEdge(self,node1,node2):
-        node1=node1.upper()
-        node2=node2.upper()
-        newEdges=[]
-        for edge in self.edges:
-            if edge.connects(node1,node2):  # whack the edge
-                plt.plot([edge.x1, edge.x2], [edge.y1, edge.y2], 'b-', color='w', linewidth=0.5)  # make the lines
-                plt.text(edge.midx, edge.midy, edge.label, size='x-small', color='w')  # label the edge at its midpoint
-                plt.pause(0.05)
-            else: newEdges.append(edge)
-        self.edges=newEdges
+        i=self.edgeIndex.pop(self.edgeKey(node1.upper(),node2.upper()),None)
+        if i is not None:  # whack the edge
+            edge=self.edges[i]
+            plt.plot([edge.x1, edge.x2], [edge.y1, edge.y2], 'b-', color='w', linewidth=0.5)  # make the lines
+            plt.text(edge.midx, edge.midy, edge.label, size='x-small', color='w')  # label the edge at its midpoint
+            plt.pause(0.05)
+            last=self.edges.pop()
+            if i<len(self.edges):
+                self.edges[i]=last
+                self.edgeIndex[(min(last.index1,last.index2),max(last.index1,last.index2))]=i
 
     def buildEdge(self,node1,node2):
         node1 = node1.upper()
         node2 = node2.upper()
-        for edge in self.edges:  # avoid building redundant new edges!
-            if edge.connects(node1,node2):
-                print("already an edge  from "+node1+" to "+node2)
-                return
+        key=self.edgeKey(node1,node2)
+        if key in self.edgeIndex:  # avoid building redundant new edges!
+            print("already an edge  from "+node1+" to "+node2)
+            return
         p1=self.nodeLocation(node1)
         p2=self.nodeLocation(node2)
-        if p1!=0 and p2!=0:    # both nodes exist
+        if p1 is not None and p2 is not None:    # both nodes exist
             print("building edge!")
-            edge=Edge(p1,p2, self.distDistortion)  # make a new edge
+            edge=Edge(p1,p2, self.distDistortion, index1=self.nodeIndex[node1], index2=self.nodeIndex[node2])
             edge.setLabels(node1,node2)
+            self.edgeIndex[key]=len(self.edges)
             self.edges.append(edge)
             plt.plot([edge.x1, edge.x2], [edge.y1, edge.y2], 'b-', color='k', linewidth=0.5)  # make the lines
             plt.text(edge.midx, edge.midy, edge.label, size='x-small',color='k')  # label the edge at its midpoint
@@ -122,47 +135,63 @@ class GraphMaker:
     def buildGraph(self):
         pointsArray = self.genPoints()  # makes the array of (x,y) points to connect
         tri=graph.Delaunay(pointsArray)  # creates a planar graph on the given points. Creates a tri data structure.
-        triangles=pointsArray[tri.simplices]  # list of triplets of three points. Each set of three points marks a
-        # triangle laid out by Delauney.  Next need to extract the edges (point-to-point connections) from this.
+        # tri.simplices is the list of triplets of point indices. Each triplet marks a triangle laid out by Delauney.
+        # Next need to extract the edges (point-to-point connections) from this.
         # Now extract the unique edges from all the triangles to generate all edges in the graph
-        self.makeEdges(triangles)  # populates self.edges with Edge objects
+        self.makeEdges(tri.simplices, pointsArray)  # populates self.edges with Edge objects
         # Finally, turn the points array into actual Node objects.
         Node.reset(Node)  # Starts Node labeling at 'A'
-        self.nodes=list(map(Node,pointsArray[:,0], pointsArray[:,1]))  #populates self.nodes with Node objects
+        xs, ys = pointsArray[:,0].tolist(), pointsArray[:,1].tolist()
+        self.nodes=list(map(Node,xs,ys))  #populates self.nodes with Node objects
+        self.nodeIndex={node.label: i for i, node in enumerate(self.nodes)}
+        self.pointIndex={point: i for i, point in enumerate(zip(xs,ys))}
+        self.edgeIndex={(edge.index1,edge.index2): i for i, edge in enumerate(self.edges)}
         self.labelEdges()  # Just to make edge objects complete, go back and add endlabel (nodelabels) to those objects
 
+    # Returns the edgeIndex key of the edge between two nodes given by label, None if either node doesn't exist
+    def edgeKey(self,label1,label2):
+        i1, i2 = self.nodeIndex.get(label1), self.nodeIndex.get(label2)
+        if i1 is None or i2 is None: return None
+        return (min(i1,i2), max(i1,i2))
+
+
+    #  Makes all the edges in the new graph, based on the array of simplices (triplets of point indices, basically
+    # triangles) produced by Delauney and the points they index.  Appends the new edges to the "edges" array.
+    # All done on numpy arrays at once, so it is linear in the number of triangles.
+    def makeEdges(self,simplices,pointsArray):
+        # extract the three arcs of every triangle as point-index pairs, lower index first.  An edge shared by two
+        # adjacent triangles then gives the same pair twice: np.unique keeps each pair once.
+        pairs = np.concatenate((simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [2, 0]])).astype(np.int64)
+        pairs.sort(axis=1)
+        n = len(pointsArray)
+        keys = np.unique(pairs[:, 0] * n + pairs[:, 1])
+        pairs = np.column_stack((keys // n, keys % n))
 
-    #  Makes all the edges in the new graph, based on the array of tris (basically triagles) produced by Delauney and
-    # pass in.  Appends the new edges to the "edges" array.
-    def makeEdges(self,triArray):
-        edges = []  # temp array holding unique ((x,y),(x1,y1)) edge segments found so far
-
-        # an important helper. When we extract a new edges from a triagle, it might well be the duplicate
-        # of an edge from an adjacent triangle created by Delauney.
-        def checkAddAdj(adjs):
-            for adj in adjs:
-                if (adj in edges) or ((adj[1], adj[0]) in edges):  # if edges already in there, skip it
-                    continue
-                else:
-                    edges.append((adj[0], adj[1]))
-        # go through the triangle array, extract each edge, check that we don't have it already, and add to edges.
-        for triplet in triArray:
-            s = list(map(list,triplet))
-            adjs = [(s[0], s[1]), (s[1], s[2]), (s[2], s[0])]  # extracting the arcs between the points
-            checkAddAdj(adjs)
-
-        # okay, now edges array contains all unique edge segment.  Now make edge objects out of them!
         # use edgeLoss value to randomly drop some pct of Edges
-        for edge in edges:
-            if (np.random.rand() > self.edgeLoss):
-                self.edges.append(Edge(edge[0],edge[1],self.distDistortion))  #make Edge object
-            else: print("blip")
-
-    # For each edge, finds the label for its endpoints in the nodes, and adds to edge object.
+        kept = self.rng.random(len(pairs)) > self.edgeLoss
+        if not kept.all(): print("blip x"+str(len(pairs)-np.count_nonzero(kept)))
+        pairs = pairs[kept]
+
+        # okay, now pairs contains all unique edges kept.  Work out their lengths and edge values in one go, the
+        # same way an Edge does (see Edge): roads are ALWAYS longer than SLD, by up to distDistortion of it
+        p1 = pointsArray[pairs[:, 0]]
+        p2 = pointsArray[pairs[:, 1]]
+        dists = np.hypot(p1[:, 0] - p2[:, 0], p1[:, 1] - p2[:, 1]).astype(np.int64)
+        if self.distDistortion == 0: labels = dists
+        elif self.distDistortion < 1:
+            distortions = self.rng.random(len(dists)) * (dists * self.distDistortion)  # within the adjustment range
+            labels = (dists + distortions).astype(np.int64)
+        else: labels = np.full(len(dists), self.distDistortion)
+        # Now make edge objects out of them, remembering the point index of each end
+        self.edges.extend(map(Edge, p1.tolist(), p2.tolist(), labels.tolist(), dists.tolist(),
+                              pairs[:, 0].tolist(), pairs[:, 1].tolist()))
+
+    # For each edge, finds the label for its endpoints in the nodes (by their point index), and adds to edge object.
     def labelEdges(self):
+        nodes=self.nodes
         for edge in self.edges:
-            edge.endlabel1=self.getNodeAtXY(edge.p1).label
-            edge.endlabel2=self.getNodeAtXY(edge.p2).label
+            edge.endlabel1=nodes[edge.index1].label
+            edge.endlabel2=nodes[edge.index2].label
 
     # Function to ask the roadgraph to plot itself.  If not interactive, need to call plot.show() to see it.
     def plot(self):
@@ -181,62 +210,73 @@ class GraphMaker:
     # Function to return the roadgraph as simple list that can be fed to search program.
     # prints it out, one line per edge.  Format (nodeLabel1, nodeLabel2, edgeLabel, ((x1,y1),(x2,y2),(midx,midy)) )
     # if you pass it a text string, it will print to that, else prints to console
-    def export(self,outfile=0):
-        if outfile != 0:
-            outfilename=outfile+".txt"
-            out=open(outfilename,'w')
-        for edge in self.edges:
-            theEdge=((self.getNodeAtXY(edge.p1).label,self.getNodeAtXY(edge.p2).label,edge.label))
-            locInfo=((edge.p1,edge.p2))
-            if outfile:
-                out.write(str(theEdge+locInfo)+"\n")
-            else:
-                print(theEdge+locInfo)
-        if outfile: out.close()
+    # binary=True writes the map in the binary map format (outfile.rmap, see RoadMap.save) instead of outfile.txt,
+    # straight from the point indices of the edges, without parsing the lines back in.
+    # The lines are formatted in one pass from the labels the edges already carry, and written in one go.
+    def export(self,outfile=0,binary=False):
+        lineFormat="('%s', '%s', %r, [%d, %d], [%d, %d])\n"
+        lines=[lineFormat % (edge.endlabel1,edge.endlabel2,edge.label,edge.x1,edge.y1,edge.x2,edge.y2)
+               for edge in self.edges]
+        if outfile and binary:
+            self.roadMap(outfile+".rmap",lines).save(outfile+".rmap")
+        elif outfile:
+            with open(outfile+".txt",'w') as out: out.write(''.join(lines))
+        else:
+            sys.stdout.write(''.join(lines))
         print("tada!")
 
+    # Returns the graph as a RoadMap (named mapFile) built straight from the arrays of its edges.
+    # lines are the exported lines of the map, hashed for its fingerprint: the same map as reading them would give
+    def roadMap(self,mapFile,lines):
+        ends=np.array([(edge.index1,edge.index2) for edge in self.edges],dtype=np.int64).reshape(-1,2)
+        values=np.array([edge.label for edge in self.edges],dtype=np.float64)
+        xs=np.array([node.x for node in self.nodes],dtype=np.int64)
+        ys=np.array([node.y for node in self.nodes],dtype=np.int64)
+        fingerprint=hashlib.sha256(''.join(lines).encode()).hexdigest()
+        return roadmap.RoadMap.fromArrays(mapFile,[node.label for node in self.nodes],xs,ys,ends,values,fingerprint)
+
 
     # Returns a node that is located at a given point
     def getNodeAtXY(self,aPoint):  # gets the Node at location x-y of point
-        for node in self.nodes:
-            if (node.x==aPoint[0]) and (node.y==aPoint[1]): return node
-        return 0
+        i=self.pointIndex.get((aPoint[0],aPoint[1]))
+        return 0 if i is None else self.nodes[i]
 
     # Just returns x-y location of a node, given its label
     def nodeLocation(self,label):  # finds and returns the location of node labeled 'label'
-        for node in self.nodes:
-            if node.label==label: return [node.x,node.y]
+        i=self.nodeIndex.get(label)
+        if i is not None: return [self.nodes[i].x,self.nodes[i].y]
         print("nodeLoc: No node with label "+label+" exists")
 
     # a key function.  Generates a random set of points that are some minimum distance apart.
+    # Candidate points are drawn in batches from a normal spread around the origin.  A candidate is kept if it is at
+    # least mindist from every point kept so far (checked at once for the batch with a cKDTree of the kept points)
+    # and from every earlier candidate of its batch (the pairs closer than mindist, found with a cKDTree of the
+    # batch).  The spread starts at expansion, or wider when numNodes points would not fit there at mindist, and
+    # widens whenever a batch hardly finds any room: near-linear time, so 1M node maps take seconds.
     def genPoints(self):
-        # While you still need points, generate random points, add to set if min dist from all currently found points.
-        points = []  # An array to put your points in as you find them.
-        found = 0  # Tracks points found so far
-
-        # Simple function that checks that candidate points are some min dist from all other points.
-        # keeps it from making cluttered graphs!
-        def checkpt(apoint, allpoints):
-            for point in allpoints:
-                dst = graph.distance.euclidean(point, apoint)
-                if (dst < self.mindist): return False
-            return True
-
-        while found < self.numNodes:
-            p1 = self.expansion * np.random.randn(2)
-            if checkpt(p1, points):
-                points.append(p1)
-                found = found + 1
-                # print("found one:"+str(found))
-            if len(points) == 0: points.append(p1)
-
-        # Now just turn the points into a numpy array
-        pArray = np.array(points)
-        # print(points)
+        n = self.numNodes
+        spread = max(self.expansion, self.mindist * np.sqrt(n) / 2.5)
+        pArray = np.empty((0, 2))  # An array to put your points in as you find them.
+        while len(pArray) < n:
+            needed = n - len(pArray)
+            candidates = spread * self.rng.standard_normal((max(256, 2 * needed, n // 8), 2))
+            batchSize = len(candidates)
+            if len(pArray):   # drop candidates too close to the points already found
+                dst, _ = graph.cKDTree(pArray, balanced_tree=False, compact_nodes=False).query(
+                    candidates, distance_upper_bound=self.mindist)
+                candidates = candidates[np.isinf(dst)]
+            # drop the later candidate of every pair that is too close.  Keeps a few less than needed, never too close
+            pairs = graph.cKDTree(candidates, balanced_tree=False, compact_nodes=False).query_pairs(
+                self.mindist, output_type='ndarray')
+            keep = np.ones(len(candidates), dtype=bool)
+            keep[pairs[:, 1]] = False
+            found = candidates[keep][:needed]
+            pArray = np.vstack([pArray, found])
+            if len(pArray) < n and len(found) < 0.05 * batchSize: spread *= 1.25  # crowded: spread out
 
         # AWESOME.  Now shift all the points into the positive x-y quadrant
-        xmin = min(pArray[:, [0]])[0]
-        ymin = min(pArray[:, [1]])[0]
+        xmin = pArray[:, 0].min()
+        ymin = pArray[:, 1].min()
         xshift = abs(xmin) + 1
         yshift = abs(ymin) + 1
         posArray = pArray + [xshift, yshift]
@@ -16,17 +16,41 @@
 # x.exploreEdges('G',['C','B'])  # mark the edges coming from parent 'G' and going to children [C, B].
 #
 # x.reset()  # reset the visualizer, e.g., in preparation for a new search.
+# x.hold()  # keep the plot on screen until its window is closed
 #
+# The plot is drawn with one LineCollection for the edges and one scatter for the vertices, so painting an edge or a
+# node just recolors it.  Labels are only drawn for the nodes and edges in view when there are at most labelLimit of
+# them together (every label makes each redraw slower); on a bigger map, zoom in to see them.  Painting doesn't block:
+# the window is redrawn at most once every refreshInterval seconds while a search is animated.
 # ##
 
 __author__ = "Eck Doerry"
 __copyright__ = "Copyright 2018, Northern Arizona University, Flagstaff AZ"
 
+import time
+
 import numpy as np
 import scipy.spatial as graph
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from node import Node
 from edge import Edge
+import roadmap
+
+
+### PAINTEDLINES
+# The edges of a GraphViz plot: a LineCollection that takes in the paints of its GraphViz whenever it is drawn, so
+# painting stays cheap and every redraw (a repaint, a savefig, a window resize) shows the latest paints.
+class PaintedLines(LineCollection):
+
+    def __init__(self, viz, **kwargs):
+        super().__init__(viz.segments, colors=viz.edgeColors, linewidths=viz.edgeWidths, **kwargs)
+        self.viz=viz
+
+    def draw(self, renderer):
+        self.viz.applyPaint()
+        super().draw(renderer)
 
 
 ### GRAPHVIZ
@@ -40,9 +64,43 @@ class GraphViz:
     def __init__(self):
         self.nodes=[]
         self.edges=[]
-        self.nodeIndex={}
+        self.nodeIndex={}   # node label -> [x,y] location
+        self.nodeNumber={}  # node label -> position in self.nodes, also its vertex in the scatter
+        self.edgeNumber={}  # (label1,label2) both ways round -> position in self.edges, also its line in the collection
         self.markedNodes=[]
         self.markedEdges=[]
+        self.labelLimit=200  # most node and edge labels (together) drawn at once.  More in view and they're culled
+        self.refreshInterval=0.1  # seconds between two redraws of the window while a search is animated
+        self.axes=None  # the plot and its artists, made by plot()
+        self.nodeLabels={}
+        self.edgeLabels={}
+        self.vertexMarkers={}
+        self.lastPaint=0
+        self.indexGraph()
+
+    # Build the lookup dicts and the coordinate arrays the plot is drawn from, and a blank paint state.
+    # Called once a graph is loaded.
+    def indexGraph(self):
+        self.nodeIndex={node.label:[node.x,node.y] for node in self.nodes}
+        self.nodeNumber={node.label:i for i,node in enumerate(self.nodes)}
+        self.edgeNumber={}
+        for i,edge in enumerate(self.edges):
+            self.edgeNumber[(edge.endlabel1,edge.endlabel2)]=i
+            self.edgeNumber[(edge.endlabel2,edge.endlabel1)]=i
+        self.nodeXY=np.array([[node.x,node.y] for node in self.nodes],dtype=float).reshape(-1,2)
+        self.segments=np.array([[edge.p1,edge.p2] for edge in self.edges],dtype=float).reshape(-1,2,2)
+        self.edgeMids=np.array([[edge.midx,edge.midy] for edge in self.edges],dtype=float).reshape(-1,2)
+        self.clearPaint()
+
+    # Forget every paint.  Paints are kept here, not in the plot, so nodes and edges painted before plot() is
+    # called show up once it is.
+    def clearPaint(self):
+        self.edgeColors=np.tile(to_rgba('k'),(len(self.edges),1))  # painting an edge changes its entry here
+        self.edgeWidths=np.full(len(self.edges),0.5)
+        self.nodeStyles={}  # node label -> (color,weight,size) it was last painted with
+        self.vertexMarks={}  # node label -> (shape code,color) plotVertex gave it
+        self.extraLines=[]  # (p1,p2,color) of every line painted between two nodes with no edge between them
+        self.dirty=False
 
 
 ######   EXTERNAL INTERFACE METHODS   ############
@@ -52,48 +110,60 @@ class GraphViz:
     def reset(self):
         self.markedEdges = []
         self.markedNodes = []
+        self.clearPaint()
         plt.close()
         self.plot()
 
     # A function to load up a graph to visualize. The filename specified by "infile" should contain  a well-formed
     # input file describing the graph. The format is a set of edge descriptions, one line per edge, of following format:
     #    (nodeLabe1, nodeLabel2, edgeLabel, [x1,y1],[x2,y2],[midx,midy])
-    # Reads each line and creates the appropriate node/edge objects.
+    # The file is parsed by the shared roadmap loader, so a Searcher on the same file doesn't parse it again.
     def loadGraphFromFile(self, infile):
-        with open(infile) as f:
-            lines = f.readlines()
-        cleanlines = [x.strip() for x in lines] #strip off any weird leading or trailing spaces.
-        for line in cleanlines:
-            line=line.replace('\'','').replace('[','').replace(']','').replace(' ','').strip('()')
-            rawEdge=line.split(',') # now just have nice clean comma-separated values. Make it a list
-            [l1,l2,label,x1,y1,x2,y2]=rawEdge  # grab all the components of the edge
+        self.loadGraphFromMap(roadmap.load(infile))
+
+    # Load a graph from an already parsed RoadMap. Creates the appropriate node/edge objects for each edge.
+    def loadGraphFromMap(self, roadMap):
+        for (l1,l2,label,p1,p2) in roadMap.getEdges():
             if l1 not in self.nodeIndex:
-                self.nodeIndex[l1]=(int(x1),int(y1))
-                self.nodes.append(Node(int(x1),int(y1),l1))
+                self.nodeIndex[l1]=p1
+                self.nodes.append(Node(p1[0],p1[1],l1))
             if l2 not in self.nodeIndex:
-                self.nodeIndex[l2] = (int(x2), int(y2))
-                self.nodes.append(Node(int(x2), int(y2), l2))
+                self.nodeIndex[l2] = p2
+                self.nodes.append(Node(p2[0], p2[1], l2))
             # Now build and Edge object for it
-            newEdge=Edge((int(x1),int(y1)), (int(x2),int(y2)), int(label))
+            newEdge=Edge(p1, p2, label)
             newEdge.setLabels(l1,l2)
             self.edges.append(newEdge)
-        f.close()
+        self.indexGraph()
 
     # Function to ask a loaded graph to plot itself.  If you're not in interactive Python mode, may need to call
     # plot.show() to see it.   Assumes that a graph has been loaded first!
     def plot(self):
         plt.close()  # just in case previous graphs were open!
-        plt.ion  # turn on interactive mode.  Not sure if it's critical
-        #  first plot the nodes
-        plt.plot([x.x for x in self.nodes], [x.y for x in self.nodes], 'ko',
-                 color="#BBBCBD")  # plot vertices circles first
-        for node in self.nodes:  # now plot the labels
-            plt.text(node.x, node.y, node.label, color='b', weight='normal')
-        # Now plot in the edges
-        for edge in self.edges:
-            plt.plot([edge.x1, edge.x2], [edge.y1, edge.y2], 'b-', color='k', linewidth=0.5)  # make the lines
-            plt.text(edge.midx, edge.midy, edge.label, size='x-small')  # label the edge at its midpoint
-        self.paintGraph()
+        plt.ion()  # interactive mode, so showing the plot doesn't block
+        fig,self.axes = plt.subplots()
+        # all the edges are one collection, colored from edgeColors/edgeWidths
+        self.edgeLines=PaintedLines(self,zorder=1)
+        self.axes.add_collection(self.edgeLines)
+        self.vertices=self.axes.scatter(self.nodeXY[:,0],self.nodeXY[:,1],s=36,color="#BBBCBD",zorder=2)
+        self.axes.autoscale_view()
+        self.nodeLabels={}  # node number -> its label Text, made the first time it comes into view
+        self.edgeLabels={}  # edge number -> its label Text, likewise
+        self.vertexMarkers={}  # node label -> the marker drawn for its vertexMarks entry
+        for label,(mtype,color) in list(self.vertexMarks.items()): self.plotVertex(label,mtype,color)
+        for p1,p2,color in self.extraLines: self.axes.plot([p1[0],p2[0]],[p1[1],p2[1]],color=color,linewidth=1)
+        self.labelsShown=True
+        self.cullLabels()
+        self.axes.callbacks.connect('xlim_changed',self.cullLabels)  # zooming or panning shows/hides labels
+        self.axes.callbacks.connect('ylim_changed',self.cullLabels)
+        plt.show(block=False)
+        self.paintGraph(force=True)
+
+    # Keeps the plot on screen (blocking) until its window is closed, e.g. at the end of a script animating a search
+    def hold(self):
+        self.paintGraph(force=True)
+        plt.ioff()
+        plt.show()
 
 
     # Takes in start node label, and repaints that node as start (ie, different node shape and green)
@@ -161,14 +231,18 @@ class GraphViz:
 ##  Also include various little methods useful for debugging or other purposes.
 
     # Takes in a node label and color.  If node exists, paint its label that color
+    # The style is remembered, so a label culled now gets it when it comes into view. While labels are culled, the
+    # vertex of the node takes the color instead.
     def paintNode(self,nodeLabel,color='r',weight='normal', size='medium'):
-        p1=self.nodeLoc(nodeLabel)
-        if p1:
-            plt.text(p1[0], p1[1], nodeLabel, color=color, size=size, weight=weight)  # repaint the label!
-            return 1
-        else:
+        i=self.nodeNumber.get(nodeLabel)
+        if i is None:
             print("PaintNode: No node labeled "+nodeLabel+" exists.")
             return 0
+        self.nodeStyles[nodeLabel]=(color,weight,size)
+        if i in self.nodeLabels:
+            self.nodeLabels[i].set(color=color,weight=weight,size=size)  # repaint the label!
+        self.dirty=True
+        return 1
 
     # Load a graph given a list of nodes object and a list of edge objects.  Useful convenience when used  in
     #  conjunction with a GraphMaker,  allow you to just grab the Edge objects directly from the GraphMaker, rather
@@ -176,6 +250,7 @@ class GraphViz:
     def loadGraphFromObjects(self, nodes, edges):
         self.nodes = nodes
         self.edges = edges
+        self.indexGraph()
 
     # Useful if some outside object wants to get a list of edges in the visualization.
     # Just returns a big list of edges in form (endlabel,endlabel, edgelabel,[x1,y1],[x2,y2])
@@ -187,34 +262,96 @@ class GraphViz:
 
     #  Just returns a graphed node object based on its label
     def getNodeByLabel(self, nodeLabel):
-        for node in self.nodes:
-            if node.label == nodeLabel: return node
+        if nodeLabel in self.nodeNumber: return self.nodes[self.nodeNumber[nodeLabel]]
         print("getNodebyLabel: No node labeled " + nodeLabel + " exists")
         return 0
 
     # a function that repaints (replots) an edge on the graphical plot
     # take in to node labels and optionally, a color
+    # Edges of the graph are recolored in place; two nodes with no edge between them get a line of their own.
     def paintEdge(self, startLabel, endLabel, color='r'):
+        i = self.edgeNumber.get((startLabel, endLabel))
+        if i is not None:
+            self.edgeColors[i] = to_rgba(color)
+            self.edgeWidths[i] = 1
+            self.dirty = True
+            return
         p1 = self.nodeLoc(startLabel)
         p2 = self.nodeLoc(endLabel)
-        plt.plot([p1[0], p2[0]], [p1[1], p2[1]], color=color, linewidth=1)  # repaint the edge
+        if p1 and p2:
+            self.extraLines.append((p1, p2, color))
+            if self.axes is not None:
+                self.axes.plot([p1[0], p2[0]], [p1[1], p2[1]], color=color, linewidth=1)
 
     ## Main External interface functions for using a RoadGraph
-    def paintGraph(self):
-        plt.pause(1000)
+    # Redraws the window with the paints done so far, at most once every refreshInterval seconds after the last
+    # redraw ended (or right away if forced).  Never blocks: the search goes on while the window catches up.  Paints
+    # only reach the plot artists on a redraw, so a paint costs the same whatever the size of the map.
+    def paintGraph(self, force=False):
+        if self.axes is None: return
+        if force or time.perf_counter() - self.lastPaint >= self.refreshInterval:
+            canvas = self.axes.figure.canvas
+            canvas.draw_idle()
+            canvas.flush_events()
+            self.lastPaint = time.perf_counter()  # counted from the end of the redraw, so slow redraws don't pile up
+
+    # Pushes the paints done since the last redraw into the plot artists.  Called by the edges as they are drawn.
+    def applyPaint(self):
+        if not self.dirty: return
+        self.edgeLines.set_color(self.edgeColors)
+        self.edgeLines.set_linewidths(self.edgeWidths)
+        if not self.labelsShown: self.vertices.set_color(self.vertexColors())
+        self.dirty = False
 
     # Job is to (re)plot a node vertex in different shape/color. Takes in node label, a new vertex shape code,
     # and a new color, and redraws the vertex associated with that node accordingly.
     def plotVertex(self,nodeLabel,mtype,color):
         loc= self.nodeLoc(nodeLabel)
-        plt.plot(loc[0],loc[1],color+mtype)
-
-
-
+        if not loc: return
+        self.vertexMarks[nodeLabel]=(mtype,color)
+        if self.axes is None: return  # drawn when the plot is made
+        if nodeLabel in self.vertexMarkers: self.vertexMarkers[nodeLabel].remove()  # one marker per node, the last one
+        self.vertexMarkers[nodeLabel],=self.axes.plot(loc[0],loc[1],color+mtype,zorder=3)
+
+    # Colors of the vertices while labels are culled: the color each node was last painted with, grey if never
+    # painted or painted back to black
+    def vertexColors(self):
+        colors=np.tile(to_rgba("#BBBCBD"),(len(self.nodes),1))
+        for label,(color,weight,size) in self.nodeStyles.items():
+            if color!='k': colors[self.nodeNumber[label]]=to_rgba(color)
+        return colors
+
+    # Level of detail: shows the labels of the nodes and edges in view when there are at most labelLimit of them
+    # together, hides them all otherwise.  Label Texts are only made when first shown, so a huge map never makes most
+    # of them.
+    # Called on every zoom/pan; takes the axes as the matplotlib callbacks pass it in.
+    def cullLabels(self, axes=None):
+        (x0,x1),(y0,y1)=sorted(self.axes.get_xlim()),sorted(self.axes.get_ylim())
+        def inView(xy):
+            return np.flatnonzero((xy[:,0]>=x0)&(xy[:,0]<=x1)&(xy[:,1]>=y0)&(xy[:,1]<=y1)).tolist()
+        nodesInView,edgesInView=inView(self.nodeXY),inView(self.edgeMids)
+        labelsShown=len(nodesInView)+len(edgesInView)<=self.labelLimit
+        if not labelsShown: nodesInView,edgesInView=[],[]
+        for i in nodesInView:
+            if i not in self.nodeLabels:
+                node=self.nodes[i]
+                color,weight,size=self.nodeStyles.get(node.label,('b','normal','medium'))
+                self.nodeLabels[i]=self.axes.text(node.x,node.y,node.label,color=color,weight=weight,size=size,
+                                                  clip_on=True)
+        for i in edgesInView:
+            if i not in self.edgeLabels:
+                edge=self.edges[i]
+                self.edgeLabels[i]=self.axes.text(edge.midx,edge.midy,edge.label,size='x-small',clip_on=True)
+        shown=set(nodesInView)
+        for i,text in self.nodeLabels.items(): text.set_visible(i in shown)
+        shown=set(edgesInView)
+        for i,text in self.edgeLabels.items(): text.set_visible(i in shown)
+        if labelsShown!=self.labelsShown:  # vertices carry the paint colors only while the labels are culled
+            self.labelsShown=labelsShown
+            self.vertices.set_color("#BBBCBD" if labelsShown else self.vertexColors())
 
     def nodeLoc(self,label):  # finds and returns the location of node labeled 'label'
-        for node in self.nodes:
-            if node.label==label: return [node.x,node.y]
+        if label in self.nodeIndex: return list(self.nodeIndex[label])
         print("nodeLoc: No node with label "+label+" exists")
 
 
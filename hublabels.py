@@ -0,0 +1,149 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import numpy as np
+
+import roadmap
+
+SUFFIX = '.hubs.npz'
+
+
+class HubLabels:
+    """A class to represent a hub label (2-hop) index of a RoadMap.
+    ...
+    Every node has a label: a list of (hub, distance) entries, sorted by hub node id, such that for any two
+    nodes the hubs their labels have in common include a node on a shortest path between them. The path cost
+    between two nodes is then the lowest distance(node1, hub) + distance(node2, hub) over the hubs the two labels
+    share, found by merging the two sorted labels; no search is run at all.
+    The labels are kept in compressed sparse row form: the label of node u is entries
+    offsets[u]:offsets[u + 1] of hubs/distances/via.
+
+    Attributes
+    ----------
+    offsets : numpy.ndarray
+        start of the label of every node in hubs/distances/via, plus the end of the last label
+    hubs : numpy.ndarray
+        node id of the hub of every label entry
+    distances : numpy.ndarray
+        path cost from the node to the hub of every label entry
+    via : numpy.ndarray
+        next node on the way up the contraction hierarchy from the node to the hub of every label entry,
+        -1 for the entry of the node itself; used to retrieve paths
+    """
+
+    def __init__(self, offsets, hubs, distances, via):
+        self.offsets = offsets
+        self.hubs = hubs
+        self.distances = distances
+        self.via = via
+
+    def entry(self, node_id, hub):
+        """
+        Returns the index in hubs/distances/via of the entry for hub in the label of node_id, -1 if there is none
+        """
+        start, end = int(self.offsets[node_id]), int(self.offsets[node_id + 1])
+        i = start + int(np.searchsorted(self.hubs[start:end], hub))
+        return i if i < end and self.hubs[i] == hub else -1
+
+    def distance(self, node1, node2):
+        """
+        Merges the labels of two nodes (given by node id)
+        :return:
+            (path cost, hub) of the cheapest path between them, (inf, -1) if they are not connected
+        """
+        start1, end1 = self.offsets[node1], self.offsets[node1 + 1]
+        start2, end2 = self.offsets[node2], self.offsets[node2 + 1]
+        hubs1, hubs2 = self.hubs[start1:end1], self.hubs[start2:end2]
+        positions = np.searchsorted(hubs2, hubs1)
+        positions[positions == len(hubs2)] = 0
+        shared = hubs2[positions] == hubs1
+        if not shared.any():
+            return float('inf'), -1
+        costs = self.distances[start1:end1][shared] + self.distances[start2:end2][positions[shared]]
+        best = int(np.argmin(costs))
+        return float(costs[best]), int(hubs1[shared][best])
+
+    def pathToHub(self, road_map, hierarchy, node_id, hub):
+        """
+        Returns the (node id, edge value) pairs of the path from node_id up to hub, following the via entries and
+        unpacking every upward edge of the contraction hierarchy on the way
+        """
+        edges = []
+        while node_id != hub:
+            next_node = int(self.via[self.entry(node_id, hub)])
+            edges.extend(hierarchy.unpack(road_map, node_id, next_node))
+            node_id = next_node
+        return edges
+
+    def save(self, path, fingerprint):
+        """
+        Writes the index to path (a .npz file), with 32 bit node ids
+        :param fingerprint:
+            fingerprint of the map content the index was built for
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, offsets=self.offsets, hubs=self.hubs.astype(np.int32), distances=self.distances,
+                     via=self.via.astype(np.int32), fingerprint=np.array(fingerprint))
+
+
+def build(hierarchy):
+    """
+    Builds the hub labels from a contraction hierarchy, from the highest ranked node down. The label of a node is
+    made of the node itself and the labels of its upward neighbours (already built), extended by the upward
+    edge to each. An entry is then dropped when the labels built so far already give a cheaper path to its hub
+    :param hierarchy:
+        ContractionHierarchy of the map
+    """
+    node_count = len(hierarchy.rank)
+    offsets, targets, weights = hierarchy.up_offsets, hierarchy.up_targets.tolist(), hierarchy.up_weights.tolist()
+    labels = [None] * node_count
+    for v in np.argsort(hierarchy.rank)[::-1].tolist():
+        label = {v: (0.0, -1)}
+        for i in range(int(offsets[v]), int(offsets[v + 1])):
+            u, w = targets[i], weights[i]
+            for hub, (d, _) in labels[u].items():
+                if d + w < label.get(hub, (float('inf'),))[0]:
+                    label[hub] = (d + w, u)
+        for hub, (d, _) in list(label.items()):
+            if hub == v:
+                continue
+            for x, (dx, _) in labels[hub].items():
+                if x != hub and x in label and dx + label[x][0] < d:
+                    del label[hub]
+                    break
+        labels[v] = label
+    sizes = [len(label) for label in labels]
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    entries = [(hub, d, u) for label in labels for hub, (d, u) in sorted(label.items())]
+    return HubLabels(offsets, np.array([e[0] for e in entries], dtype=np.int64),
+                     np.array([e[1] for e in entries], dtype=np.float64),
+                     np.array([e[2] for e in entries], dtype=np.int64))
+
+
+_loaded_labels = {}
+
+
+def load(road_map):
+    """
+    Returns the HubLabels of the road_map: the index stored for it in this process, or read from the file next to
+    the map_file when that was written for the same map content (fingerprint); None when there is none. Unlike the
+    landmark tables and the contraction hierarchy the index is never built here: see Searcher.buildHubLabels.
+    Finding no index is remembered too, so the disk is only looked at once per map content (until store is called)
+    """
+    if road_map.fingerprint in _loaded_labels:
+        return _loaded_labels[road_map.fingerprint]
+    saved = roadmap.readIndex(road_map, SUFFIX)
+    index = None
+    if saved is not None:
+        index = HubLabels(saved['offsets'], saved['hubs'], saved['distances'], saved['via'])
+    _loaded_labels[road_map.fingerprint] = index
+    return index
+
+
+def store(road_map, index):
+    """
+    Makes index the HubLabels load returns for the road_map, and writes it next to the map_file when there is one
+    """
+    roadmap.writeIndex(road_map, SUFFIX, index)
+    _loaded_labels[road_map.fingerprint] = index
@@ -0,0 +1,78 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import contextlib
+import json
+import time
+
+COUNTERS = ('pushes', 'pops', 'stale_skips', 'edge_relaxations', 'heuristic_evaluations')
+
+
+class Instrumentation:
+    """A class to represent the phase timers and operation counters of the searches run by a Searcher.
+    ...
+    Every phase (e.g. 'load', 'search', 'path', 'report') adds up its wall clock and CPU time and the number of
+    times it ran. The counters are added up over the searches: pushes and pops on the open_list, stale entries
+    skipped on it, edges relaxed (children looked at) and heuristic values computed. A Searcher made without
+    instrumentation has none of this and pays nothing for it.
+
+    Attributes
+    ----------
+    phases : dict
+        {'wall': seconds, 'cpu': seconds, 'calls': int} of every phase timed, with the phase name as the key
+    counters : dict
+        value of every operation counter (see COUNTERS), with the counter name as the key
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Times the code run in the with block as the phase name
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timer = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            timer['wall'] += time.perf_counter() - wall
+            timer['cpu'] += time.process_time() - cpu
+            timer['calls'] += 1
+
+    def count(self, name, amount=1):
+        """
+        Adds amount to the counter name
+        """
+        self.counters[name] += amount
+
+    def countFrontier(self, open_list):
+        """
+        Adds the pushes, pops and stale entries skipped of a PriorityFrontier or StackFrontier to the counters
+        """
+        pushes, pops, skipped = open_list.operationCounts()
+        self.counters['pushes'] += pushes
+        self.counters['pops'] += pops
+        self.counters['stale_skips'] += skipped
+
+    def reset(self):
+        """
+        Sets every timer and counter back to 0
+        """
+        self.phases = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def toDict(self):
+        """
+        Returns the timers and counters as a dictionary
+        """
+        return {'phases': {name: dict(timer) for name, timer in self.phases.items()},
+                'counters': dict(self.counters)}
+
+    def toJson(self, indent=None):
+        """
+        Returns the timers and counters as a JSON string
+        """
+        return json.dumps(self.toDict(), indent=indent)
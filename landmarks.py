@@ -0,0 +1,143 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import numpy as np
+from scipy.sparse import csgraph
+
+import roadmap
+
+SUFFIX = '.landmarks.npz'
+
+
+class Landmarks:
+    """A class to represent the landmark distance tables of the ALT (A*, landmarks, triangle inequality) search.
+    ...
+    For every landmark L the shortest path distance d(L, node) to every node is stored. By the triangle
+    inequality |d(L, goal) - d(L, node)| is never more than the path cost from node to goal, so the largest
+    of these bounds over all landmarks is an admissible and consistent heuristic for A*, and usually a much
+    tighter one than the straight line distance.
+
+    Attributes
+    ----------
+    nodes : numpy.ndarray
+        node ids of the landmarks
+    distances : numpy.ndarray
+        (landmark, node) table of shortest path distances, inf for nodes a landmark cannot reach
+    selection : str
+        how the landmarks were picked, 'farthest' or 'planar'
+    """
+
+    def __init__(self, nodes, distances, selection):
+        self.nodes = nodes
+        self.distances = distances
+        self.selection = selection
+
+    def lowerBounds(self, goal_ids):
+        """
+        Returns a numpy array with a lower bound on the path cost from every node to the nearest of the goal nodes
+        :param goal_ids:
+            node ids of the goal nodes
+        """
+        bounds = np.full(self.distances.shape[1], np.inf)
+        with np.errstate(invalid='ignore'):
+            for goal in goal_ids:
+                to_goal = self.distances[:, goal][:, None]
+                goal_bounds = np.nan_to_num(np.abs(to_goal - self.distances), nan=0.0).max(axis=0)
+                np.minimum(bounds, goal_bounds, out=bounds)
+        return bounds
+
+    def save(self, path, fingerprint):
+        """
+        Writes the tables to path (a .npz file)
+        :param fingerprint:
+            fingerprint of the map content the tables were computed for
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, nodes=self.nodes, distances=self.distances, selection=self.selection,
+                     fingerprint=np.array(fingerprint))
+
+
+def shortestDistances(road_map, node_ids):
+    """
+    Returns the (node, node) table of shortest path distances from each of node_ids to every node of the road_map
+    """
+    return csgraph.dijkstra(road_map.adjacencyMatrix(), directed=True, indices=node_ids)
+
+
+def selectFarthest(road_map, count):
+    """
+    Picks the landmarks one by one, each time the node farthest (by path cost) from the landmarks picked so far.
+    A node no landmark can reach counts as the farthest, so every part of a disconnected map gets a landmark.
+    The first landmark is the node farthest from node 0
+    :return:
+        (node ids, distance table) of the landmarks
+    """
+    nodes = []
+    rows = []
+    nearest = shortestDistances(road_map, [0])[0]
+    for _ in range(count):
+        node_id = int(np.argmax(nearest))
+        row = shortestDistances(road_map, [node_id])[0]
+        nodes.append(node_id)
+        rows.append(row)
+        np.minimum(nearest, row, out=nearest)
+    return np.array(nodes, dtype=np.int64), np.vstack(rows)
+
+
+def selectPlanar(road_map, count):
+    """
+    Cuts the plane around the centre of the map into count equal angle sectors and picks the node farthest from
+    the centre in each one, so the landmarks sit on the rim of the map in every direction
+    :return:
+        (node ids, distance table) of the landmarks
+    """
+    dx = road_map.xs - road_map.xs.mean()
+    dy = road_map.ys - road_map.ys.mean()
+    sectors = ((np.arctan2(dy, dx) + np.pi) / (2 * np.pi) * count).astype(np.int64) % count
+    radius = dx * dx + dy * dy
+    nodes = []
+    for sector in range(count):
+        members = np.flatnonzero(sectors == sector)
+        if len(members):
+            nodes.append(int(members[np.argmax(radius[members])]))
+    nodes = np.array(nodes, dtype=np.int64)
+    return nodes, shortestDistances(road_map, nodes)
+
+
+def build(road_map, count=8, selection='farthest'):
+    """
+    Picks count landmarks on the road_map and computes their distance tables
+    :param selection:
+        'farthest' or 'planar', see selectFarthest and selectPlanar
+    """
+    count = min(count, len(road_map))
+    if selection == 'farthest':
+        nodes, distances = selectFarthest(road_map, count)
+    elif selection == 'planar':
+        nodes, distances = selectPlanar(road_map, count)
+    else:
+        raise ValueError('unknown landmark selection \'' + selection + '\'')
+    return Landmarks(nodes, distances, selection)
+
+
+_loaded_tables = {}
+
+
+def load(road_map, count=8, selection='farthest'):
+    """
+    Returns the Landmarks of the road_map. The tables are read from the file next to the map_file when it was written
+    for the same map content (fingerprint), count and selection; otherwise they are computed and written there, so
+    the preprocessing is only done once per map. A map with no file behind it keeps its tables in memory only
+    """
+    key = (road_map.fingerprint, count, selection)
+    tables = _loaded_tables.get(key)
+    if tables is not None:
+        return tables
+    saved = roadmap.readIndex(road_map, SUFFIX)
+    if saved is not None and str(saved['selection']) == selection and len(saved['nodes']) == min(count, len(road_map)):
+        tables = Landmarks(saved['nodes'], saved['distances'], selection)
+    else:
+        tables = build(road_map, count, selection)
+        roadmap.writeIndex(road_map, SUFFIX, tables)
+    _loaded_tables[key] = tables
+    return tables
@@ -0,0 +1,39 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Converts map files from the text format (the format GraphMaker.export writes) to the binary map format.
+# Usage:
+#   python mapconvert.py 300node.txt              # writes 300node.rmap
+#   python mapconvert.py 300node.txt out.rmap
+
+import os
+import sys
+
+import roadmap
+
+
+def binaryName(map_file):
+    """
+    Returns the default name of the binary map converted from map_file: the same name with the .rmap extension
+    """
+    return os.path.splitext(map_file)[0] + '.rmap'
+
+
+def convert(map_file, out_file=None):
+    """
+    Converts a text map_file to the binary map format
+    :param out_file:
+        file to write, by default binaryName(map_file)
+    :return:
+        name of the file written
+    """
+    out_file = out_file or binaryName(map_file)
+    roadmap.RoadMap(map_file).save(out_file)
+    return out_file
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print('usage: python mapconvert.py map_file.txt [out_file.rmap]')
+        sys.exit(2)
+    print('Wrote', convert(*sys.argv[1:]))
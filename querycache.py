@@ -0,0 +1,109 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import collections
+import shelve
+
+
+class QueryCache:
+    """A class to represent a cache of the search results reported by Searcher.go.
+    ...
+    The results of a search (traversal, stats and the path to every goal reached) are stored under the
+    fingerprint (content hash) of the map it was searched on plus the search algorithm, start node, goal nodes,
+    goal mode, verbosity and stats precision, so results are never served for a map whose content changed:
+    editing a map and loading it again gives it a new fingerprint. A hit is reported again through the sink of
+    the Searcher asking, so a quiet Searcher stays silent and a printing one prints, whoever filled the cache.
+    At most max_entries results are kept in memory; the least recently used one is evicted first. With a
+    store_path they are also written to a shelve file there, so later runs start with them. A shelve file is not
+    safe to write from several processes at once: give processes that run at the same time a store_path each, or
+    no store. Searcher.queryMany never uses the cache (only go does), so its worker processes never open the store.
+
+    Attributes
+    ----------
+    max_entries : int
+        largest number of results kept in memory
+    entries : OrderedDict
+        search results of every entry in memory, least recently used first
+    store_path : str
+        file name of the shelve store shared between runs, None to keep the results in memory only
+    hits : int
+        number of lookups answered from the cache (memory or store)
+    misses : int
+        number of lookups not found in the cache
+    evictions : int
+        number of results dropped from memory to stay within max_entries
+    """
+
+    def __init__(self, max_entries=1024, store_path=None):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.store_path = store_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def makeKey(fingerprint, search_algo, start_label, goal_labels, goal_mode, verbose, stats_precision=None):
+        """
+        Returns the cache key of a search
+        :param stats_precision:
+            relative accuracy of the percentiles in the stats of the search, None when it keeps none
+        """
+        return repr((fingerprint, search_algo, start_label, tuple(goal_labels), goal_mode, bool(verbose),
+                     stats_precision))
+
+    def get(self, key):
+        """
+        Returns the search results stored under key, None if there are none
+        """
+        entry = self.entries.get(key)
+        if entry is None and self.store_path is not None:
+            with shelve.open(self.store_path) as store:
+                entry = store.get(key)
+            if entry is not None:
+                self.remember(key, entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """
+        Stores the results of a search (see Searcher.searchAndReport) under key
+        """
+        self.remember(key, entry)
+        if self.store_path is not None:
+            with shelve.open(self.store_path) as store:
+                store[key] = entry
+
+    def remember(self, key, entry):
+        """
+        Keeps entry in memory as the most recently used one, evicting the least recently used one if needed
+        """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, fingerprint=None):
+        """
+        Drops the results of the map with the given fingerprint, or all of them when fingerprint is None,
+        from memory and from the store
+        """
+        prefix = repr((fingerprint,))[:-2]
+        for key in [k for k in self.entries if fingerprint is None or k.startswith(prefix)]:
+            del self.entries[key]
+        if self.store_path is not None:
+            with shelve.open(self.store_path) as store:
+                for key in [k for k in store.keys() if fingerprint is None or k.startswith(prefix)]:
+                    del store[key]
+
+    def counters(self):
+        """
+        Returns the hit, miss and eviction counters and the number of results in memory, as a dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': len(self.entries)}
+
@@ -0,0 +1,44 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+
+class QueryResult:
+    """A class to represent the result of one search run by Searcher.query or Searcher.queryMany.
+    ...
+    Attributes
+    ----------
+    start : str
+        label of the start node
+    goal : str
+        label of the goal node
+    search_algo : str
+        Name of the search algorithm that was run
+    found : bool
+        Marks if the goal node was reached(True) or not(False)
+    path : list
+        labels of the nodes from the start node to the goal node
+    cost : float
+        total path cost of the path
+    summary : dict
+        the stats summary of the search, see Stats.summary
+    stats : Stats
+        the stats of the search, to merge with the stats of other searches (see stats.mergeAll); None when no
+        search was run
+    """
+
+    def __init__(self, start, goal, search_algo, found, path, cost, summary, stats=None):
+        self.start = start
+        self.goal = goal
+        self.search_algo = search_algo
+        self.found = found
+        self.path = path
+        self.cost = cost
+        self.summary = summary
+        self.stats = stats
+
+    def toDict(self):
+        """
+        Returns the result as a dictionary, e.g. for writing it out as JSON
+        """
+        return {'start': self.start, 'goal': self.goal, 'search_algo': self.search_algo, 'found': self.found,
+                'path': self.path, 'cost': self.cost, 'summary': self.summary}
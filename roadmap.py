@@ -0,0 +1,517 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+import collections
+import hashlib
+import math
+import mmap
+import os
+import struct
+from array import array
+
+import numpy as np
+import scipy.sparse as sparse
+
+
+MAGIC = b'RMAP'
+FORMAT_VERSION = 1
+# magic, format version, node count, edge count, label table size in bytes, heuristic_scale, fingerprint
+HEADER = struct.Struct('<4sIQQQd32s')
+
+
+class MapFormatError(ValueError):
+    """A class to represent a line of a text map that cannot be read.
+
+    Attributes
+    ----------
+    map_file : str
+        file the line is in
+    line_number : int
+        number of the line in the file, counting from 1
+    """
+
+    def __init__(self, map_file, line_number, problem, line):
+        super().__init__(str(map_file) + ', line ' + str(line_number) + ': ' + problem + ': ' + repr(line))
+        self.map_file = map_file
+        self.line_number = line_number
+
+
+def parseEdges(lines, map_file='<lines>'):
+    """
+    Reads the edges of a text map one line at a time, holding no more than one line in memory. Each line is
+        (nodeLabel1, nodeLabel2, edgeValue, [x1,y1], [x2,y2])
+    optionally followed by a midpoint field [mx,my], which is skipped. Blank lines are skipped
+    :param lines:
+        iterable of the lines, as str or bytes (e.g. a file opened in text or binary mode)
+    :param map_file:
+        name of the file the lines come from, for the error messages
+    :return:
+        generator of (node_label1, node_label2, edge_value, x1, y1, x2, y2) tuples
+    :raises MapFormatError:
+        at the first line that is not an edge or has a negative, infinite or nan edge value, naming the line
+    """
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode()
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] != '(' or line[-1] != ')':
+            raise MapFormatError(map_file, line_number, 'expected an edge in parentheses', line)
+        fields = line[1:-1].replace('\'', '').replace('[', '').replace(']', '').replace(' ', '').split(',')
+        if len(fields) != 7 and len(fields) != 9:
+            raise MapFormatError(map_file, line_number, 'expected 7 fields (9 with a midpoint), found ' +
+                                 str(len(fields)), line)
+        node1, node2, edge_value, x1, y1, x2, y2 = fields[:7]
+        if not node1 or not node2:
+            raise MapFormatError(map_file, line_number, 'empty node label', line)
+        try:
+            edge = (node1, node2, float(edge_value), int(x1), int(y1), int(x2), int(y2))
+        except ValueError:
+            raise MapFormatError(map_file, line_number, 'edge value and coordinates must be numbers', line) from None
+        if not math.isfinite(edge[2]) or edge[2] < 0:
+            raise MapFormatError(map_file, line_number, 'edge value must be a finite number, at least 0', line)
+        yield edge
+
+
+def sectionLayout(node_count, edge_count, label_bytes):
+    """
+    Returns the (name, dtype, length) of every array of a binary map file, in the order they follow the header.
+    Every array starts on a multiple of 8 bytes
+    """
+    return (('label_offsets', np.int64, node_count + 1),
+            ('label_data', np.uint8, label_bytes),
+            ('label_order', np.int64, node_count),
+            ('xs', np.int64, node_count),
+            ('ys', np.int64, node_count),
+            ('offsets', np.int64, node_count + 1),
+            ('targets', np.int32, 2 * edge_count),
+            ('weights', np.float64, 2 * edge_count),
+            ('edge_nodes', np.int32, 2 * edge_count),
+            ('edge_values', np.float64, edge_count))
+
+
+class RoadMap:
+    """A class to represent a map file loaded into memory.
+    ...
+    A RoadMap is parsed once and never changed afterwards, so a single instance can be shared by
+    any number of Searcher and GraphViz objects.
+    A map can be read from the text format (one edge per line) or from the binary format written by save:
+    a header followed by the label table, coordinates, adjacency rows and edges as flat arrays. A binary map
+    is opened with mmap and its arrays are NumPy views of the file, so opening it takes no parsing at all
+    and only the pages a search touches are ever read.
+    Every node label is interned to an integer node id (its index in labels). The adjacency is
+    kept in compressed sparse row form: the neighbours of node u are
+    targets[offsets[u]:offsets[u + 1]], reached over edges of weights[offsets[u]:offsets[u + 1]],
+    sorted by neighbour label.
+
+    Attributes
+    ----------
+    map_file : str
+        text file the map was loaded from
+    fingerprint : str
+        hash of the content of the map_file; an edited map gets a new fingerprint
+    labels : tuple or LabelTable
+        node labels in the order they first appear in the map_file, indexed by node id
+    index : dict or LabelIndex
+        node id of every node, with node_label as the key
+    xs : numpy.ndarray
+        x-coordinate of every node, indexed by node id
+    ys : numpy.ndarray
+        y-coordinate of every node, indexed by node id
+    offsets : numpy.ndarray
+        start of the adjacency row of every node in targets/weights, plus the end of the last row
+    targets : numpy.ndarray
+        node id at the far end of every adjacent edge
+    weights : numpy.ndarray
+        edge value of every adjacent edge, as a float
+    edge_nodes : numpy.ndarray
+        (node id, node id) pair of every line of the map_file
+    edge_values : numpy.ndarray
+        edge value of every line of the map_file
+    heuristic_scale : float
+        largest factor (at most 1) the straight line distance between two nodes can be scaled by without
+        exceeding the value of any edge; scaled by it, hSLD is a consistent heuristic on this map
+    """
+
+    def __init__(self, map_file, lines=None):
+        """
+        Loads the map_file: a binary map written by save, or a text file where each line describes one edge in
+        the format
+            (nodeLabel1, nodeLabel2, edgeValue, [x1,y1], [x2,y2])
+        :param map_file:
+            binary map file, or text file with each line of the file describing one edge in the graph
+        :param lines:
+            text lines to read the map from instead of the map_file, e.g. the lines GraphMaker.export writes
+        """
+        self.map_file = map_file
+        if lines is not None:
+            lines = list(lines)
+            self.fingerprint = hashlib.sha256(''.join(lines).encode()).hexdigest()
+            self.parseLines(lines)
+            return
+        with open(map_file, 'rb') as f:
+            if f.read(len(MAGIC)) == MAGIC:
+                self.mapBinary(f)
+                return
+            f.seek(0)
+            fingerprint = hashlib.sha256()
+            self.parseLines(fingerprintedLines(f, fingerprint))
+            self.fingerprint = fingerprint.hexdigest()
+
+    @classmethod
+    def fromArrays(cls, map_file, labels, xs, ys, edge_nodes, edge_values, fingerprint):
+        """
+        Builds a map straight from arrays of nodes and edges, e.g. the ones of a GraphMaker, without text lines.
+        The nodes get the node ids a text map with the same edges in the same order would give them (the order they
+        first appear in), and nodes no edge touches are left out, as a text map would
+        :param labels:
+            label of every node, in the numbering of edge_nodes
+        :param xs:
+            x-coordinate of every node, in the numbering of edge_nodes
+        :param ys:
+            y-coordinate of every node, in the numbering of edge_nodes
+        :param edge_nodes:
+            (node, node) pair of every edge
+        :param edge_values:
+            edge value of every edge
+        :param fingerprint:
+            hash of the content of the map, see fingerprint
+        """
+        road_map = cls.__new__(cls)
+        road_map.map_file = map_file
+        road_map.fingerprint = fingerprint
+        ends = np.asarray(edge_nodes, dtype=np.int64).ravel()
+        used, first = np.unique(ends, return_index=True)
+        order = used[np.argsort(first)]
+        node_ids = np.zeros(len(labels), dtype=np.int64)
+        node_ids[order] = np.arange(len(order))
+        road_map.labels = tuple(labels[i] for i in order.tolist())
+        road_map.index = {label: node_id for node_id, label in enumerate(road_map.labels)}
+        road_map.xs = np.asarray(xs, dtype=np.int64)[order]
+        road_map.ys = np.asarray(ys, dtype=np.int64)[order]
+        road_map.edge_nodes = node_ids[ends].astype(np.int32).reshape(-1, 2)
+        road_map.edge_values = np.asarray(edge_values, dtype=np.float64)
+        road_map.buildAdjacency()
+        road_map.heuristic_scale = road_map.heuristicScale()
+        return road_map
+
+    def parseLines(self, lines):
+        """
+        Builds the map from text lines, each describing one edge, as parseEdges reads them. Besides the labels,
+        only flat arrays of numbers (about 32 bytes per edge) are kept while the lines stream by
+        """
+        labels = []
+        index = {}
+        xs = array('q')
+        ys = array('q')
+        edge_nodes = array('i')
+        edge_values = array('d')
+        for node1, node2, edge_value, x1, y1, x2, y2 in parseEdges(lines, self.map_file):
+            for label, x, y in ((node1, x1, y1), (node2, x2, y2)):
+                if label not in index:
+                    index[label] = len(labels)
+                    labels.append(label)
+                    xs.append(x)
+                    ys.append(y)
+            edge_nodes.append(index[node1])
+            edge_nodes.append(index[node2])
+            edge_values.append(edge_value)
+        self.labels = tuple(labels)
+        self.index = index
+        self.xs = np.frombuffer(xs, dtype=np.int64)
+        self.ys = np.frombuffer(ys, dtype=np.int64)
+        self.edge_nodes = np.frombuffer(edge_nodes, dtype=np.int32).reshape(-1, 2)
+        self.edge_values = np.frombuffer(edge_values, dtype=np.float64)
+        self.buildAdjacency()
+        self.heuristic_scale = self.heuristicScale()
+
+    def mapBinary(self, f):
+        """
+        Maps a binary map file into memory; every array is a read-only view of the mapped file
+        :param f:
+            the map_file, opened in binary mode
+        :raises ValueError:
+            when the file is of another format version, or its size is not the one its header gives
+        """
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < HEADER.size:
+            raise ValueError('\'' + str(self.map_file) + '\' is a binary map cut short: ' + str(len(buffer)) +
+                             ' bytes, less than its ' + str(HEADER.size) + ' byte header')
+        magic, version, node_count, edge_count, label_bytes, heuristic_scale, fingerprint = \
+            HEADER.unpack_from(buffer, 0)
+        if version != FORMAT_VERSION:
+            raise ValueError('\'' + str(self.map_file) + '\' is a binary map of format version ' + str(version) +
+                             ', this version reads format version ' + str(FORMAT_VERSION))
+        layout = sectionLayout(node_count, edge_count, label_bytes)
+        size = HEADER.size + sum(-(-np.dtype(dtype).itemsize * length // 8) * 8 for _, dtype, length in layout)
+        if size != len(buffer):
+            raise ValueError('\'' + str(self.map_file) + '\' is a binary map of ' + str(len(buffer)) +
+                             ' bytes, its header (' + str(node_count) + ' nodes, ' + str(edge_count) +
+                             ' edges) needs ' + str(size))
+        arrays = {}
+        offset = HEADER.size
+        for name, dtype, length in layout:
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=length, offset=offset)
+            offset += -(-arrays[name].nbytes // 8) * 8
+        self.fingerprint = fingerprint.hex()
+        self.heuristic_scale = heuristic_scale
+        self.labels = LabelTable(arrays['label_offsets'], arrays['label_data'])
+        self.index = LabelIndex(self.labels, arrays['label_order'])
+        self.xs, self.ys = arrays['xs'], arrays['ys']
+        self.offsets, self.targets, self.weights = arrays['offsets'], arrays['targets'], arrays['weights']
+        self.edge_nodes = arrays['edge_nodes'].reshape(-1, 2)
+        self.edge_values = arrays['edge_values']
+
+    def save(self, out_file):
+        """
+        Writes the map to out_file in the binary format
+        """
+        node_count = len(self.labels)
+        encoded = [label.encode() for label in self.labels]
+        label_offsets = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum([len(label) for label in encoded], out=label_offsets[1:])
+        arrays = {'label_offsets': label_offsets,
+                  'label_data': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                  'label_order': np.array(sorted(range(node_count), key=self.labels.__getitem__), dtype=np.int64),
+                  'xs': self.xs, 'ys': self.ys, 'offsets': self.offsets, 'targets': self.targets,
+                  'weights': self.weights, 'edge_nodes': self.edge_nodes, 'edge_values': self.edge_values}
+        with open(out_file, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, node_count, len(self.edge_values), int(label_offsets[-1]),
+                                self.heuristic_scale, bytes.fromhex(self.fingerprint)))
+            for name, dtype, length in sectionLayout(node_count, len(self.edge_values), int(label_offsets[-1])):
+                data = np.ascontiguousarray(arrays[name], dtype=dtype).tobytes()
+                f.write(data + bytes(-len(data) % 8))
+
+    def buildAdjacency(self):
+        """
+        Builds the offsets/targets/weights rows from edge_nodes and edge_values.
+        Every edge is stored in both directions; each row is sorted by neighbour label, keeping
+        parallel edges in map_file order
+        """
+        node_count = len(self.labels)
+        sources = self.edge_nodes.ravel()
+        targets = self.edge_nodes[:, ::-1].ravel()
+        weights = np.repeat(self.edge_values, 2)
+        label_rank = np.empty(node_count, dtype=np.int64)
+        label_rank[sorted(range(node_count), key=self.labels.__getitem__)] = np.arange(node_count)
+        order = np.argsort(sources.astype(np.int64) * node_count + label_rank[targets], kind='stable')
+        self.targets = targets[order]
+        self.weights = weights[order]
+        self.offsets = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=self.offsets[1:])
+
+    def heuristicScale(self):
+        """
+        Computes heuristic_scale: the lowest ratio of edge value to straight line distance over all edges, capped at 1.
+        Maps written by GraphMaker can label edges a little shorter than the straight line between their ends
+        """
+        u, v = self.edge_nodes[:, 0], self.edge_nodes[:, 1]
+        dx = (self.xs[u] - self.xs[v]).astype(np.float64)
+        dy = (self.ys[u] - self.ys[v]).astype(np.float64)
+        lengths = np.sqrt(dx * dx + dy * dy)
+        ratios = self.edge_values[lengths > 0] / lengths[lengths > 0]
+        return float(min(1.0, ratios.min())) if ratios.size else 1.0
+
+    def adjacencyMatrix(self):
+        """
+        Returns the adjacency as a scipy.sparse csr_matrix over the offsets/targets/weights rows, without copying them,
+        for the scipy.sparse.csgraph routines. Between parallel edges csgraph takes the lowest edge value
+        """
+        node_count = len(self.labels)
+        return sparse.csr_matrix((self.weights, self.targets, self.offsets), shape=(node_count, node_count))
+
+    def location(self, label):
+        """
+        Returns the (x, y) location of the node labeled label
+        """
+        node_id = self.index[label]
+        return int(self.xs[node_id]), int(self.ys[node_id])
+
+    def degree(self, node_id):
+        """
+        Returns the number of edges adjacent to the node
+        """
+        return int(self.offsets[node_id + 1] - self.offsets[node_id])
+
+    def edgeValue(self, node1, node2):
+        """
+        Returns the lowest value of the edges between two nodes (given by node id)
+        """
+        start, end = self.offsets[node1], self.offsets[node1 + 1]
+        return float(self.weights[start:end][self.targets[start:end] == node2].min())
+
+    def gatherRows(self, node_ids):
+        """
+        Collects the adjacency rows of several nodes at once, in the order of node_ids
+        :param node_ids:
+            numpy array of node ids
+        :return:
+            (rows, targets, weights) arrays with one entry per adjacent edge; rows gives the index in
+            node_ids of the node the edge leaves from
+        """
+        starts = self.offsets[node_ids]
+        degrees = self.offsets[node_ids + 1] - starts
+        rows = np.repeat(np.arange(len(node_ids)), degrees)
+        row_starts = np.cumsum(degrees) - degrees
+        positions = np.arange(len(rows)) - row_starts[rows] + starts[rows]
+        return rows, self.targets[positions], self.weights[positions]
+
+    def getEdges(self):
+        """
+        Yields one (node_label1, node_label2, edge_value, (x1, y1), (x2, y2)) tuple per line of the map_file
+        """
+        labels = self.labels
+        for (u, v), w in zip(self.edge_nodes.tolist(), self.edge_values.tolist()):
+            yield (labels[u], labels[v], int(w) if w.is_integer() else w,
+                   (int(self.xs[u]), int(self.ys[u])), (int(self.xs[v]), int(self.ys[v])))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+
+def fingerprintedLines(f, fingerprint):
+    """
+    Yields the lines of a file opened in binary mode, adding each one to the fingerprint (a hashlib hash) on the way
+    """
+    for line in f:
+        fingerprint.update(line)
+        yield line
+
+
+class LabelTable:
+    """A class to represent the node labels of a binary map, indexed by node id.
+    ...
+    The labels stay in the mapped file as one block of UTF-8 bytes; a label is only decoded when it is looked up.
+
+    Attributes
+    ----------
+    offsets : numpy.ndarray
+        start of the bytes of every label in data, plus the end of the last label
+    data : numpy.ndarray
+        the bytes of all the labels, one after the other
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __getitem__(self, node_id):
+        return self.data[self.offsets[node_id]:self.offsets[node_id + 1]].tobytes().decode()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for node_id in range(len(self)):
+            yield self[node_id]
+
+
+class LabelIndex:
+    """A class to represent the node id lookup of a binary map, with node_label as the key.
+    ...
+    Looks a label up by binary search over the node ids sorted by label, so no dictionary has to be built.
+
+    Attributes
+    ----------
+    labels : LabelTable
+        the labels of the map
+    order : numpy.ndarray
+        node ids sorted by label
+    """
+
+    def __init__(self, labels, order):
+        self.labels = labels
+        self.order = order
+
+    def get(self, label, default=None):
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.labels[self.order[mid]] < label:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order) and self.labels[self.order[lo]] == label:
+            return int(self.order[lo])
+        return default
+
+    def __getitem__(self, label):
+        node_id = self.get(label)
+        if node_id is None:
+            raise KeyError(label)
+        return node_id
+
+    def __contains__(self, label):
+        return self.get(label) is not None
+
+    def __len__(self):
+        return len(self.order)
+
+
+def indexFile(road_map, suffix):
+    """
+    Returns the file next to the map_file a preprocessed index of the road_map (landmark tables, contraction
+    hierarchy, hub labels) is kept in, None when there is no file behind the road_map (e.g. a map made in memory)
+    """
+    map_file = road_map.map_file
+    if not isinstance(map_file, str) or not os.path.isfile(map_file):
+        return None
+    return map_file + suffix
+
+
+def readIndex(road_map, suffix):
+    """
+    Returns the arrays of the index file of the road_map (see indexFile) by name, None when there is no such file or
+    it was written for other map content (its fingerprint is not the fingerprint of the road_map)
+    """
+    path = indexFile(road_map, suffix)
+    if path is None or not os.path.exists(path):
+        return None
+    with np.load(path) as f:
+        if 'fingerprint' not in f.files or str(f['fingerprint']) != road_map.fingerprint:
+            return None
+        return {name: f[name] for name in f.files}
+
+
+def writeIndex(road_map, suffix, index):
+    """
+    Writes index (with a save(path, fingerprint) method) to the index file of the road_map, stamped with the
+    fingerprint of the road_map; nothing is written when there is no file behind the road_map or it cannot be written
+    """
+    path = indexFile(road_map, suffix)
+    if path is None:
+        return
+    try:
+        index.save(path, road_map.fingerprint)
+    except OSError:
+        pass
+
+
+# the maps load keeps, least recently used first; at most MAX_LOADED_MAPS of them, each under its file name
+MAX_LOADED_MAPS = 8
+_loaded_maps = collections.OrderedDict()
+
+
+def load(map_file):
+    """
+    Returns the RoadMap for map_file, parsing the file only the first time it is asked for
+    (or again after the file changed on disk, replacing the map read before). The MAX_LOADED_MAPS most recently
+    asked for maps are kept; the least recently used one is dropped first
+    :param map_file:
+        binary map file, or text file with each line of the file describing one edge in the graph
+    """
+    st = os.stat(map_file)
+    key = os.path.abspath(map_file)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _loaded_maps.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, RoadMap(map_file))
+        _loaded_maps[key] = cached
+    _loaded_maps.move_to_end(key)
+    while len(_loaded_maps) > MAX_LOADED_MAPS:
+        _loaded_maps.popitem(last=False)
+    return cached[1]
@@ -1,200 +1,697 @@
 # This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
 __author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
 
+import concurrent.futures
+import contextlib
+import copy
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import contraction
+import events
+import frontier
 import graphmaker
 import graphviz
-import searchnode
-import node
+import hublabels
+import instrumentation
+import landmarks
+import queryresult
+import roadmap
+import searchstate
 import stats
 
+# levels of the breadth first search smaller than this are expanded node by node, larger ones at once with numpy
+SCALAR_LEVEL_SIZE = 64
+
 
 class Searcher:
     """A class to create Search Objects.
     ...
+    A Searcher never changes its road_map; all the state of a search lives in a SearchState made
+    fresh for every query. Any number of Searchers, in any number of threads, can share one RoadMap.
+
     Attributes
     ----------
     traversal : list
         list of each visited node
-    goal_node : str
-        goal node in the graph
+    start_node : int
+        node id of the start node in the graph
+    goal_node : int
+        node id of the goal node in the graph whose path is being reported
+    goal_nodes : list
+        labels of the goal nodes given to setStartGoal
+    goal_mode : str
+        'nearest' stops the search at the first goal node reached, 'all' once every goal node is reached
+    goal_ids : list
+        node ids of the goal nodes, each once
+    is_goal : bytearray
+        Marks every node as a goal node(1) or not(0)
+    remaining_goals : list
+        node ids of the goal nodes not reached yet
+    settled_goals : list
+        node ids of the goal nodes reached, in the order they were reached
     graph_visualizer : GraphViz
-        visualizing searches in a given search
+        visualizing searches in a given search, created the first time it is used
+    landmark_tables : Landmarks
+        landmark distance tables of the road_map for the 'alt' search, loaded the first time it is used
+    contraction_hierarchy : ContractionHierarchy
+        contraction hierarchy of the road_map for the 'ch' search, loaded the first time it is used
+    hub_labels : HubLabels
+        hub label index of the road_map for distance queries, None while no index was built for the map_file
     map_file : .txt
         text file with each line of the file describing one edge in the graph
-    nodes : a dictionary of SearchNode objects
-        Dictionary of SearchNode objects with node_label as the key
-    open_list : list of SearchNode objects
+    road_map : RoadMap
+        the parsed map_file, shared with the graph_visualizer and any other Searcher on the same file
+    state : SearchState
+        level, parent, value, cost, ... of every node for the current search
+    open_list : list, StackFrontier or PriorityFrontier of node ids
         consists of nodes that have been visited but not expanded
+    backward_state : SearchState
+        state of the backward half of the bidirectional searches
+    backward_open_list : PriorityFrontier of node ids
+        open_list of the backward half of the bidirectional searches
     path : list
         Nodes that are visited to reach the goal_node
     search_algo : str
         Name of the search algorithm to be run on the map
     goal_found : bool
-        Marks if the goal_node is found(True) or not found (False)
+        Marks if the search reached the goal node(s) it was asked for (True) or not (False)
+    query_cache : QueryCache
+        cache go() replays search results from, None to always run the search
+    sink : SearchSink
+        receives the events of the Searcher; the ConsoleSink prints them
+    trace : SearchSink
+        the sink when it wants the per node events of the searches, None otherwise
+    stats_precision : float
+        relative accuracy of the percentiles the stats of every search keep, None (the default) to keep none
+    instrumentation : Instrumentation
+        phase timers and operation counters of the searches, None when the Searcher is not instrumented
     """
 
-    def __init__(self, search_algo, map_file, verbose):
+    stats_precision = None
+    instrumentation = None
+
+    def __init__(self, search_algo, map_file, verbose, quiet=False, query_cache=None, sink=None, instrument=False):
         """
         Constructs all the necessary attributes for the Searcher object
         :param search_algo:
             Name of the search algorithm to be run on the map
         :param map_file:
-            text file with each line of the file describing one edge in the graph
+            text file with each line of the file describing one edge in the graph, or an already loaded RoadMap
+        :param quiet:
+            prints nothing at all, not even the verbose trace
+        :param sink:
+            SearchSink to send the events of the Searcher to instead, e.g. to collect them
+        :param query_cache:
+            QueryCache shared by the Searchers that should replay search results instead of searching again
+        :param instrument:
+            True to time the phases and count the operations of the searches (see instrumentation), or an
+            Instrumentation to add them to; False (the default) leaves them out at no cost
         """
+        if instrument is True:
+            instrument = instrumentation.Instrumentation()
+        if instrument:
+            self.instrumentation = instrument
         self.traversal = []
         self.start_node = None
         self.goal_node = None
         self.goal_found = False
-        self.graph_visualizer = graphviz.GraphViz()
-        self.graph_visualizer.loadGraphFromFile(map_file)
-        self.map_file = map_file
-        self.nodes = {}
+        with self.timed('load'):
+            if isinstance(map_file, roadmap.RoadMap):
+                self.road_map = map_file
+            else:
+                self.road_map = roadmap.load(map_file)
+        self.map_file = self.road_map.map_file
+        self._graph_visualizer = None
+        self._landmark_tables = None
+        self._contraction_hierarchy = None
+        self._hub_labels = None
         self.open_list = []
         self.path = []
         self.search_algo = search_algo
         self.stats = stats.Stats()
+        self.state = None
+        self.backward_state = None
+        self.backward_open_list = None
         self.adjacentEdges()
         self.verbose = verbose
         self.goal_nodes = []
+        self.goal_mode = 'nearest'
+        self.goal_ids = []
+        self.is_goal = bytearray(len(self.road_map))
+        self.remaining_goals = []
+        self.settled_goals = []
         self.paths = []
         self.start_label = None
-        print('z=Searcher(\'' + search_algo + '\',\'' + map_file + '\', hSLD,' + str(verbose) + ')')
-        print('Loaded search type', '\'' + search_algo + '\'', 'with map in file:', '\'' + map_file + '\'')
+        self.query_cache = query_cache
+        if sink is None:
+            sink = events.SearchSink() if quiet else events.ConsoleSink(verbose)
+        self.sink = sink
+        self.trace = sink if sink.tracing else None
+        self.sink.searcherCreated(self)
+
+    @property
+    def graph_visualizer(self):
+        """
+        The GraphViz of the road_map. Building its node/edge objects is only worth it when a search is plotted
+        """
+        if self._graph_visualizer is None:
+            with self.timed('load_graph'):
+                self._graph_visualizer = graphviz.GraphViz()
+                self._graph_visualizer.loadGraphFromMap(self.road_map)
+        return self._graph_visualizer
+
+    @property
+    def landmark_tables(self):
+        """
+        The Landmarks of the road_map, read from the file next to the map_file or computed (and saved there) once;
+        a map with no file behind it keeps them in memory
+        """
+        if self._landmark_tables is None:
+            self._landmark_tables = landmarks.load(self.road_map)
+        return self._landmark_tables
+
+    @landmark_tables.setter
+    def landmark_tables(self, tables):
+        """
+        Uses Landmarks made elsewhere (e.g. timed with landmarks.build) instead of loading them
+        """
+        self._landmark_tables = tables
+
+    @property
+    def contraction_hierarchy(self):
+        """
+        The ContractionHierarchy of the road_map, read from the file next to the map_file or built (and saved there)
+        once; a map with no file behind it keeps it in memory
+        """
+        if self._contraction_hierarchy is None:
+            self._contraction_hierarchy = contraction.load(self.road_map)
+        return self._contraction_hierarchy
+
+    @contraction_hierarchy.setter
+    def contraction_hierarchy(self, hierarchy):
+        """
+        Uses a ContractionHierarchy built elsewhere (e.g. timed with contraction.build) instead of loading it
+        """
+        self._contraction_hierarchy = hierarchy
+
+    @property
+    def hub_labels(self):
+        """
+        The HubLabels of the road_map, read from the file next to the map_file; None when there is none
+        """
+        if self._hub_labels is None:
+            self._hub_labels = hublabels.load(self.road_map)
+        return self._hub_labels
+
+    def buildHubLabels(self):
+        """
+        Builds the hub label index of the road_map from its contraction_hierarchy and writes it next to the map_file,
+        if there is one
+        """
+        self._hub_labels = hublabels.build(self.contraction_hierarchy)
+        hublabels.store(self.road_map, self._hub_labels)
+        return self._hub_labels
+
+    def timed(self, phase):
+        """
+        Returns a context manager timing its with block as the phase of the instrumentation; it does nothing when
+        the Searcher is not instrumented
+        """
+        if self.instrumentation is None:
+            return contextlib.nullcontext()
+        return self.instrumentation.phase(phase)
+
+    def countOperations(self):
+        """
+        Adds the operations of the search just run to the counters of the instrumentation: the pushes, pops and
+        stale skips of the open_list(s) and the edges relaxed, which are the branch sizes of the nodes expanded
+        """
+        open_lists = [self.open_list]
+        if self.search_algo in ('bidirectional', 'bidirectional_a_star', 'ch'):
+            open_lists.append(self.backward_open_list)
+        for open_list in open_lists:
+            if isinstance(open_list, (frontier.PriorityFrontier, frontier.StackFrontier)):
+                self.instrumentation.countFrontier(open_list)
+        self.stats.branch_sizes.flush()
+        self.instrumentation.count('edge_relaxations', self.stats.branch_sizes.total)
 
     def adjacentEdges(self):
         """
-        Reads each line of the map_file, and discovers adjacent edges of each node
-        Creates the nodes dictionary with node_label as the key and SearchNode object as the value
-        """
-        with open(self.map_file) as f:
-            lines = f.readlines()
-        clean_lines = [x.strip() for x in lines]
-        for line in clean_lines:
-            line = line.replace('\'', '').replace('[', '').replace(']', '').replace(' ', '').strip('()')
-            raw_edge = line.split(',')
-            [node1, node2, edge_value, x1, y1, x2, y2] = raw_edge
-            if node1 not in self.nodes.keys():
-                s = searchnode.SearchNode(node1, x1, y1)
-                self.nodes[node1] = s
-            self.nodes[node1].addAdjacentEdge([node2, edge_value])
-            if node2 not in self.nodes.keys():
-                s = searchnode.SearchNode(node2, x2, y2)
-                self.nodes[node2] = s
-            self.nodes[node2].addAdjacentEdge([node1, edge_value])
-        self.stats.total_nodes = len(self.nodes)
-        f.close()
+        Prepares a search over the loaded road_map. The adjacent edges of each node are read straight from
+        the road_map adjacency rows, so only the total number of nodes has to be recorded here
+        """
+        self.stats.total_nodes = len(self.road_map)
+
+    def resolveStartGoal(self):
+        """
+        Looks up the node ids of the start_label and goal_nodes, and marks the goal nodes in is_goal
+        """
+        self.start_node = self.road_map.index[self.start_label]
+        self.goal_ids = []
+        for label in self.goal_nodes:
+            goal = self.road_map.index[label]
+            if goal not in self.goal_ids:
+                self.goal_ids.append(goal)
+        self.is_goal = bytearray(len(self.road_map))
+        for goal in self.goal_ids:
+            self.is_goal[goal] = 1
+
+    def resetSearch(self):
+        """
+        Starts a new search: makes a fresh SearchState and clears the results of a previous search
+        """
+        self.state = searchstate.SearchState(len(self.road_map))
+        self.goal_found = False
+        self.remaining_goals = list(self.goal_ids)
+        self.settled_goals = []
+        self.open_list = []
+        self.traversal = []
+        self.path = []
+        self.stats = stats.Stats(self.stats_precision)
+        self.adjacentEdges()
 
     def breadthFirstSearch(self):
         """
-        Traverses the nodes of the graph layer by layer, starting at a given vertex
+        Traverses the nodes of the graph layer by layer, starting at a given vertex.
+        Runs level by level: a level of at least SCALAR_LEVEL_SIZE nodes is expanded at once over the road_map
+        adjacency rows (expandLevelAtOnce), a smaller one node by node (expandLevel), where the numpy calls would
+        cost more than they save. Either way each newly reached node keeps the first parent that reached it, in the
+        same order a FIFO open list would give. Every node is expanded at most once
         """
-        while len(self.open_list) != 0:
-            current_node = self.open_list.pop(0)
-            if self.verbose:
-                print('Exploring node \'' + current_node.label + '\'')
-            self.stats.addFrontierSize(len(self.open_list))
-            self.stats.addDepthSize(current_node.level)
-            self.traversal.append(current_node.label)
-            if current_node.label == self.goal_node.label:
+        current_level = list(self.open_list)
+        depth = 0
+        while len(current_level):
+            if len(current_level) < SCALAR_LEVEL_SIZE:
+                if isinstance(current_level, np.ndarray):
+                    current_level = current_level.tolist()
+                next_level = self.expandLevel(current_level, depth)
+            else:
+                next_level = self.expandLevelAtOnce(np.asarray(current_level, dtype=np.int64), depth)
+            if self.goal_found:
+                return
+            current_level = next_level
+            depth += 1
+        self.open_list = []
+
+    def expandLevel(self, current_level, depth):
+        """
+        Expands the nodes of one level of the breadth first search one at a time; stops at a goal node that
+        ends the search, leaving the rest of the level and the children found so far on the open_list
+        :param current_level:
+            list of the node ids of the level, in the order they were reached
+        :return:
+            list of the node ids of the next level
+        """
+        offsets, targets, weights = self.road_map.offsets, self.road_map.targets, self.road_map.weights
+        labels = self.road_map.labels
+        trace = self.trace
+        state = self.state
+        next_level = []
+        for k, current_node in enumerate(current_level):
+            if trace is not None:
+                trace.nodeExplored(self, current_node)
+            self.stats.addFrontierSize(len(current_level) - 1 - k + len(next_level))
+            self.stats.addDepthSize(depth)
+            self.traversal.append(labels[current_node])
+            if self.is_goal[current_node] and self.settleGoal(current_node):
+                self.countLevel(k + 1, len(next_level), depth)
+                self.open_list = current_level[k + 1:] + next_level
+                return next_level
+            start, end = int(offsets[current_node]), int(offsets[current_node + 1])
+            if trace is not None:
+                trace.childrenInserted(self, current_node)
+                self.traceChildCosts(current_node)
+            self.stats.addBranchSize(end - start)
+            for i in range(start, end):
+                child = int(targets[i])
+                if not state.visited[child]:
+                    state.visited[child] = 1
+                    state.parent[child] = current_node
+                    state.value[child] = float(weights[i])
+                    state.level[child] = depth + 1
+                    next_level.append(child)
+            if trace is not None:
+                trace.frontierSnapshot(self, state, current_level[k + 1:] + next_level)
+        self.countLevel(len(current_level), len(next_level), depth)
+        return next_level
+
+    def expandLevelAtOnce(self, current_level, depth):
+        """
+        Expands the nodes of one level of the breadth first search at once over the road_map adjacency rows;
+        stops at a goal node that ends the search like expandLevel
+        :param current_level:
+            numpy array of the node ids of the level, in the order they were reached
+        :return:
+            numpy array of the node ids of the next level
+        """
+        labels = self.road_map.labels
+        level, parent, value, visited = self.state.arrays()
+        offsets = self.road_map.offsets
+        is_goal = np.frombuffer(self.is_goal, dtype=np.bool_)
+        popped = len(current_level)
+        for goal_at in np.flatnonzero(is_goal[current_level]).tolist():
+            if self.settleGoal(int(current_level[goal_at])):
+                popped = goal_at + 1
+                break
+        expanded = current_level[:popped - 1] if self.goal_found else current_level
+        rows, children, edge_values = self.road_map.gatherRows(expanded)
+        fresh = np.flatnonzero(~visited[children])
+        _, first = np.unique(children[fresh], return_index=True)
+        first = fresh[np.sort(first)]
+        next_level = children[first]
+        visited[next_level] = True
+        parent[next_level] = expanded[rows[first]]
+        value[next_level] = edge_values[first]
+        level[next_level] = depth + 1
+        # the open list after popping the k-th node holds the rest of this level, plus the children
+        # found by the k nodes expanded before it
+        found_before = np.zeros(len(expanded) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[first], minlength=len(expanded)), out=found_before[1:])
+        frontier_sizes = len(current_level) - 1 - np.arange(popped) + found_before[:popped]
+        self.stats.addFrontierSizes(frontier_sizes.tolist())
+        self.stats.addDepthSizes([depth] * popped)
+        self.stats.addBranchSizes((offsets[expanded + 1] - offsets[expanded]).tolist())
+        self.traversal.extend(map(labels.__getitem__, current_level[:popped].tolist()))
+        self.countLevel(popped, len(next_level), depth)
+        if self.trace is not None:
+            self.traceLevel(current_level, popped, expanded, next_level, found_before)
+        if self.goal_found:
+            self.open_list = current_level[popped:].tolist() + next_level.tolist()
+        return next_level
+
+    def countLevel(self, popped, pushed, depth):
+        """
+        Adds the pops and pushes of one level of the breadth first search to the instrumentation, if any; the start
+        node was pushed at depth 0
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.count('pops', popped)
+            self.instrumentation.count('pushes', pushed + (depth == 0))
+
+    def traceLevel(self, current_level, popped, expanded, next_level, found_before):
+        """
+        Sends the per node events of one level of the breadth first search to the trace, one node at a time
+        """
+        for k in range(popped):
+            current_node = int(current_level[k])
+            self.trace.nodeExplored(self, current_node)
+            if k == len(expanded):
                 break
-            adj_nodes = self.getChildren(current_node.label)
-            if self.verbose:
-                print('Inserting new children ', end='')
-                print_adj_list = [x[0] for x in adj_nodes]
-                print(print_adj_list[:])
-            self.stats.addBranchSize(len(adj_nodes))
-            for n in adj_nodes:
-                self.nodes[n[0]].cost = float(n[1]) + current_node.value
-                self.insertToOpenList(n, 'end', current_node)
-            if self.verbose:
-                print_open_list = [ol.toString() for ol in self.open_list]
-                print('Open list:', print_open_list)
+            self.trace.childrenInserted(self, current_node)
+            self.traceChildCosts(current_node)
+            open_list = current_level[k + 1:].tolist() + next_level[:found_before[k + 1]].tolist()
+            self.trace.frontierSnapshot(self, self.state, open_list)
+
+    def traceChildCosts(self, current_node):
+        """
+        Sets the cost of every child of current_node to its edge value plus the value of current_node, the cost the
+        verbose trace of the breadth and depth first searches shows; those searches do not use the cost otherwise
+        """
+        start, end = int(self.road_map.offsets[current_node]), int(self.road_map.offsets[current_node + 1])
+        value = self.state.value[current_node]
+        for child, edge_value in zip(self.road_map.targets[start:end].tolist(),
+                                     self.road_map.weights[start:end].tolist()):
+            self.state.cost[child] = edge_value + value
 
     def depthFirstSearch(self):
         """
-        Traverses the nodes of the graph as far as possible along each branch
+        Traverses the nodes of the graph as far as possible along each branch.
+        The open_list is a StackFrontier: children are pushed so that the lowest label is explored first,
+        and a child that is already on the stack is moved to the top under its new parent.
+        Every node is expanded at most once
         """
-        while len(self.open_list) != 0 and not self.goal_found:
-            current_node = self.open_list.pop(0)
-            if self.verbose:
-                print('Exploring node \'' + current_node.label + '\'')
-            self.stats.addFrontierSize(len(self.open_list))
-            self.stats.addDepthSize(current_node.level)
-            self.traversal.append(current_node.label)
-            if current_node.label == self.goal_node.label:
-                self.goal_found = True
+        offsets, targets, weights = self.road_map.offsets, self.road_map.targets, self.road_map.weights
+        labels = self.road_map.labels
+        trace = self.trace
+        state = self.state
+        open_list = self.open_list
+        while len(open_list) != 0:
+            current_node = open_list.pop()
+            if trace is not None:
+                trace.nodeExplored(self, current_node)
+            self.stats.addFrontierSize(len(open_list))
+            self.stats.addDepthSize(state.level[current_node])
+            self.traversal.append(labels[current_node])
+            if self.is_goal[current_node] and self.settleGoal(current_node):
                 break
-            adj_nodes = self.getChildren(current_node.label)
-            if self.verbose:
-                print('Inserting new children ', end='')
-                print_adj_list = [x[0] for x in adj_nodes]
-                print(print_adj_list[:])
-            adj_nodes.reverse()
-            self.stats.addBranchSize(len(adj_nodes))
-            for n in adj_nodes:
-                self.nodes[n[0]].cost = float(n[1]) + current_node.value
-                self.insertToOpenList(n, 'front', current_node)
-            for o in range(len(self.open_list)):
-                self.depthFirstSearch()
-            if self.verbose:
-                print_open_list = [ol.toString() for ol in self.open_list]
-                print('Open list:', print_open_list)
+            start, end = int(offsets[current_node]), int(offsets[current_node + 1])
+            if trace is not None:
+                trace.childrenInserted(self, current_node)
+                self.traceChildCosts(current_node)
+            self.stats.addBranchSize(end - start)
+            child_level = state.level[current_node] + 1
+            for i in range(end - 1, start - 1, -1):
+                child = int(targets[i])
+                if not state.visited[child] or child in open_list:
+                    state.visited[child] = 1
+                    state.value[child] = float(weights[i])
+                    state.parent[child] = current_node
+                    state.level[child] = child_level
+                    open_list.push(child)
+            if trace is not None:
+                trace.frontierSnapshot(self, state, open_list)
 
     def bestFirstSearch(self):
         """
         Traverses the nodes of the graph by expanding the node with the least path value
         """
+        offsets, targets, weights = self.road_map.offsets, self.road_map.targets, self.road_map.weights
+        labels = self.road_map.labels
+        trace = self.trace
+        state = self.state
         while len(self.open_list) != 0:
-            self.open_list.sort(key=lambda x: x.cost)
-            current_node = self.open_list.pop(0)
-            if self.verbose:
-                print('Exploring node \'' + current_node.label + '\'')
+            current_node = self.open_list.pop()
+            if trace is not None:
+                trace.nodeExplored(self, current_node)
             self.stats.addFrontierSize(len(self.open_list))
-            self.stats.addDepthSize(current_node.level)
-            self.traversal.append(current_node.label)
-            if current_node.label == self.goal_node.label:
+            self.stats.addDepthSize(state.level[current_node])
+            self.traversal.append(labels[current_node])
+            if self.is_goal[current_node] and self.settleGoal(current_node):
                 break
-            adj_nodes = self.getChildren(current_node.label)
-            if self.verbose:
-                print('Inserting new children ', end='')
-                print_adj_list = [x[0] for x in adj_nodes]
-                print(print_adj_list[:])
-            self.stats.addBranchSize(len(adj_nodes))
-            for n in adj_nodes:
-                cost = float(n[1]) + current_node.cost
-                self.insertToOpenList(n, 'end', current_node, cost)
-            if self.verbose:
-                print_open_list = [ol.toString() for ol in self.open_list]
-                print('Open list:', print_open_list)
+            start, end = int(offsets[current_node]), int(offsets[current_node + 1])
+            if trace is not None:
+                trace.childrenInserted(self, current_node)
+            self.stats.addBranchSize(end - start)
+            for i in range(start, end):
+                child, edge_value = int(targets[i]), float(weights[i])
+                cost = edge_value + state.cost[current_node]
+                self.insertToOpenList(child, edge_value, 'priority', current_node, cost)
+            if trace is not None:
+                trace.frontierSnapshot(self, state, self.open_list)
 
     def aStarSearch(self):
         """
-        Traverses the nodes of the graph by expanding the node with the least cost (path_value + hSLD)
+        Traverses the nodes of the graph by expanding the node with the least cost (path_value + hSLD).
+        hSLD is the distance to the nearest of the remaining goals, looked up in the hSLD column computed by
+        computeHSLD. Each time a goal is reached (and the search goes on for the others) it is recomputed and
+        the open_list is reprioritized with the new hSLD.
+        The 'alt' search runs here too, with the landmark lower bounds in place of hSLD. Unlike a_star it only
+        updates the path cost of a child when the new path to it is cheaper, so it returns shortest paths
         """
+        offsets, targets, weights = self.road_map.offsets, self.road_map.targets, self.road_map.weights
+        labels = self.road_map.labels
+        trace = self.trace
+        state = self.state
+        hSLD = state.hSLD
+        exact = self.search_algo == 'alt'
         while len(self.open_list) != 0:
-            self.open_list.sort(key=lambda x: x.cost)
-            current_node = self.open_list.pop(0)
-            if self.verbose:
-                print('Exploring node \'' + current_node.label + '\'')
+            current_node = self.open_list.pop()
+            if trace is not None:
+                trace.nodeExplored(self, current_node)
             self.stats.addFrontierSize(len(self.open_list))
-            self.stats.addDepthSize(current_node.level)
-            self.traversal.append(current_node.label)
-            if current_node.label == self.goal_node.label:
+            self.stats.addDepthSize(state.level[current_node])
+            self.traversal.append(labels[current_node])
+            if self.is_goal[current_node]:
+                if self.settleGoal(current_node):
+                    break
+                self.reprioritizeOpenList()
+            start, end = int(offsets[current_node]), int(offsets[current_node + 1])
+            if trace is not None:
+                trace.childrenInserted(self, current_node)
+            self.stats.addBranchSize(end - start)
+            for i in range(start, end):
+                child, edge_value = int(targets[i]), float(weights[i])
+                path_value = edge_value + state.cum_value[current_node]
+                if exact and state.visited[child] and \
+                        (child not in self.open_list or path_value >= state.cum_value[child]):
+                    continue
+                state.cum_value[child] = path_value
+                cost = path_value + hSLD[child]
+                self.insertToOpenList(child, edge_value, 'priority', current_node, cost)
+            if trace is not None:
+                trace.frontierSnapshot(self, state, self.open_list)
+
+    def bidirectionalSearch(self):
+        """
+        Grows a search forward from the start node and another one backward from the goal nodes, always expanding
+        the side whose open_list has the lower cost on top, until the two meet on a shortest path.
+        'bidirectional' runs two Dijkstra (best first) searches. 'bidirectional_a_star' runs two A* searches with
+        the average potential p(node) = (hSLD to the goals - hSLD to the start) / 2 forward and -p(node) backward,
+        which keeps the stopping rule of bidirectional Dijkstra valid. That needs a consistent hSLD, so here it is
+        scaled by the road_map heuristic_scale.
+        The search stops once the lowest costs on top of both open_lists add up to at least the cost of the best
+        path found through a node reached from both sides; the nearest goal node is the one reported, so
+        setStartGoal rejects goal_mode 'all' for these searches
+        """
+        offsets, targets, weights = self.road_map.offsets, self.road_map.targets, self.road_map.weights
+        labels = self.road_map.labels
+        trace = self.trace
+        if self.search_algo == 'bidirectional_a_star':
+            if self.instrumentation is not None:
+                self.instrumentation.count('heuristic_evaluations',
+                                           len(self.road_map) * (len(self.remaining_goals) + 1))
+            potential = ((self.straightLineDistances(self.remaining_goals) -
+                          self.straightLineDistances([self.start_node])) * (self.road_map.heuristic_scale / 2)).tolist()
+        else:
+            potential = [0.0] * len(self.road_map)
+        self.state.cost[self.start_node] = potential[self.start_node]
+        self.open_list.push(self.start_node, potential[self.start_node])
+        for goal in self.remaining_goals:
+            self.backward_state.cost[goal] = -potential[goal]
+            self.backward_open_list.push(goal, -potential[goal])
+        states = (self.state, self.backward_state)
+        open_lists = (self.open_list, self.backward_open_list)
+        signs = (1.0, -1.0)
+        best_cost, meeting_node = float('inf'), -1
+        if self.is_goal[self.start_node]:
+            best_cost, meeting_node = 0.0, self.start_node
+        while len(self.open_list) != 0 and len(self.backward_open_list) != 0:
+            forward_cost, backward_cost = self.open_list.peekCost(), self.backward_open_list.peekCost()
+            if forward_cost + backward_cost >= best_cost:
+                break
+            side = 0 if forward_cost <= backward_cost else 1
+            state, open_list, sign, other = states[side], open_lists[side], signs[side], states[1 - side]
+            current_node = open_list.pop()
+            if trace is not None:
+                trace.nodeExplored(self, current_node, 'backward' if side else 'forward')
+            self.stats.addFrontierSize(len(self.open_list) + len(self.backward_open_list))
+            self.stats.addDepthSize(state.level[current_node])
+            self.traversal.append(labels[current_node])
+            start, end = int(offsets[current_node]), int(offsets[current_node + 1])
+            if trace is not None:
+                trace.childrenInserted(self, current_node)
+            self.stats.addBranchSize(end - start)
+            for i in range(start, end):
+                child, edge_value = int(targets[i]), float(weights[i])
+                path_value = state.cum_value[current_node] + edge_value
+                if not state.visited[child] or (child in open_list and path_value < state.cum_value[child]):
+                    state.visited[child] = 1
+                    state.cum_value[child] = path_value
+                    state.value[child] = edge_value
+                    state.parent[child] = current_node
+                    state.level[child] = state.level[current_node] + 1
+                    state.cost[child] = path_value + sign * potential[child]
+                    open_list.push(child, state.cost[child])
+                    if other.visited[child] and path_value + other.cum_value[child] < best_cost:
+                        best_cost, meeting_node = path_value + other.cum_value[child], child
+            if trace is not None:
+                trace.frontierSnapshot(self, state, open_list)
+        if meeting_node != -1:
+            self.joinBackwardPath(meeting_node)
+
+    def joinBackwardPath(self, meeting_node):
+        """
+        Turns the backward half of a bidirectional search path around: from the meeting_node on, every node gets
+        the previous one as its parent in the forward state, so the goal can be traced back to the start node
+        :param meeting_node:
+            node id of the node where the forward and backward searches met
+        """
+        forward, backward = self.state, self.backward_state
+        current_node = meeting_node
+        while backward.parent[current_node] != -1:
+            next_node = backward.parent[current_node]
+            forward.parent[next_node] = current_node
+            forward.value[next_node] = backward.value[current_node]
+            forward.level[next_node] = forward.level[current_node] + 1
+            current_node = next_node
+        self.settleGoal(current_node)
+        self.goal_found = True
+
+    def contractionSearch(self):
+        """
+        Runs a bidirectional Dijkstra search over the upward edges of the contraction_hierarchy: forward from the
+        start node and backward from the goal nodes. Each side stops once the lowest cost on top of its open_list
+        is no lower than the cheapest path found through a node reached from both sides. The shortcuts on that
+        path are then unpacked, so the path found is made of the edges of the map; the nearest goal node is the
+        one reported, so setStartGoal rejects goal_mode 'all' for this search
+        """
+        hierarchy = self.contraction_hierarchy
+        offsets, targets, weights = hierarchy.up_offsets, hierarchy.up_targets, hierarchy.up_weights
+        labels = self.road_map.labels
+        trace = self.trace
+        states = (self.state, self.backward_state)
+        open_lists = (self.open_list, self.backward_open_list)
+        best_cost, meeting_node = float('inf'), -1
+        if self.is_goal[self.start_node]:
+            best_cost, meeting_node = 0.0, self.start_node
+        while True:
+            sides = [side for side in (0, 1) if len(open_lists[side]) != 0 and open_lists[side].peekCost() < best_cost]
+            if not sides:
                 break
-            adj_nodes = self.getChildren(current_node.label)
-            if self.verbose:
-                print('Inserting new children ', end='')
-                print_adj_list = [x[0] for x in adj_nodes]
-                print(print_adj_list[:])
-            self.stats.addBranchSize(len(adj_nodes))
-            for n in adj_nodes:
-                self.nodes[n[0]].hSLD = self.hSLD(n[0])
-                self.nodes[n[0]].cum_value = float(n[1]) + current_node.cum_value
-                cost = float(n[1]) + current_node.cum_value + self.nodes[n[0]].hSLD
-                self.insertToOpenList(n, 'end', current_node, cost)
-            if self.verbose:
-                print_open_list = [ol.toString() for ol in self.open_list]
-                print('Open list:', print_open_list)
+            side = min(sides, key=lambda s: open_lists[s].peekCost())
+            state, open_list, other = states[side], open_lists[side], states[1 - side]
+            current_node = open_list.pop()
+            if trace is not None:
+                trace.nodeExplored(self, current_node, 'backward' if side else 'forward')
+            self.stats.addFrontierSize(len(self.open_list) + len(self.backward_open_list))
+            self.stats.addDepthSize(state.level[current_node])
+            self.traversal.append(labels[current_node])
+            start, end = int(offsets[current_node]), int(offsets[current_node + 1])
+            self.stats.addBranchSize(end - start)
+            for i in range(start, end):
+                child, edge_value = int(targets[i]), float(weights[i])
+                path_value = state.cum_value[current_node] + edge_value
+                if not state.visited[child] or (child in open_list and path_value < state.cum_value[child]):
+                    state.visited[child] = 1
+                    state.cum_value[child] = path_value
+                    state.value[child] = edge_value
+                    state.parent[child] = current_node
+                    state.level[child] = state.level[current_node] + 1
+                    state.cost[child] = path_value
+                    open_list.push(child, path_value)
+                    if other.visited[child] and path_value + other.cum_value[child] < best_cost:
+                        best_cost, meeting_node = path_value + other.cum_value[child], child
+            if trace is not None:
+                trace.frontierSnapshot(self, state, open_list)
+        if meeting_node != -1:
+            self.unpackPath(meeting_node)
+
+    def unpackPath(self, meeting_node):
+        """
+        Rewrites the parent, value and level of the nodes on the path a 'ch' search found through meeting_node,
+        with every shortcut on it unpacked into the edges of the map, so the goal can be traced back to the start.
+        A path over edges of value 0 can come back to a node it already passed; such loops are cut out
+        """
+        forward, backward = self.state, self.backward_state
+        upward_path = [meeting_node]
+        while forward.parent[upward_path[-1]] != -1:
+            upward_path.append(forward.parent[upward_path[-1]])
+        upward_path.reverse()
+        while backward.parent[upward_path[-1]] != -1:
+            upward_path.append(backward.parent[upward_path[-1]])
+        hierarchy = self.contraction_hierarchy
+        path = [(upward_path[0], 0.0)]
+        position = {upward_path[0]: 0}
+        for node1, node2 in zip(upward_path, upward_path[1:]):
+            for node_id, edge_value in hierarchy.unpack(self.road_map, node1, node2):
+                if node_id in position:
+                    for dropped, _ in path[position[node_id] + 1:]:
+                        del position[dropped]
+                    del path[position[node_id] + 1:]
+                else:
+                    position[node_id] = len(path)
+                    path.append((node_id, edge_value))
+        for (previous_node, _), (node_id, edge_value) in zip(path, path[1:]):
+            forward.parent[node_id] = previous_node
+            forward.value[node_id] = edge_value
+            forward.level[node_id] = forward.level[previous_node] + 1
+        self.settleGoal(path[-1][0])
+        self.goal_found = True
 
     def getChildren(self, node_label):
         """
@@ -202,132 +699,374 @@ class Searcher:
         :param node_label:
             node_label of the parent node
         :return:
-            list of children nodes for the input node
+            list of [label, edge_value] pairs of the children nodes for the input node, sorted by label
         """
-        return sorted(self.nodes[node_label].adjacent_edges, key=lambda x: x[0])
+        node_id = self.road_map.index[node_label]
+        start, end = self.road_map.offsets[node_id], self.road_map.offsets[node_id + 1]
+        return [[self.road_map.labels[t], w] for t, w in
+                zip(self.road_map.targets[start:end].tolist(), self.road_map.weights[start:end].tolist())]
 
     def go(self):
         """
-        Selection Control method. Controls the program flow based on the search algorithm selected
-        """
-        print('z.go()')
-        print(self.search_algo, 'search: from \'' + self.start_node.label + '\' to \'', self.goal_nodes[:], '\'')
-        path_costs = []
-        min_index = 0
-        for x in self.goal_nodes:
-            self.goal_found = False
-            self.nodes = {}
-            self.open_list = []
-            self.traversal = []
-            self.path = []
-            self.adjacentEdges()
-            self.goal_node = self.nodes[x]
-            self.start_node = self.nodes[self.start_label]
-            self.start_node.level = 0
-            self.start_node.value = 0
-            self.start_node.parent = None
-            self.start_node.visited = True
-
-            self.open_list.append(self.start_node)
+        Selection Control method. Controls the program flow based on the search algorithm selected.
+        Runs one search from the start node for all the goal nodes, then reports the path to every goal reached.
+        With a query_cache, the results of a search run before on the same map content, with the same search_algo,
+        start and goal nodes and stats_precision, are reported again through the sink without searching (the search
+        state, e.g. for plotting, is then not filled in). A sink tracing every node always searches, the trace is not
+        cached
+        """
+        if self.query_cache is None or self.trace is not None:
+            self.searchAndReport()
+            return
+        key = self.query_cache.makeKey(self.road_map.fingerprint, self.search_algo, self.start_label,
+                                       self.goal_nodes, self.goal_mode, self.verbose, self.stats_precision)
+        entry = self.query_cache.get(key)
+        if entry is not None:
+            self.replayReport(entry)
+            return
+        self.query_cache.put(key, self.searchAndReport())
 
+    def searchAndReport(self):
+        """
+        Runs the search and reports the path and stats summary for every goal reached, and the optimal route
+        :return:
+            the results reported, as a tuple (traversal, goal_found, stats, [(goal node id, path, path cost)])
+            that replayReport reports again
+        """
+        self.sink.searchStarted(self)
+        goals = []
+        self.paths = []
+        self.search()
+        for goal in self.reportedGoals():
+            self.goal_node = goal
+            p = self.getPath()
+            with self.timed('report'):
+                self.printStats()
+            self.paths.append(p)
+            goals.append((goal, p, self.stats.totalPathCost()))
+        self.reportRoute([cost for _, _, cost in goals])
+        return self.traversal, self.goal_found, copy.deepcopy(self.stats), goals
 
+    def replayReport(self, results):
+        """
+        Reports the results of an earlier search (see searchAndReport) through the sink as if it had just run,
+        and sets traversal, goal_found, path, paths and stats as that search did
+        """
+        traversal, self.goal_found, cached_stats, goals = results
+        self.traversal = list(traversal)
+        self.stats = copy.deepcopy(cached_stats)
+        self.start_node = self.road_map.index[self.start_label]
+        self.sink.searchStarted(self)
+        self.paths = []
+        for goal, path, path_cost in goals:
+            self.goal_node = goal
+            self.path = list(path)
+            self.stats.resetPathCost()
+            self.stats.addPathCost(path_cost)
+            with self.timed('report'):
+                self.sink.pathFound(self)
+                self.printStats()
+            self.paths.append(self.path)
+        self.reportRoute([path_cost for _, _, path_cost in goals])
+
+    def reportRoute(self, path_costs):
+        """
+        Reports the optimal route among the paths found: the lowest path cost, or for the searches that are not
+        cost driven the fewest nodes
+        """
+        if self.search_algo in ('best', 'a_star', 'alt', 'bidirectional', 'bidirectional_a_star', 'ch'):
+            min_index = path_costs.index(min(path_costs))
+        else:
+            min_index = self.paths.index(min(self.paths, key=len))
+        with self.timed('report'):
+            self.sink.routeChosen(self, self.paths[min_index])
+
+    def search(self):
+        """
+        Runs the search_algo from the start node to the goal nodes, without reporting anything
+        """
+        with self.timed('search'):
+            self.resetSearch()
+            self.openStart()
             if self.search_algo == 'breadth':
-                print(
-                    '\'' + self.search_algo + '\' search from: \'' + self.start_node.label + '\' to \'' + self.goal_node.label + '\'')
                 self.breadthFirstSearch()
             if self.search_algo == 'depth':
                 self.depthFirstSearch()
             if self.search_algo == 'best':
                 self.bestFirstSearch()
-            if self.search_algo == 'a_star':
+            if self.search_algo == 'a_star' or self.search_algo == 'alt':
                 self.aStarSearch()
-            p = self.getPath()
-            self.printStats()
-            self.paths.append(p)
-            path_costs.append(self.stats.totalPathCost())
-        if self.search_algo == 'best' or self.search_algo == 'a_star':
-            min_index = path_costs.index(min(path_costs))
-        else:
-            min_index = self.paths.index(min(self.paths, key=len))
-        print()
-        print('The optimal route(lowest path cost/ shortest distance) is', self.paths[min_index])
+            if self.search_algo == 'bidirectional' or self.search_algo == 'bidirectional_a_star':
+                self.bidirectionalSearch()
+            if self.search_algo == 'ch':
+                self.contractionSearch()
+        if self.instrumentation is not None:
+            self.countOperations()
+
+    def reportedGoals(self):
+        """
+        Returns the node ids of the goal nodes to report a path for after a search: the goal nodes reached,
+        or the first goal node when none was reached
+        """
+        return self.settled_goals or self.remaining_goals[:1]
+
+    def query(self, start_label, goal_label):
+        """
+        Runs one search without printing anything, not even the verbose trace of a verbose Searcher
+        :param start_label:
+            label(name) of the start_node
+        :param goal_label:
+            label(name) of the goal_node
+        :return:
+            QueryResult with the path, path cost, stats summary and stats of the search
+        """
+        self.start_label = start_label
+        self.goal_nodes = [goal_label]
+        self.resolveStartGoal()
+        trace, self.trace = self.trace, None
+        try:
+            self.search()
+        finally:
+            self.trace = trace
+        self.goal_node = self.reportedGoals()[0]
+        with self.timed('path'):
+            self.tracePath()
+        return queryresult.QueryResult(start_label, goal_label, self.search_algo, self.goal_found,
+                                       self.path, self.stats.totalPathCost(), self.stats.summary(), self.stats)
+
+    def distance(self, start_label, goal_label, with_path=False):
+        """
+        Finds the path cost between two nodes from the hub_labels, without running a search. When no hub label
+        index was built for the map_file it falls back to a normal search (see query) with the search_algo
+        :param start_label:
+            label(name) of the start_node
+        :param goal_label:
+            label(name) of the goal_node
+        :param with_path:
+            also retrieve the path (through the contraction_hierarchy); otherwise path is left empty
+        :return:
+            QueryResult with the path cost and, if asked for, the path. Its search_algo is 'hub_labels' and its
+            summary None when the answer came from the hub_labels
+        """
+        index = self.hub_labels
+        if index is None:
+            return self.query(start_label, goal_label)
+        start_node, goal_node = self.road_map.index[start_label], self.road_map.index[goal_label]
+        cost, hub = index.distance(start_node, goal_node)
+        path = []
+        if with_path and hub != -1:
+            labels = self.road_map.labels
+            up = index.pathToHub(self.road_map, self.contraction_hierarchy, start_node, hub)
+            down = index.pathToHub(self.road_map, self.contraction_hierarchy, goal_node, hub)
+            path = [start_label] + [labels[node_id] for node_id, _ in up]
+            path += [labels[node_id] for node_id, _ in reversed(down[:-1])] + ([goal_label] if down else [])
+        return queryresult.QueryResult(start_label, goal_label, 'hub_labels', hub != -1, path, cost, None)
+
+    def queryMany(self, pairs, search_algo=None, workers=1, chunk_size=64):
+        """
+        Runs many searches on the road_map without printing anything, spread over a pool of worker processes.
+        The road_map this Searcher holds (and the landmark tables or contraction hierarchy the search_algo needs)
+        is saved in the binary format to a scratch directory; each worker process maps that file once and then runs
+        whole chunks of queries, so the workers answer on exactly this map even if the map_file changed since
+        or there is no file behind it. With one worker the queries run in this process, on the landmark tables and
+        contraction hierarchy this Searcher holds, whether loaded or set
+        :param pairs:
+            iterable of (start_label, goal_label) pairs
+        :param search_algo:
+            Name of the search algorithm to run, by default the search_algo of this Searcher
+        :param workers:
+            number of worker processes; 1 runs every query in this process
+        :param chunk_size:
+            number of queries handed to a worker process at a time
+        :return:
+            list of QueryResult, in the order of pairs
+        """
+        search_algo = search_algo or self.search_algo
+        pairs = list(pairs)
+        if workers <= 1:
+            if search_algo == self.search_algo:
+                return [self.query(start, goal) for start, goal in pairs]
+            searcher = Searcher(search_algo, self.road_map, False, quiet=True)
+            searcher.stats_precision = self.stats_precision
+            searcher.landmark_tables = self._landmark_tables
+            searcher.contraction_hierarchy = self._contraction_hierarchy
+            return [searcher.query(start, goal) for start, goal in pairs]
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        results = []
+        with tempfile.TemporaryDirectory() as scratch:
+            map_file = os.path.join(scratch, 'map.rmap')
+            self.road_map.save(map_file)
+            if search_algo == 'alt':
+                self.landmark_tables.save(map_file + landmarks.SUFFIX, self.road_map.fingerprint)
+            if search_algo == 'ch':
+                self.contraction_hierarchy.save(map_file + contraction.SUFFIX, self.road_map.fingerprint)
+            with concurrent.futures.ProcessPoolExecutor(workers, initializer=_initWorker,
+                                                        initargs=(map_file, search_algo, self.stats_precision)) as pool:
+                for chunk_results in pool.map(_runQueries, chunks):
+                    results.extend(chunk_results)
+        return results
+
+    def reportContraction(self, pairs, baseline_algo='best'):
+        """
+        Prints the preprocessing time and shortcut count of the contraction_hierarchy (building it if needed), and the
+        query speedup of the 'ch' search on that hierarchy over baseline_algo on pairs. Only the queries are timed:
+        both Searchers, and whatever preprocessing baseline_algo needs, are set up before the clock starts
+        :param pairs:
+            iterable of (start_label, goal_label) pairs to time both searches on
+        :return:
+            dict with the numbers printed
+        """
+        pairs = list(pairs)
+        hierarchy = self.contraction_hierarchy
+        baseline = Searcher(baseline_algo, self.road_map, False, quiet=True)
+        baseline.stats_precision = self.stats_precision
+        if baseline_algo == 'alt':
+            baseline.landmark_tables = self.landmark_tables
+        ch = Searcher('ch', self.road_map, False, quiet=True)
+        ch.stats_precision = self.stats_precision
+        ch.contraction_hierarchy = hierarchy
+        query_times = {}
+        for search_algo, searcher in ((baseline_algo, baseline), ('ch', ch)):
+            started = time.perf_counter()
+            for start, goal in pairs:
+                searcher.query(start, goal)
+            query_times[search_algo] = (time.perf_counter() - started) / max(len(pairs), 1)
+        report = {'preprocessing_time': hierarchy.build_time, 'shortcut_count': hierarchy.shortcut_count,
+                  'baseline_query_time': query_times[baseline_algo], 'ch_query_time': query_times['ch'],
+                  'speedup': query_times[baseline_algo] / query_times['ch']}
+        print('Contraction hierarchy of \'%s\':' % self.map_file, len(self.road_map), 'nodes,',
+              len(self.road_map.edge_values), 'edges,', hierarchy.shortcut_count, 'shortcuts')
+        print('Preprocessing time= %.3f s' % hierarchy.build_time)
+        print('Average query time: \'' + baseline_algo + '\'= %.3f ms ; \'ch\'= %.3f ms ; speedup= %.1fx' %
+              (query_times[baseline_algo] * 1000, query_times['ch'] * 1000, report['speedup']))
+        return report
 
+    def settleGoal(self, node_id):
+        """
+        Records that the search reached a goal node
+        :param node_id:
+            node id of the goal node
+        :return:
+            True when the search can stop: at the first goal node in 'nearest' goal_mode, once every goal node
+            is reached in 'all' goal_mode
+        """
+        self.settled_goals.append(node_id)
+        self.remaining_goals.remove(node_id)
+        self.goal_found = self.goal_mode == 'nearest' or not self.remaining_goals
+        return self.goal_found
 
+    def reprioritizeOpenList(self):
+        """
+        Recomputes hSLD, and with it the cost, of every node on the a_star open_list after the remaining goals changed
+        """
+        state = self.state
+        queued = list(self.open_list)
+        old_hSLD = [state.hSLD[node_id] for node_id in queued]
+        self.computeHSLD()
+        for node_id, h in zip(queued, old_hSLD):
+            state.cost[node_id] += state.hSLD[node_id] - h
+            self.open_list.push(node_id, state.cost[node_id])
 
-    def insertToOpenList(self, adj_node, insert_at, current_node=None, cost=None):
+    def insertToOpenList(self, node_id, edge_value, insert_at, current_node=None, cost=None):
         """
         Adds a node to the open_list (consists of nodes that have been visited but not expanded)
         :param cost:
-        :param adj_node:
-            Node to be added
+        :param node_id:
+            node id of the node to be added
+        :param edge_value:
+            value of the edge from current_node to the node
         :param insert_at:
-            front/end/at_order of the list
+            front/end/at_order of the list, or priority for the cost ordered frontier
         :param current_node:
-            parent_node of the given node to be added
-        """
-        n = self.nodes[adj_node[0]]
-        if not n.visited or (self.search_algo != 'breadth' and n in self.open_list):
-            if self.search_algo == 'depth' and n in self.open_list:
-                self.open_list.remove(n)
-            elif self.search_algo == 'best':
-                if n in self.open_list:
-                    if n.cost > cost:
-                        self.open_list.remove(n)
-                    else:
-                        return
-                n.cost = float(cost)
-                n.value = float(adj_node[1])
-            elif self.search_algo == 'a_star':
-                if n in self.open_list:
-                    if n.cost > cost:
-                        self.open_list.remove(n)
-                    else:
-                        return
-                n.cost = float(cost)
-                n.value = float(adj_node[1])
-            if self.search_algo == 'breadth' or self.search_algo == 'depth':
-                n.value = float(adj_node[1])
-            n.visited = True
+            node id of the parent_node of the given node to be added
+        """
+        state = self.state
+        if not state.visited[node_id] or node_id in self.open_list:
+            if self.search_algo in ('best', 'a_star', 'alt'):
+                if node_id in self.open_list and state.cost[node_id] <= cost:
+                    return
+                state.cost[node_id] = cost
+            state.value[node_id] = edge_value
+            state.visited[node_id] = 1
             if current_node is not None:
-                n.parent = current_node.label
-                n.level = current_node.level + 1
+                state.parent[node_id] = current_node
+                state.level[node_id] = state.level[current_node] + 1
             if insert_at == 'front':
-                self.open_list.insert(0, n)
+                self.open_list.insert(0, node_id)
             elif insert_at == 'end':
-                self.open_list.append(n)
+                self.open_list.append(node_id)
             elif insert_at == 'order':
-                self.open_list.append(n)
-                self.open_list.sort(key=lambda x: x.value)
+                self.open_list.append(node_id)
+                self.open_list.sort(key=lambda x: state.value[x])
+            elif insert_at == 'priority':
+                self.open_list.push(node_id, state.cost[node_id])
+
+    def openStart(self):
+        """
+        Marks the start_node as the root of the search, creates a fresh open_list for the search algorithm
+        and puts the start_node on it. best, a_star and alt keep their open_list in a PriorityFrontier, depth in a
+        StackFrontier and breadth in a plain list of the nodes of the current level.
+        The bidirectional and 'ch' searches also get a backward_state and backward_open_list holding the goal nodes
+        """
+        self.state.level[self.start_node] = 0
+        self.state.visited[self.start_node] = 1
+        if self.search_algo == 'a_star' or self.search_algo == 'alt':
+            self.computeHSLD()
+        if self.search_algo in ('best', 'a_star', 'alt'):
+            self.open_list = frontier.PriorityFrontier()
+            self.open_list.push(self.start_node, self.state.cost[self.start_node])
+        elif self.search_algo in ('bidirectional', 'bidirectional_a_star', 'ch'):
+            self.open_list = frontier.PriorityFrontier()
+            self.open_list.push(self.start_node, 0.0)
+            self.backward_state = searchstate.SearchState(len(self.road_map))
+            self.backward_open_list = frontier.PriorityFrontier()
+            for goal in self.remaining_goals:
+                self.backward_state.level[goal] = 0
+                self.backward_state.visited[goal] = 1
+                self.backward_open_list.push(goal, 0.0)
+        elif self.search_algo == 'depth':
+            self.open_list = frontier.StackFrontier(len(self.road_map))
+            self.open_list.push(self.start_node)
+        else:
+            self.open_list = [self.start_node]
 
-    def setStartGoal(self, start_label, goal_label):
+    def setStartGoal(self, start_label, goal_label, goal_mode='nearest'):
         """
-        Sets and initializes the start and goal_node
+        Sets the start and goal nodes; the search itself is set up by search
         :param start_label:
             label(name) of the start_node
         :param goal_label:
-            label(name) of the goal_node
+            label(name) of the goal_node, or a list of labels
+        :param goal_mode:
+            with several goal nodes, 'nearest' finds the path to the nearest one, 'all' the paths to all of them.
+            Either way the goal nodes are found in a single search. The bidirectional and contraction hierarchy
+            searches stop where the two sides first meet, so they only find the nearest one
+        :raises ValueError:
+            goal_mode 'all' with several goal nodes for a search_algo that only finds the nearest one
         """
-        self.start_label = start_label
-        self.start_node = self.nodes[start_label]
-        self.start_node.level = 0
-        self.start_node.value = 0
-        self.start_node.parent = None
-        self.start_node.visited = True
-        self.open_list.append(self.start_node)
+        goal_nodes = []
         if type(goal_label) is not list:
-            self.goal_nodes.append(goal_label)
+            goal_nodes.append(goal_label)
         else:
             for i in goal_label:
-                self.goal_nodes.append(i)
+                goal_nodes.append(i)
+        if goal_mode == 'all' and len(set(goal_nodes)) > 1 and \
+                self.search_algo in ('bidirectional', 'bidirectional_a_star', 'ch'):
+            raise ValueError('goal_mode \'all\' is not supported by the \'' + self.search_algo +
+                             '\' search, which only finds the nearest goal node')
+        self.goal_nodes = goal_nodes
+        self.goal_mode = goal_mode
+        self.start_label = start_label
+        self.resolveStartGoal()
 
-        print('z.setStartGoal(\'' + start_label + '\',\'' + str(self.goal_nodes[:]) + '\')')
+        self.sink.startGoalSet(self)
 
     def showOpen(self):
         """
         Prints tuples of (label, value) from the open_list
         """
         for o in self.open_list:
-            t = (o.label, o.value)
+            t = (self.road_map.labels[o], self.state.value[o])
             print(t, end='')
         print()
 
@@ -339,41 +1078,104 @@ class Searcher:
 
     def hSLD(self, node_label):
         """
-        Returns the cartesian distance between the goal node some other node that is passed in
+        Returns the cartesian distance between the nearest of the remaining goal nodes and some other node
+        that is passed in
+        :param node_label:
+            label(name) of the other node
         """
-        current_node = self.nodes[node_label]
-        node1 = node.Node(current_node.x, current_node.y)
-        node2 = node.Node(self.goal_node.x, self.goal_node.y)
-        return node2.distance(node1)
+        return self.hSLDById(self.road_map.index[node_label])
 
-    def getPath(self):
+    def hSLDById(self, node_id):
+        """
+        Returns the cartesian distance between the nearest of the remaining goal nodes (the goal nodes, before
+        a search ran) and some other node, the value the a_star search holds in its hSLD column
+        :param node_id:
+            node id of the other node
+        """
+        xs, ys = self.road_map.xs, self.road_map.ys
+        goals = self.remaining_goals if self.state is not None else self.goal_ids
+        distance = float('inf')
+        for goal in goals:
+            dx = float(xs[node_id] - xs[goal])
+            dy = float(ys[node_id] - ys[goal])
+            distance = min(distance, math.sqrt(dx * dx + dy * dy))
+        return distance
+
+    def computeHSLD(self):
+        """
+        Fills the hSLD column of the SearchState with the cartesian distance from every node to the nearest of
+        the remaining goal nodes, or for the 'alt' search with the landmark lower bound on the path cost to it
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.count('heuristic_evaluations', len(self.road_map) * len(self.remaining_goals))
+        if self.search_algo == 'alt':
+            h = self.landmark_tables.lowerBounds(self.remaining_goals)
+        else:
+            h = self.straightLineDistances(self.remaining_goals)
+        np.frombuffer(self.state.hSLD, dtype=np.float64)[:] = h
+
+    def straightLineDistances(self, node_ids):
+        """
+        Returns a numpy array with the cartesian distance from every node to the nearest of the given nodes,
+        computed at once over the road_map coordinate arrays
+        :param node_ids:
+            node ids of the nodes to measure to
         """
-        Prints the nodes that are visited to reach the goal_node
+        xs, ys = self.road_map.xs, self.road_map.ys
+        distances = np.full(len(self.road_map), np.inf)
+        for node_id in node_ids:
+            dx = xs - xs[node_id]
+            dy = ys - ys[node_id]
+            np.minimum(distances, np.sqrt(dx * dx + dy * dy), out=distances)
+        return distances
+
+    def tracePath(self):
+        """
+        Follows the parents from the goal_node back to the start node; fills path and adds up its path cost
         """
+        self.path = []
+        self.stats.resetPathCost()
         self.stats.searched_nodes = len(self.traversal)
-        p = self.goal_node.label
-        while p is not None:
-            self.stats.addPathCost(self.nodes[p].value)
-            self.path.append(p)
-            p = self.nodes[p].parent
+        p = self.goal_node
+        while p != -1:
+            self.stats.addPathCost(self.state.value[p])
+            self.path.append(self.road_map.labels[p])
+            p = self.state.parent[p]
         self.path.reverse()
-        print('Success! reached goal node \'' + self.goal_node.label + '\' with path:', self.path)
+        return self.path
+
+    def getPath(self):
+        """
+        Traces the nodes that are visited to reach the goal_node and reports the path to the sink
+        """
+        with self.timed('path'):
+            self.tracePath()
+        with self.timed('report'):
+            self.sink.pathFound(self)
         return self.path
 
     def printStats(self):
         """
-        Prints the stats summary for the search
-        """
-        print('------------------------')
-        print('SEARCH SUMMARY STATS:')
-        print('Search Type: \'' + self.search_algo + '\'. Map file: \'' + self.map_file + '\'')
-        print('Total Nodes in Graph:', self.stats.total_nodes)
-        print('Start Node:', '\'' + self.start_node.label + '\',', 'Goal Node(s):', '\'' + self.goal_node.label + '\'')
-        print('Searched total of', self.stats.searched_nodes, 'nodes out of total of', self.stats.total_nodes,
-              'nodes in the graph')
-        print('Ended at \'' + self.goal_node.label + '\' with path cost:', self.stats.totalPathCost())
-        print('Path (' + str(len(self.path)) + '):', self.path)
-        print('Frontier Size: Average=', self.stats.averageFrontierSize(), '; Max size=', self.stats.maxFrontierSize())
-        print('Depth of Search: Average=', self.stats.averageDepthSize(), '; Max depth=', self.stats.maxDepthSize())
-        print('Average branching factor=', self.stats.averageBranchingFactor())
-        print('Order of Node Expansion:', self.traversal)
+        Reports the stats summary for the search to the sink, which prints it
+        """
+        self.sink.statsReported(self)
+
+
+_worker_searcher = None
+
+
+def _initWorker(map_file, search_algo, stats_precision=None):
+    """
+    Sets up a queryMany worker process: loads the map (the binary map queryMany saved) once for all the queries the
+    process will run
+    """
+    global _worker_searcher
+    _worker_searcher = Searcher(search_algo, roadmap.load(map_file), False, quiet=True)
+    _worker_searcher.stats_precision = stats_precision
+
+
+def _runQueries(pairs):
+    """
+    Runs a chunk of queryMany queries in a worker process
+    """
+    return [_worker_searcher.query(start, goal) for start, goal in pairs]
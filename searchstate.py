@@ -0,0 +1,65 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+from array import array
+
+import numpy as np
+
+
+class SearchState:
+    """A class to represent the per-query state of one search over a RoadMap.
+    ...
+    The RoadMap only holds the static map; everything a search writes lives here, in flat arrays
+    indexed by node id. A fresh SearchState is made for every query, so any number of searches
+    (in any number of threads) can share one RoadMap without copying or locking it.
+
+    Attributes
+    ----------
+    level : array of int
+        level of every node in the search tree, -1 until the node is reached
+    parent : array of int
+        node id of the parent of every node, -1 for the start node and unreached nodes
+    value : array of float
+        value of the edge from the parent to every node
+    hSLD : array of float
+        Straight line distance from every node to the goal
+    cost : array of float
+        cost every node was queued with on the open_list
+    cum_value : array of float
+        path cost from the start node to every node (a_star)
+    visited : bytearray
+        Marks every node as visited(1) or not visited(0)
+    """
+
+    def __init__(self, node_count):
+        """
+        Constructs the state of a new search
+        :param node_count:
+            number of nodes in the RoadMap being searched
+        """
+        self.level = array('l', [-1]) * node_count
+        self.parent = array('l', [-1]) * node_count
+        self.value = array('d', [0.0]) * node_count
+        self.hSLD = array('d', [0.0]) * node_count
+        self.cost = array('d', [0.0]) * node_count
+        self.cum_value = array('d', [0.0]) * node_count
+        self.visited = bytearray(node_count)
+
+    def arrays(self):
+        """
+        Returns NumPy views (not copies) of the level, parent, value and visited columns, for searches
+        that update whole sets of nodes at once
+        """
+        return (np.frombuffer(self.level, dtype=self.level.typecode),
+                np.frombuffer(self.parent, dtype=self.parent.typecode),
+                np.frombuffer(self.value, dtype=np.float64),
+                np.frombuffer(self.visited, dtype=np.bool_))
+
+    def toString(self, node_id, label, heuristic=True):
+        """
+        Returns the key attribute values of a node in a string format.
+        :param heuristic:
+            False for the searches that never fill in hSLD, which is then shown as 0
+        """
+        return '' + label + ';' + str(self.level[node_id]) + ';' + str(self.value[node_id]) + ';' + \
+            (str(self.hSLD[node_id]) if heuristic else '0') + ';' + str(self.cost[node_id])
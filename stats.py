@@ -1,99 +1,392 @@
 # This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
 __author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
 
+import math
+
+import numpy as np
+
+
+class RunningStat:
+    """A class to represent the running aggregates of a stream of non negative numbers, kept in constant memory.
+    ...
+    Nothing is kept per value: the count, total, minimum, maximum, mean and variance (Welford's M2) are updated
+    as the values come in. Values are added to a short pending list first and folded into the aggregates a
+    batch at a time with numpy, which is much cheaper per value than updating the aggregates one by one.
+    With a precision, a quantile sketch is kept too: a histogram whose bucket i counts the values in
+    (gamma ** (i - 1), gamma ** i], gamma = (1 + precision) / (1 - precision), so every percentile it gives is
+    within precision (relative) of the exact one, and values up to 1e9 need at most about 1000 buckets at 1%.
+
+    Attributes
+    ----------
+    count : int
+        number of values added
+    total : int or float
+        sum of the values added
+    minimum : int or float
+        lowest value added, None before any value is added
+    maximum : int or float
+        highest value added, None before any value is added
+    mean : float
+        mean of the values added
+    m2 : float
+        sum of the squared differences from the mean, the variance times count
+    precision : float
+        relative accuracy of the percentiles, None to keep no quantile sketch
+    gamma : float
+        ratio between the bounds of a bucket of the quantile sketch, None with no quantile sketch
+    buckets : dict
+        number of values in every bucket of the quantile sketch, with the bucket index as the key
+    zeros : int
+        number of values of 0 (or below) in the quantile sketch
+    pending : list
+        values added but not folded into the aggregates yet, at most batch_size of them
+    """
+
+    batch_size = 1024
+
+    def __init__(self, precision=None):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.precision = precision
+        self.gamma = None if precision is None else (1 + precision) / (1 - precision)
+        self.buckets = {}
+        self.zeros = 0
+        self.pending = []
+
+    def add(self, value):
+        """
+        Adds a value to the stream
+        """
+        self.pending.append(value)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def addMany(self, values):
+        """
+        Adds several values (a list or a numpy array) to the stream. A batch of at least batch_size values is folded
+        in at once; smaller ones join the pending values, like add
+        """
+        if len(values) >= self.batch_size:
+            self.fold(np.asarray(values))
+            return
+        self.pending.extend(values.tolist() if isinstance(values, np.ndarray) else values)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Folds the pending values into the aggregates
+        """
+        if self.pending:
+            values, self.pending = self.pending, []
+            self.fold(np.asarray(values))
+
+    def fold(self, values):
+        """
+        Folds a numpy array of values into the aggregates, combining the mean and M2 of the batch with the
+        running ones (Chan et al.)
+        """
+        if values.size == 0:
+            return
+        count = int(values.size)
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        self.combine(count, values.sum().item(), values.min().item(), values.max().item(), mean, m2)
+        if self.gamma is not None:
+            positive = values[values > 0]
+            self.zeros += count - int(positive.size)
+            if positive.size:
+                indexes, counts = np.unique(np.ceil(np.log(positive) / math.log(self.gamma)), return_counts=True)
+                for i, c in zip(indexes.astype(np.int64).tolist(), counts.tolist()):
+                    self.buckets[i] = self.buckets.get(i, 0) + c
+
+    def combine(self, count, total, minimum, maximum, mean, m2):
+        """
+        Combines the aggregates of another batch of values with the running ones
+        """
+        if count == 0:
+            return
+        merged = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / merged
+        self.m2 += m2 + delta * delta * self.count * count / merged
+        self.count = merged
+        self.total += total
+        self.minimum = minimum if self.minimum is None else min(self.minimum, minimum)
+        self.maximum = maximum if self.maximum is None else max(self.maximum, maximum)
+
+    def merge(self, other):
+        """
+        Adds every value of another RunningStat to this one, as if they had all been added here
+        :raises ValueError:
+            this RunningStat keeps a quantile sketch and other (with values) keeps none or one of another precision:
+            its values could not be ranked, so every percentile would come out wrong
+        """
+        self.flush()
+        other.flush()
+        if self.gamma is not None and other.count and other.gamma != self.gamma:
+            raise ValueError('cannot merge the values of a RunningStat with precision ' + str(other.precision) +
+                             ' into one with precision ' + str(self.precision))
+        self.combine(other.count, other.total, other.minimum, other.maximum, other.mean, other.m2)
+        if self.gamma is not None:
+            self.zeros += other.zeros
+            for i, c in other.buckets.items():
+                self.buckets[i] = self.buckets.get(i, 0) + c
+
+    def variance(self):
+        """
+        :return: the (population) variance of the values, 0 if there are none
+        """
+        self.flush()
+        return self.m2 / self.count if self.count else 0
+
+    def percentile(self, q):
+        """
+        :param q:
+            percentage, from 0 to 100
+        :return: the q-th percentile of the values from the quantile sketch, 0 if there are none, None if no
+            sketch is kept
+        """
+        if self.gamma is None:
+            return None
+        self.flush()
+        if not self.count:
+            return 0
+        rank = q / 100 * (self.count - 1)
+        seen = self.zeros
+        if seen > rank:
+            return max(self.minimum, 0)
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen > rank:
+                return min(max(2 * self.gamma ** i / (self.gamma + 1), self.minimum), self.maximum)
+        return self.maximum
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        :return: dictionary of the count, mean, standard deviation, minimum, maximum and (with a quantile sketch)
+            the given percentiles of the values
+        """
+        self.flush()
+        result = {'count': self.count, 'mean': self.mean, 'std': math.sqrt(self.variance()),
+                  'min': self.minimum, 'max': self.maximum}
+        if self.gamma is not None:
+            for q in percentiles:
+                result['p' + str(q)] = self.percentile(q)
+        return result
+
 
 class Stats:
     """A class to represent the Stats.
     ...
+    The frontier sizes, depths and branch sizes are streamed into RunningStat aggregates, so a search keeps the
+    same few numbers however many nodes it expands. Stats of many searches can be merged into one aggregate.
+
     Attributes
     ----------
-    list_of_frontier_size : list
-        list of the open_list length when a new node is taken out for exploration
+    frontier_sizes : RunningStat
+        the open_list length when a new node is taken out for exploration
     total_nodes : str
         total number of nodes in the map
     searched_nodes : int
         number of nodes that are traversed from a point
-    list_of_path_cost : str
-        list of path cost
-    list_of_depth_size : int
-        list of level for every traversal node
-    list_of_branch_size : float
-        list of no of children for every node traversed
+    path_cost : float
+        running total of the path cost
+    depth_sizes : RunningStat
+        the level of every traversal node
+    branch_sizes : RunningStat
+        the no of children of every node traversed
+    queries : int
+        number of searches the stats are for, more than 1 after merging
     """
 
-    def __init__(self):
-        self.list_of_frontier_size = []
+    def __init__(self, precision=None):
+        """
+        :param precision:
+            relative accuracy of the percentiles of the frontier sizes, depths and branch sizes, None to keep
+            no percentiles
+        """
+        self.frontier_sizes = RunningStat(precision)
         self.total_nodes = 0
         self.searched_nodes = 0
-        self.list_of_path_cost = []
-        self.list_of_depth_size = []
-        self.list_of_branch_size = []
+        self.path_cost = 0
+        self.depth_sizes = RunningStat(precision)
+        self.branch_sizes = RunningStat(precision)
+        self.queries = 1
 
     def addFrontierSize(self, size):
         """
-        Add the len of open list at a given instance to the list
+        Add the len of open list at a given instance to the frontier sizes
         :param size:
         """
-        self.list_of_frontier_size.append(size)
+        self.frontier_sizes.add(size)
+
+    def addFrontierSizes(self, sizes):
+        """
+        Add the len of open list at several instances to the frontier sizes
+        :param sizes:
+        """
+        self.frontier_sizes.addMany(sizes)
 
     def averageFrontierSize(self):
         """
         :return: the average frontier size
         """
-        return sum(self.list_of_frontier_size) / len(self.list_of_frontier_size)
+        return self.average(self.frontier_sizes)
 
     def maxFrontierSize(self):
         """
         :return: maximum frontier size
         """
-        return max(self.list_of_frontier_size)
+        return self.largest(self.frontier_sizes)
 
     def addPathCost(self, cost):
         """
-        Add the path cost of a node at a given instance to the list
-        :param size:
+        Add the path cost of a node at a given instance to the running total
+        :param cost:
+        """
+        self.path_cost += cost
+
+    def resetPathCost(self):
+        """
+        Clears the running total of path cost, before adding up the path to another goal
         """
-        self.list_of_path_cost.append(cost)
+        self.path_cost = 0
 
     def totalPathCost(self):
         """
         :return: total path cost
         """
-        return sum(self.list_of_path_cost)
+        return self.path_cost
 
     def addDepthSize(self, size):
         """
-        Adds the level no of the node to the list
+        Adds the level no of the node to the depth sizes
         :param size:
         """
-        self.list_of_depth_size.append(size)
+        self.depth_sizes.add(size)
+
+    def addDepthSizes(self, sizes):
+        """
+        Adds the level no of several nodes to the depth sizes
+        :param sizes:
+        """
+        self.depth_sizes.addMany(sizes)
 
     def maxDepthSize(self):
         """
         :return: maximum depth size
         """
-        return max(self.list_of_depth_size)
+        return self.largest(self.depth_sizes)
 
     def averageDepthSize(self):
         """
         :return: average depth size
         """
-        return sum(self.list_of_depth_size) / len(self.list_of_depth_size)
+        return self.average(self.depth_sizes)
 
     def addBranchSize(self, size):
         """
-        Adds the branch size to the list
+        Adds the branch size to the branch sizes
         :param size:
         :return:
         """
-        self.list_of_branch_size.append(size)
+        self.branch_sizes.add(size)
+
+    def addBranchSizes(self, sizes):
+        """
+        Adds several branch sizes to the branch sizes
+        :param sizes:
+        """
+        self.branch_sizes.addMany(sizes)
 
     def averageBranchingFactor(self):
         """
         :return: average branching factor
         """
-        return sum(self.list_of_branch_size) / (len(self.list_of_branch_size) + 1)
+        self.branch_sizes.flush()
+        return self.branch_sizes.total / (self.branch_sizes.count + 1)
 
+    @staticmethod
+    def average(running_stat):
+        """
+        :return: the total of running_stat over its count, 0 if it has no values
+        """
+        running_stat.flush()
+        if not running_stat.count:
+            return 0
+        return running_stat.total / running_stat.count
 
+    @staticmethod
+    def largest(running_stat):
+        """
+        :return: the maximum of running_stat, 0 if it has no values
+        """
+        running_stat.flush()
+        return 0 if running_stat.maximum is None else running_stat.maximum
 
+    def merge(self, other):
+        """
+        Adds the stats of another search to these ones: the frontier sizes, depths and branch sizes are merged,
+        the searched nodes and path costs added up
+        :raises ValueError:
+            the two keep percentiles of different precisions, see RunningStat.merge
+        """
+        self.frontier_sizes.merge(other.frontier_sizes)
+        self.depth_sizes.merge(other.depth_sizes)
+        self.branch_sizes.merge(other.branch_sizes)
+        self.total_nodes = max(self.total_nodes, other.total_nodes)
+        self.searched_nodes += other.searched_nodes
+        self.path_cost += other.path_cost
+        self.queries += other.queries
 
+    def summary(self):
+        """
+        :return: dictionary of the figures printed in the search summary
+        """
+        return {
+            'total_nodes': self.total_nodes,
+            'searched_nodes': self.searched_nodes,
+            'path_cost': self.totalPathCost(),
+            'average_frontier_size': self.averageFrontierSize(),
+            'max_frontier_size': self.maxFrontierSize(),
+            'average_depth': self.averageDepthSize(),
+            'max_depth': self.maxDepthSize(),
+            'average_branching_factor': self.averageBranchingFactor(),
+        }
+
+    def report(self):
+        """
+        :return: dictionary of the number of searches, the nodes searched and the full aggregates (see
+            RunningStat.summary) of the frontier sizes, depths and branch sizes
+        """
+        return {
+            'queries': self.queries,
+            'total_nodes': self.total_nodes,
+            'searched_nodes': self.searched_nodes,
+            'path_cost': self.totalPathCost(),
+            'frontier_size': self.frontier_sizes.summary(),
+            'depth': self.depth_sizes.summary(),
+            'branching_factor': self.branch_sizes.summary(),
+        }
+
+
+def mergeAll(stats_list, precision=None):
+    """
+    Returns one Stats aggregating the Stats of many searches, e.g. [result.stats for result in queryMany(...)]
+    :param precision:
+        relative accuracy of the percentiles of the aggregate, None (the default) to keep none; otherwise it must be
+        the precision of the stats merged
+    :raises ValueError:
+        precision is not None and not the precision of one of the stats merged
+    """
+    merged = Stats(precision)
+    merged.queries = 0
+    for other in stats_list:
+        if other is not None:
+            merged.merge(other)
+    return merged
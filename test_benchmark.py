@@ -0,0 +1,102 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the regression rules of benchmark.compare on hand made results: a time or memory metric regresses only past
+# both the threshold and its noise floor, any change in the nodes expanded regresses, missing metrics and rows with
+# no baseline are not compared. Also checks that runOne skips 'ch' on maps over the node limit.
+# Usage:
+#   python -m pytest -q test_benchmark.py
+
+import os
+
+import pytest
+
+import benchmark
+
+
+def result(map_name='m.txt', search_algo='best', load_time=1.0, preprocess_time=None, p50=0.01, p90=0.02,
+           peak_memory_mb=100.0, expanded=50):
+    """
+    Returns a result as runOne reports it, with only the compared fields
+    """
+    return {'map': map_name, 'search_algo': search_algo, 'load_time': load_time, 'preprocess_time': preprocess_time,
+            'latency': {'p50': p50, 'p90': p90, 'p99': p90}, 'nodes_expanded': {'mean': expanded, 'total': expanded},
+            'peak_memory_mb': peak_memory_mb}
+
+
+def rowsByMetric(baseline, current, threshold=0.1):
+    """
+    Returns the rows of comparing one baseline result with one current result, by metric name
+    """
+    return {row['metric']: row for row in benchmark.compare({'results': [baseline]}, {'results': [current]},
+                                                            threshold)}
+
+
+def test_metric_follows_the_key_path():
+    assert benchmark.metric(result(p90=0.5), ('latency', 'p90')) == 0.5
+    assert benchmark.metric(result(), ('missing',)) is None
+    assert benchmark.metric(result(), ('missing', 'p50')) is None
+    assert benchmark.metric(result(), ('preprocess_time',)) is None
+
+
+def test_no_change_is_no_regression():
+    rows = rowsByMetric(result(), result())
+    assert set(rows) == {'load_time', 'latency_p50', 'latency_p90', 'peak_memory_mb', 'nodes_expanded'}
+    assert not any(row['regression'] for row in rows.values())
+    assert all(row['ratio'] == 1.0 for row in rows.values())
+
+
+def test_increase_past_threshold_and_floor_is_a_regression():
+    rows = rowsByMetric(result(), result(load_time=1.2, p50=0.02, peak_memory_mb=120.0))
+    assert rows['load_time']['regression'] and rows['load_time']['ratio'] == pytest.approx(1.2)
+    assert rows['latency_p50']['regression']
+    assert rows['peak_memory_mb']['regression']
+    assert not rows['latency_p90']['regression']
+
+
+def test_increase_within_threshold_is_no_regression():
+    rows = rowsByMetric(result(), result(load_time=1.05, peak_memory_mb=109.0))
+    assert not rows['load_time']['regression'] and not rows['peak_memory_mb']['regression']
+    rows = rowsByMetric(result(), result(load_time=1.05), threshold=0.01)
+    assert rows['load_time']['regression']
+
+
+def test_increase_within_the_noise_floor_is_no_regression():
+    # p50 x3 and load_time x2, but by less than their 0.5 ms and 1 ms floors
+    rows = rowsByMetric(result(load_time=0.0004, p50=0.0001), result(load_time=0.0008, p50=0.0003))
+    assert rows['latency_p50']['ratio'] == pytest.approx(3.0)
+    assert not rows['latency_p50']['regression'] and not rows['load_time']['regression']
+
+
+def test_decrease_is_no_regression():
+    rows = rowsByMetric(result(), result(load_time=0.1, p50=0.001, p90=0.002, peak_memory_mb=10.0))
+    assert not any(row['regression'] for row in rows.values())
+
+
+def test_any_change_in_nodes_expanded_is_a_regression():
+    for expanded in (49, 51):
+        row = rowsByMetric(result(expanded=50), result(expanded=expanded))['nodes_expanded']
+        assert row['regression'] and row['ratio'] == pytest.approx(expanded / 50)
+
+
+def test_from_zero_time_is_an_infinite_ratio():
+    rows = rowsByMetric(result(preprocess_time=0.0), result(preprocess_time=0.5))
+    assert rows['preprocess_time']['ratio'] == float('inf') and rows['preprocess_time']['regression']
+    rows = rowsByMetric(result(preprocess_time=0.0), result(preprocess_time=0.0))
+    assert rows['preprocess_time']['ratio'] == 1.0 and not rows['preprocess_time']['regression']
+
+
+def test_missing_metrics_and_unmatched_rows_are_not_compared():
+    rows = rowsByMetric(result(preprocess_time=0.3, peak_memory_mb=None), result(preprocess_time=None))
+    assert 'preprocess_time' not in rows and 'peak_memory_mb' not in rows
+    baseline = {'results': [result(search_algo='best')]}
+    current = {'results': [result(search_algo='a_star'), result(map_name='other.txt')]}
+    assert benchmark.compare(baseline, current) == []
+
+
+def test_ch_is_skipped_over_the_node_limit():
+    map_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tenNode.txt')
+    assert benchmark.runOne(map_file, 'ch', 3, 1, max_ch_nodes=9) is None
+    for max_ch_nodes in (10, 0):
+        ran = benchmark.runOne(map_file, 'ch', 3, 1, max_ch_nodes=max_ch_nodes)
+        assert ran['nodes'] == 10 and ran['queries'] == 3 and ran['preprocess_time'] is not None
@@ -0,0 +1,110 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the contraction hierarchy build: the hop limited witness searches, the shortcuts a node needs, the shape of
+# the hierarchy (upward edges only, every shortcut unpacking into map edges of the same cost) and that the 'ch'
+# search finds the path costs of the 'best' search whatever the hop limits, which only trade shortcuts for build time.
+# Usage:
+#   python -m pytest -q test_contraction.py
+
+import os
+
+import pytest
+
+import contraction
+import roadmap
+import searcher
+import test_searcher
+
+
+def chain(length, direct):
+    """
+    Returns the graph (as build keeps it) of a chain of length edges of cost 1 from node 0 to node length, plus an
+    edge of cost direct between its ends
+    """
+    graph = [{} for _ in range(length + 1)]
+    for u, v, w in [(i, i + 1, 1.0) for i in range(length)] + [(0, length, direct)]:
+        graph[u][v] = w
+        graph[v][u] = w
+    return graph
+
+
+def test_witness_search_follows_paths_of_at_most_hop_limit_edges():
+    graph = chain(4, 10.0)
+    assert contraction.witnessDistances(graph, 0, None, {4}, 100.0, 4)[4] == 4.0
+    assert contraction.witnessDistances(graph, 0, None, {4}, 100.0, 3)[4] == 10.0
+    assert 3 not in contraction.witnessDistances(graph, 0, None, {4}, 100.0, 2)
+    assert contraction.witnessDistances(graph, 0, 2, {4}, 100.0, 4)[4] == 10.0
+
+
+def test_settle_limit_grows_with_the_square_of_the_hops():
+    assert [contraction.settleLimit(hops) for hops in (1, 2, 5)] == \
+        [contraction.SETTLE_PER_HOP, 4 * contraction.SETTLE_PER_HOP, 25 * contraction.SETTLE_PER_HOP]
+
+
+def test_witness_search_stops_at_the_settle_limit(monkeypatch):
+    monkeypatch.setattr(contraction, 'settleLimit', lambda hop_limit: 9)
+    distances = contraction.witnessDistances(chain(30, 100.0), 0, None, {30}, 1000.0, 30)
+    # nodes 0 to 8 are settled, 9 is reached from 8, and 30 only over the direct edge
+    assert sorted(distances) == list(range(10)) + [30] and distances[30] == 100.0
+
+
+def test_shortcuts_only_where_no_witness():
+    graph = chain(2, 3.0)
+    assert contraction.shortcutsFor(graph, 1, 5) == [(0, 2, 2.0)]
+    graph = chain(2, 2.0)
+    assert contraction.shortcutsFor(graph, 1, 5) == []
+    graph = chain(4, 100.0)
+    graph[0][2] = graph[2][0] = 2.0
+    assert contraction.shortcutsFor(graph, 1, 1) == []
+
+
+@pytest.mark.parametrize('map_name', ('30node.txt', '300node.txt'))
+def test_hierarchy_is_upward_and_shortcuts_unpack_to_their_cost(map_name):
+    road_map = test_searcher.loadMap(map_name)
+    hierarchy = contraction.build(road_map)
+    assert sorted(hierarchy.rank.tolist()) == list(range(len(road_map)))
+    assert hierarchy.shortcut_count == len(hierarchy.middle)
+    for node_id in range(len(road_map)):
+        start, end = int(hierarchy.up_offsets[node_id]), int(hierarchy.up_offsets[node_id + 1])
+        for target, weight in zip(hierarchy.up_targets[start:end].tolist(), hierarchy.up_weights[start:end].tolist()):
+            assert hierarchy.rank[target] > hierarchy.rank[node_id]
+            edges = hierarchy.unpack(road_map, node_id, target)
+            assert edges[-1][0] == target
+            assert sum(value for _, value in edges) == pytest.approx(weight)
+
+
+@pytest.mark.parametrize('hop_limit, estimate_hop_limit', ((1, 1), (2, 1), (8, 4)))
+def test_any_hop_limit_gives_shortest_paths(hop_limit, estimate_hop_limit):
+    road_map = test_searcher.loadMap('300node.txt')
+    hierarchy = contraction.build(road_map, hop_limit, estimate_hop_limit)
+    ch = searcher.Searcher('ch', road_map, False, quiet=True)
+    ch.contraction_hierarchy = hierarchy
+    best = searcher.Searcher('best', road_map, False, quiet=True)
+    for start, goal in test_searcher.randomPairs(road_map):
+        expected, result = best.query(start, goal), ch.query(start, goal)
+        assert ch.contraction_hierarchy is hierarchy
+        assert result.found == expected.found, (start, goal)
+        if expected.found:
+            assert result.cost == pytest.approx(expected.cost), (start, goal)
+
+
+def test_report_contraction_times_queries_on_the_hierarchy_set(monkeypatch, capsys):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '300node.txt')) as f:
+        road_map = roadmap.RoadMap(None, lines=f.readlines())
+    hierarchy = contraction.build(road_map, 1, 1)
+    s = searcher.Searcher('best', road_map, False, quiet=True)
+    s.contraction_hierarchy = hierarchy
+
+    def noBuild(*args, **kwargs):
+        raise AssertionError('the hierarchy set on the Searcher was not used')
+
+    monkeypatch.setattr(contraction, 'load', noBuild)
+    monkeypatch.setattr(contraction, 'build', noBuild)
+    report = s.reportContraction(test_searcher.randomPairs(road_map, 10))
+    assert report['shortcut_count'] == hierarchy.shortcut_count
+    assert report['preprocessing_time'] == hierarchy.build_time
+    assert report['speedup'] == pytest.approx(report['baseline_query_time'] / report['ch_query_time'])
+    out = capsys.readouterr().out
+    assert out.startswith("Contraction hierarchy of 'None': " + str(len(road_map)) + ' nodes,')
+    assert str(hierarchy.shortcut_count) + ' shortcuts' in out
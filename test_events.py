@@ -0,0 +1,72 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the search sinks: a quiet Searcher, or one given a bare SearchSink, prints nothing at all, whatever it runs;
+# the ConsoleSink prints the events, also of a map with no file behind it.
+# Usage:
+#   python -m pytest -q test_events.py
+
+import os
+
+import pytest
+
+import events
+import roadmap
+import searcher
+import test_searcher
+
+SEARCH_ALGOS = ('breadth', 'depth', 'best', 'a_star', 'alt', 'bidirectional', 'bidirectional_a_star', 'ch')
+
+
+def runEverything(s, road_map):
+    """
+    Runs a search with go (also to all of two goal nodes, where the search_algo can), then query and queryMany, on
+    the Searcher s
+    """
+    (start, goal), (_, other_goal) = test_searcher.randomPairs(road_map, 2)
+    s.setStartGoal(start, goal)
+    s.go()
+    if s.search_algo not in ('bidirectional', 'bidirectional_a_star', 'ch'):
+        s.setStartGoal(start, [goal, other_goal], 'all')
+        s.go()
+    s.query(start, goal)
+    s.queryMany([(start, goal), (goal, start)])
+
+
+@pytest.mark.parametrize('search_algo', SEARCH_ALGOS)
+@pytest.mark.parametrize('verbose', (False, True))
+def test_quiet_searcher_prints_nothing(search_algo, verbose, capsys):
+    road_map = test_searcher.loadMap('30node.txt')
+    runEverything(searcher.Searcher(search_algo, road_map, verbose, quiet=True), road_map)
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('search_algo', ('best', 'a_star'))
+def test_bare_search_sink_prints_nothing(search_algo, capsys):
+    road_map = test_searcher.loadMap('30node.txt')
+    runEverything(searcher.Searcher(search_algo, road_map, True, sink=events.SearchSink()), road_map)
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('verbose', (False, True))
+def test_console_sink_prints_a_map_with_no_file(verbose, capsys):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tenNode.txt')) as f:
+        road_map = roadmap.RoadMap(None, lines=f.readlines())
+    s = searcher.Searcher('best', road_map, verbose)
+    s.setStartGoal('A', 'J')
+    s.go()
+    out = capsys.readouterr().out
+    assert "Loaded search type 'best' with map in file: 'None'" in out
+    assert "Search Type: 'best'. Map file: 'None'" in out
+    assert ('Exploring node' in out) == verbose
+
+
+@pytest.mark.parametrize('verbose', (False, True))
+def test_query_and_query_many_print_nothing_on_a_printing_searcher(verbose, capsys):
+    road_map = test_searcher.loadMap('30node.txt')
+    s = searcher.Searcher('a_star', road_map, verbose)
+    capsys.readouterr()
+    pairs = test_searcher.randomPairs(road_map, 3)
+    s.query(*pairs[0])
+    s.queryMany(pairs)
+    assert capsys.readouterr().out == ''
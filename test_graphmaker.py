@@ -0,0 +1,142 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks GraphMaker point generation, editing and export: the same seed must always give the same map. Plots are
+# drawn with the non interactive Agg backend.
+# Usage:
+#   python -m pytest -q test_graphmaker.py
+
+import contextlib
+import io
+
+import numpy as np
+import scipy.spatial as spatial
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+
+import graphmaker
+import roadmap
+
+
+def quietMaker(node_count, seed):
+    """
+    Returns a GraphMaker of node_count nodes made with seed, without printing
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return graphmaker.GraphMaker(node_count, seed=seed)
+
+
+def exported(maker, outfile=None):
+    """
+    Returns the text maker exports, written to outfile.txt when outfile is given
+    """
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        maker.export(outfile or 0)
+    if outfile:
+        with open(outfile + '.txt') as f:
+            return f.read()
+    return out.getvalue()[:-len('tada!\n')]
+
+
+def edgeKeys(maker):
+    """
+    Returns the set of the (lower, higher) node index pairs of the edges of maker
+    """
+    return {(min(edge.index1, edge.index2), max(edge.index1, edge.index2)) for edge in maker.edges}
+
+
+def assertIndexed(maker):
+    """
+    Checks that edgeIndex gives the position in edges of every edge, and nothing else
+    """
+    assert len(maker.edgeIndex) == len(maker.edges)
+    for key, i in maker.edgeIndex.items():
+        edge = maker.edges[i]
+        assert (min(edge.index1, edge.index2), max(edge.index1, edge.index2)) == key
+
+
+def test_whack_and_build_edges_keep_the_edge_index():
+    maker = quietMaker(40, seed=3)
+    keys = edgeKeys(maker)
+    whacked = [maker.edges[0], maker.edges[len(maker.edges) // 2], maker.edges[-1]]
+    for edge in whacked:
+        maker.whackEdge(edge.endlabel1.lower(), edge.endlabel2)
+        keys.discard((min(edge.index1, edge.index2), max(edge.index1, edge.index2)))
+        assert edgeKeys(maker) == keys
+        assertIndexed(maker)
+    maker.whackEdge(whacked[0].endlabel1, whacked[0].endlabel2)
+    assert edgeKeys(maker) == keys
+    with contextlib.redirect_stdout(io.StringIO()):
+        maker.buildEdge(whacked[1].endlabel1, whacked[1].endlabel2)
+        maker.buildEdge(whacked[1].endlabel2, whacked[1].endlabel1)
+    keys.add((min(whacked[1].index1, whacked[1].index2), max(whacked[1].index1, whacked[1].index2)))
+    assert edgeKeys(maker) == keys
+    assertIndexed(maker)
+    plt.close('all')
+
+
+def test_same_seed_gives_the_same_points_and_export(tmp_path):
+    first, second = quietMaker(500, seed=11), quietMaker(500, seed=11)
+    assert [node.get() for node in first.nodes] == [node.get() for node in second.nodes]
+    text = exported(first, str(tmp_path / 'first'))
+    assert text == exported(second, str(tmp_path / 'second')) == exported(second)
+    assert text.count('\n') == len(first.edges)
+    assert exported(quietMaker(500, seed=12)) != text
+
+
+def test_points_keep_their_distance():
+    for node_count in (50, 3000):
+        maker = quietMaker(node_count, seed=5)
+        points = np.array([(node.x, node.y) for node in maker.nodes])
+        assert len(points) == node_count and points.min() >= 1
+        distances, _ = spatial.cKDTree(points).query(points, k=2)
+        # the points are truncated to integers after they are placed, which may bring two closer by up to sqrt(2)
+        assert distances[:, 1].min() >= maker.mindist - np.sqrt(2)
+        assert len(maker.nodeIndex) == len(maker.pointIndex) == node_count
+
+
+def delaunayKeys(maker):
+    """
+    Returns the set of the (lower, higher) node index pairs of the Delaunay triangulation of the nodes of maker
+    """
+    tri = spatial.Delaunay(np.array([(node.x, node.y) for node in maker.nodes]))
+    return {(min(a, b), max(a, b)) for simplex in tri.simplices.tolist()
+            for a, b in ((simplex[0], simplex[1]), (simplex[1], simplex[2]), (simplex[2], simplex[0]))}
+
+
+def test_edges_are_the_delaunay_edges_once_each():
+    maker = quietMaker(400, seed=2)
+    keys = [(min(edge.index1, edge.index2), max(edge.index1, edge.index2)) for edge in maker.edges]
+    assert len(keys) == len(set(keys))
+    triangulated = delaunayKeys(maker)
+    assert set(keys) <= triangulated
+    assert len(keys) >= 0.8 * len(triangulated)
+    for edge in maker.edges:
+        assert (edge.endlabel1, edge.endlabel2) == (maker.nodes[edge.index1].label, maker.nodes[edge.index2].label)
+        assert edge.dist <= edge.label <= edge.dist * (1 + maker.distDistortion)
+    # with no edges dropped, every edge of the triangulation is made
+    points = np.array([(node.x, node.y) for node in maker.nodes])
+    maker.edges = []
+    maker.edgeLoss = 0
+    maker.makeEdges(spatial.Delaunay(points).simplices, points)
+    assert edgeKeys(maker) == triangulated and len(maker.edges) == len(triangulated)
+
+
+def test_same_seed_gives_the_same_binary_export(tmp_path):
+    outfiles = [str(tmp_path / name) for name in ('first', 'second', 'text')]
+    for outfile in outfiles[:2]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            quietMaker(300, seed=4).export(outfile, binary=True)
+    with open(outfiles[0] + '.rmap', 'rb') as first, open(outfiles[1] + '.rmap', 'rb') as second:
+        assert first.read() == second.read()
+    exported(quietMaker(300, seed=4), outfiles[2])
+    binary_map = roadmap.RoadMap(outfiles[0] + '.rmap')
+    text_map = roadmap.RoadMap(outfiles[2] + '.txt')
+    assert binary_map.fingerprint == text_map.fingerprint
+    assert list(binary_map.labels) == list(text_map.labels)
+    for name in ('xs', 'ys', 'offsets', 'targets', 'weights', 'edge_nodes', 'edge_values'):
+        np.testing.assert_array_equal(getattr(binary_map, name), getattr(text_map, name), err_msg=name)
@@ -0,0 +1,53 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the level of detail of GraphViz plots: node and edge labels count together against labelLimit. Plots are
+# drawn with the non interactive Agg backend.
+# Usage:
+#   python -m pytest -q test_graphviz.py
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import pytest
+
+import graphviz
+import test_searcher
+
+
+def plotted(map_name):
+    """
+    Returns a GraphViz of a shipped map, plotted
+    """
+    viz = graphviz.GraphViz()
+    viz.loadGraphFromMap(test_searcher.loadMap(map_name))
+    viz.plot()
+    return viz
+
+
+def visibleLabels(viz):
+    return sum(text.get_visible() for text in list(viz.nodeLabels.values()) + list(viz.edgeLabels.values()))
+
+
+@pytest.fixture(autouse=True)
+def closePlots():
+    yield
+    plt.close('all')
+
+
+def test_small_map_shows_every_label():
+    viz = plotted('tenNode.txt')
+    assert visibleLabels(viz) == len(viz.nodes) + len(viz.edges)
+
+
+def test_node_and_edge_labels_count_together_against_the_limit():
+    viz = plotted('300node.txt')
+    assert len(viz.nodes) + len(viz.edges) > viz.labelLimit
+    assert visibleLabels(viz) == 0 and not viz.labelsShown
+    x, y = viz.nodeXY[0]
+    viz.axes.set_xlim(x - 30, x + 30)
+    viz.axes.set_ylim(y - 30, y + 30)
+    assert viz.labelsShown
+    assert 0 < visibleLabels(viz) <= viz.labelLimit
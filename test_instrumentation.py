@@ -0,0 +1,92 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the counters Instrumentation.toDict reports: the frontier pushes, pops and stale skips against a
+# PriorityFrontier driven by hand, and the counters of instrumented searches against what the searches did.
+# Usage:
+#   python -m pytest -q test_instrumentation.py
+
+import json
+
+import pytest
+
+import frontier
+import instrumentation
+import searcher
+import test_searcher
+
+
+def test_to_dict_starts_with_every_counter_at_zero():
+    assert instrumentation.Instrumentation().toDict() == \
+        {'phases': {}, 'counters': dict.fromkeys(instrumentation.COUNTERS, 0)}
+
+
+def test_counts_frontier_operations():
+    open_list = frontier.PriorityFrontier()
+    for node_id, cost in ((1, 5.0), (2, 3.0), (3, 4.0), (1, 2.0), (3, 1.0)):
+        open_list.push(node_id, cost)
+    assert [open_list.pop() for _ in range(3)] == [3, 1, 2]
+    # the two stale entries (1 at 5.0, 3 at 4.0) are still on the heap: not skipped yet
+    counters = instrumentation.Instrumentation()
+    counters.countFrontier(open_list)
+    assert counters.toDict()['counters'] == {'pushes': 5, 'pops': 3, 'stale_skips': 0, 'edge_relaxations': 0,
+                                             'heuristic_evaluations': 0}
+    open_list.push(4, 9.0)
+    assert open_list.pop() == 4
+    counters.reset()
+    counters.countFrontier(open_list)
+    assert counters.toDict()['counters']['pushes'] == 6
+    assert counters.toDict()['counters']['pops'] == 6 and counters.toDict()['counters']['stale_skips'] == 2
+
+
+def test_to_dict_is_a_copy_and_round_trips_through_json():
+    counters = instrumentation.Instrumentation()
+    counters.count('pops', 3)
+    with counters.phase('search'):
+        pass
+    with counters.phase('search'):
+        pass
+    report = counters.toDict()
+    counters.count('pops')
+    report['phases']['search']['calls'] = 0
+    assert counters.counters['pops'] == 4 and counters.phases['search']['calls'] == 2
+    assert json.loads(counters.toJson()) == counters.toDict()
+    counters.reset()
+    assert counters.toDict() == instrumentation.Instrumentation().toDict()
+
+
+@pytest.mark.parametrize('search_algo', ('breadth', 'depth', 'best', 'a_star'))
+def test_search_counters_match_the_search(search_algo):
+    road_map = test_searcher.loadMap('30node.txt')
+    s = searcher.Searcher(search_algo, road_map, False, quiet=True, instrument=True)
+    s.setStartGoal(road_map.labels[0], road_map.labels[-1])
+    s.go()
+    counters = s.instrumentation.toDict()['counters']
+    expanded = [road_map.index[label] for label in s.traversal]
+    assert counters['pops'] - counters['stale_skips'] == len(expanded)
+    # the goal is popped and settled, but its edges are not relaxed
+    assert s.goal_found and expanded[-1] == road_map.index[road_map.labels[-1]]
+    assert counters['edge_relaxations'] == sum(road_map.degree(node_id) for node_id in expanded[:-1])
+    assert counters['pushes'] >= counters['pops']
+    assert counters['heuristic_evaluations'] == (len(road_map) if search_algo == 'a_star' else 0)
+    assert {'search', 'path', 'report'} <= set(s.instrumentation.toDict()['phases'])
+
+
+def test_search_counters_add_up_over_searches():
+    road_map = test_searcher.loadMap('30node.txt')
+    s = searcher.Searcher('best', road_map, False, quiet=True, instrument=True)
+    s.setStartGoal(road_map.labels[0], road_map.labels[-1])
+    s.go()
+    once = s.instrumentation.toDict()
+    s.go()
+    twice = s.instrumentation.toDict()
+    assert twice['counters'] == {name: 2 * count for name, count in once['counters'].items()}
+    assert twice['phases']['search']['calls'] == 2 * once['phases']['search']['calls']
+
+
+def test_searcher_without_instrumentation_has_none():
+    s = searcher.Searcher('best', test_searcher.loadMap('tenNode.txt'), False, quiet=True)
+    assert s.instrumentation is None
+    s.setStartGoal('A', 'J')
+    s.go()
+    assert s.instrumentation is None
@@ -0,0 +1,112 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the QueryCache on its own (hits, misses, LRU eviction, invalidation, the shelve store) and through
+# Searcher.go, where a cached report must only be replayed for a Searcher asking for the same search.
+# Usage:
+#   python -m pytest -q test_querycache.py
+
+import pytest
+
+import events
+import querycache
+import searcher
+import test_searcher
+
+
+class RecordingSink(events.SearchSink):
+    """
+    Sink keeping the paths and stats summaries a Searcher reports
+    """
+
+    def __init__(self):
+        self.reports = []
+
+    def statsReported(self, searcher):
+        self.reports.append((list(searcher.path), searcher.stats.report()))
+
+
+def key(start_label, fingerprint='map'):
+    return querycache.QueryCache.makeKey(fingerprint, 'best', start_label, ['B'], 'nearest', False)
+
+
+def test_get_counts_hits_and_misses():
+    cache = querycache.QueryCache()
+    assert cache.get(key('A')) is None
+    cache.put(key('A'), 'results')
+    assert cache.get(key('A')) == 'results'
+    assert cache.counters() == {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1}
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = querycache.QueryCache(max_entries=2)
+    cache.put(key('A'), 'a')
+    cache.put(key('B'), 'b')
+    cache.get(key('A'))
+    cache.put(key('C'), 'c')
+    assert cache.get(key('B')) is None
+    assert cache.get(key('A')) == 'a' and cache.get(key('C')) == 'c'
+    assert cache.evictions == 1
+
+
+def test_invalidate_drops_one_map_or_all_of_them(tmp_path):
+    cache = querycache.QueryCache(store_path=str(tmp_path / 'cache'))
+    cache.put(key('A', 'map1'), 'a1')
+    cache.put(key('A', 'map2'), 'a2')
+    cache.invalidate('map1')
+    assert cache.get(key('A', 'map1')) is None
+    assert cache.get(key('A', 'map2')) == 'a2'
+    cache.invalidate()
+    assert cache.get(key('A', 'map2')) is None
+    assert querycache.QueryCache(store_path=str(tmp_path / 'cache')).get(key('A', 'map2')) is None
+
+
+def test_store_is_shared_between_caches(tmp_path):
+    querycache.QueryCache(store_path=str(tmp_path / 'cache')).put(key('A'), ['results'])
+    later = querycache.QueryCache(store_path=str(tmp_path / 'cache'))
+    assert later.get(key('A')) == ['results']
+    assert later.counters() == {'hits': 1, 'misses': 0, 'evictions': 0, 'entries': 1}
+
+
+def cachedSearch(road_map, cache, start, goal, stats_precision=None):
+    """
+    Runs go() for start and goal on a Searcher with the cache and returns what it reported
+    """
+    sink = RecordingSink()
+    s = searcher.Searcher('best', road_map, False, query_cache=cache, sink=sink)
+    s.stats_precision = stats_precision
+    s.setStartGoal(start, goal)
+    s.go()
+    return sink.reports
+
+
+def test_searcher_replays_a_cached_search():
+    road_map = test_searcher.loadMap('30node.txt')
+    (start, goal), = test_searcher.randomPairs(road_map, 1)
+    cache = querycache.QueryCache()
+    searched = cachedSearch(road_map, cache, start, goal)
+    assert cachedSearch(road_map, cache, start, goal) == searched
+    assert cache.counters()['hits'] == 1
+
+
+@pytest.mark.parametrize('precisions', ((None, 0.01), (0.01, None), (0.01, 0.05)))
+def test_searcher_does_not_replay_a_search_with_another_stats_precision(precisions):
+    road_map = test_searcher.loadMap('30node.txt')
+    (start, goal), = test_searcher.randomPairs(road_map, 1)
+    cache = querycache.QueryCache()
+    cachedSearch(road_map, cache, start, goal, precisions[0])
+    reports = cachedSearch(road_map, cache, start, goal, precisions[1])
+    assert cache.hits == 0
+    assert reports[0][1] == cachedSearch(road_map, querycache.QueryCache(), start, goal, precisions[1])[0][1]
+
+
+def test_query_many_workers_never_open_the_store(tmp_path):
+    road_map = test_searcher.loadMap('30node.txt')
+    store_path = str(tmp_path / 'store')
+    cache = querycache.QueryCache(store_path=store_path)
+    s = searcher.Searcher('best', road_map, False, quiet=True, query_cache=cache)
+    pairs = test_searcher.randomPairs(road_map, 6)
+    s.queryMany(pairs, workers=2, chunk_size=2)
+    s.queryMany(pairs)
+    assert list(tmp_path.iterdir()) == []
+    assert cache.counters() == {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0}
@@ -0,0 +1,157 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the text map parser: the edge line forms it reads (with and without a midpoint, str or bytes, blank lines
+# between) and the MapFormatError it raises at the first bad line, naming the file and the line number. Also checks
+# the label lookup of a binary map and that a cut short, padded or garbled binary map is refused.
+# Usage:
+#   python -m pytest -q test_roadmap.py
+
+import collections
+
+import pytest
+
+import roadmap
+import test_searcher
+
+
+def test_parses_seven_field_edges():
+    lines = ["('C', 'I', 67, [138, 1], [131, 80])\n", "('I', 'D', 126.5, [131, 80], [1, 76])\n"]
+    assert list(roadmap.parseEdges(lines)) == [('C', 'I', 67.0, 138, 1, 131, 80), ('I', 'D', 126.5, 131, 80, 1, 76)]
+
+
+def test_skips_the_midpoint_of_nine_field_edges():
+    lines = ["('C', 'I', 67, [138, 1], [131, 80], [134, 40])", "('I','D',0,[131,80],[1,76])"]
+    assert list(roadmap.parseEdges(lines)) == [('C', 'I', 67.0, 138, 1, 131, 80), ('I', 'D', 0.0, 131, 80, 1, 76)]
+
+
+def test_reads_bytes_and_skips_blank_lines():
+    lines = [b'\n', b"('C', 'I', 67, [138, 1], [131, 80])\r\n", b'   \n', b"('I', 'D', 126, [131, 80], [1, 76])"]
+    assert [edge[:2] for edge in roadmap.parseEdges(lines)] == [('C', 'I'), ('I', 'D')]
+
+
+def test_road_map_of_nine_field_lines_matches_seven_field_lines():
+    seven = ["('C', 'I', 67, [138, 1], [131, 80])\n", "('I', 'D', 126, [131, 80], [1, 76])\n"]
+    nine = ["('C', 'I', 67, [138, 1], [131, 80], [134, 40])\n", "('I', 'D', 126, [131, 80], [1, 76], [66, 78])\n"]
+    seven_map, nine_map = roadmap.RoadMap('<seven>', lines=seven), roadmap.RoadMap('<nine>', lines=nine)
+    assert seven_map.labels == nine_map.labels and seven_map.index == nine_map.index
+    assert seven_map.edge_values.tolist() == nine_map.edge_values.tolist()
+    assert seven_map.fingerprint != nine_map.fingerprint
+
+
+@pytest.mark.parametrize('line, problem', [
+    ("'C', 'I', 67, [138, 1], [131, 80]", 'expected an edge in parentheses'),
+    ("('C', 'I', 67, [138, 1], [131, 80]", 'expected an edge in parentheses'),
+    ("('C', 'I', 67, [138, 1])", 'expected 7 fields (9 with a midpoint), found 5'),
+    ("('C', 'I', 67, [138, 1], [131, 80], [134])", 'expected 7 fields (9 with a midpoint), found 8'),
+    ("('', 'I', 67, [138, 1], [131, 80])", 'empty node label'),
+    ("('C', 'I', sixty, [138, 1], [131, 80])", 'edge value and coordinates must be numbers'),
+    ("('C', 'I', 67, [138.5, 1], [131, 80])", 'edge value and coordinates must be numbers'),
+    ("('C', 'I', -1, [138, 1], [131, 80])", 'edge value must be a finite number, at least 0'),
+    ("('C', 'I', inf, [138, 1], [131, 80])", 'edge value must be a finite number, at least 0'),
+    ("('C', 'I', nan, [138, 1], [131, 80])", 'edge value must be a finite number, at least 0'),
+])
+def test_bad_line_raises_naming_the_line(line, problem):
+    lines = ["('C', 'D', 137, [138, 1], [1, 76])\n", '\n', line + '\n', "('I', 'D', 126, [131, 80], [1, 76])\n"]
+    with pytest.raises(roadmap.MapFormatError) as error:
+        list(roadmap.parseEdges(lines, 'bad.txt'))
+    assert error.value.map_file == 'bad.txt' and error.value.line_number == 3
+    assert str(error.value) == 'bad.txt, line 3: ' + problem + ': ' + repr(line)
+    assert isinstance(error.value, ValueError)
+
+
+def test_edges_before_the_bad_line_are_yielded():
+    edges = roadmap.parseEdges(["('C', 'D', 137, [138, 1], [1, 76])", "('C', 'I', -1, [138, 1], [131, 80])"])
+    assert next(edges)[2] == 137.0
+    with pytest.raises(roadmap.MapFormatError):
+        next(edges)
+
+
+def test_bad_map_file_raises_with_its_name(tmp_path):
+    map_file = tmp_path / 'bad.txt'
+    map_file.write_text("('C', 'D', 137, [138, 1], [1, 76])\n('C', 'I', 67, [138, 1], [131])\n")
+    with pytest.raises(roadmap.MapFormatError, match=r'bad\.txt, line 2: expected 7 fields'):
+        roadmap.RoadMap(str(map_file))
+
+
+def binaryMap(tmp_path, map_name='30node.txt'):
+    """
+    Returns the bytes of a shipped map saved in the binary format, and the file they are in
+    """
+    binary_file = tmp_path / 'map.rmap'
+    test_searcher.loadMap(map_name).save(str(binary_file))
+    return binary_file.read_bytes(), binary_file
+
+
+def test_label_index_finds_every_label_and_nothing_else(tmp_path):
+    _, binary_file = binaryMap(tmp_path)
+    road_map = roadmap.RoadMap(str(binary_file))
+    assert isinstance(road_map.index, roadmap.LabelIndex) and len(road_map.index) == len(road_map)
+    for node_id, label in enumerate(road_map.labels):
+        assert road_map.index[label] == road_map.index.get(label) == node_id and label in road_map
+    first, last = min(road_map.labels), max(road_map.labels)
+    for missing in ('', first[:-1] or ' ', first + ' ', last + '~', '~' + last, 'not a label'):
+        assert missing not in road_map.labels
+        assert road_map.index.get(missing) is None and road_map.index.get(missing, -1) == -1
+        assert missing not in road_map
+        with pytest.raises(KeyError):
+            road_map.index[missing]
+
+
+@pytest.mark.parametrize('keep', (len(roadmap.MAGIC), roadmap.HEADER.size - 1))
+def test_binary_map_cut_in_its_header_is_refused(tmp_path, keep):
+    data, binary_file = binaryMap(tmp_path)
+    binary_file.write_bytes(data[:keep])
+    with pytest.raises(ValueError, match='cut short: ' + str(keep) + ' bytes'):
+        roadmap.RoadMap(str(binary_file))
+
+
+@pytest.mark.parametrize('change', ('cut', 'padded', 'nodes', 'edges', 'labels'))
+def test_binary_map_of_the_wrong_size_is_refused(tmp_path, change):
+    data, binary_file = binaryMap(tmp_path)
+    fields = list(roadmap.HEADER.unpack_from(data, 0))
+    if change == 'cut':
+        data = data[:len(data) - 8]
+    elif change == 'padded':
+        data += bytes(8)
+    else:
+        fields[('nodes', 'edges', 'labels').index(change) + 2] += 10 ** 12
+        data = roadmap.HEADER.pack(*fields) + data[roadmap.HEADER.size:]
+    binary_file.write_bytes(data)
+    with pytest.raises(ValueError, match='is a binary map of ' + str(len(data)) + ' bytes'):
+        roadmap.RoadMap(str(binary_file))
+
+
+def test_binary_map_of_another_version_is_refused(tmp_path):
+    data, binary_file = binaryMap(tmp_path)
+    fields = list(roadmap.HEADER.unpack_from(data, 0))
+    fields[1] = roadmap.FORMAT_VERSION + 1
+    binary_file.write_bytes(roadmap.HEADER.pack(*fields) + data[roadmap.HEADER.size:])
+    with pytest.raises(ValueError, match='format version ' + str(roadmap.FORMAT_VERSION + 1)):
+        roadmap.RoadMap(str(binary_file))
+
+
+def test_binary_map_with_garbage_after_the_magic_is_refused(tmp_path):
+    data, binary_file = binaryMap(tmp_path)
+    binary_file.write_bytes(roadmap.MAGIC + bytes(range(256)) * 4)
+    with pytest.raises(ValueError):
+        roadmap.RoadMap(str(binary_file))
+
+
+def test_load_keeps_one_map_per_file_and_only_the_most_recent_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(roadmap, 'MAX_LOADED_MAPS', 3)
+    monkeypatch.setattr(roadmap, '_loaded_maps', collections.OrderedDict())
+    map_files = [tmp_path / ('map%d.txt' % i) for i in range(5)]
+    for i, map_file in enumerate(map_files):
+        map_file.write_text("('C', 'D', %d, [138, 1], [1, 76])\n" % (i + 1))
+    first = roadmap.load(str(map_files[0]))
+    assert roadmap.load(str(map_files[0])) is first
+    map_files[0].write_text("('C', 'D', 99, [138, 1], [1, 76])\n('D', 'E', 1, [1, 76], [5, 5])\n")
+    edited = roadmap.load(str(map_files[0]))
+    assert edited is not first and len(edited) == 3 and len(roadmap._loaded_maps) == 1
+    for map_file in map_files[1:3]:
+        roadmap.load(str(map_file))
+    assert roadmap.load(str(map_files[0])) is edited
+    roadmap.load(str(map_files[3]))
+    roadmap.load(str(map_files[4]))
+    assert list(roadmap._loaded_maps) == [str(map_files[i]) for i in (0, 3, 4)]
@@ -0,0 +1,247 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Cross-checks every search mode, the hub labels and the binary map format against the 'best' search on the shipped
+# maps: the modes that return shortest paths must find the same path costs, the others (a_star only updates the
+# path cost of a node as long as it is not expanded) paths that are no cheaper. The maps are read from their lines
+# into RoadMaps with no file behind them, so no landmark tables, contraction hierarchy or hub labels are written
+# next to the shipped maps.
+# Usage:
+#   python -m pytest -q test_searcher.py
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+import contraction
+import hublabels
+import roadmap
+import searcher
+
+MAPS = ('tenNode.txt', '30node.txt', '300node.txt', 'samplemap.txt')
+EXACT_MODES = ('alt', 'bidirectional', 'bidirectional_a_star', 'ch')
+OTHER_MODES = ('breadth', 'depth', 'a_star')
+PAIRS = 30
+
+
+def loadMap(map_name):
+    """
+    Returns the RoadMap of a shipped map, read from its lines so that it has no file behind it
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), map_name)) as f:
+        return roadmap.RoadMap('<' + map_name + '>', lines=f.readlines())
+
+
+def randomPairs(road_map, count=PAIRS):
+    """
+    Returns count (start_label, goal_label) pairs of the road_map, the same ones on every run
+    """
+    rng = random.Random(len(road_map))
+    labels = list(road_map.labels)
+    return [(rng.choice(labels), rng.choice(labels)) for _ in range(count)]
+
+
+def pathCost(road_map, path):
+    """
+    Returns the cost of walking path (a list of labels) over the cheapest edge between each two nodes of it
+    """
+    cost = 0.0
+    for label1, label2 in zip(path, path[1:]):
+        node1, node2 = road_map.index[label1], road_map.index[label2]
+        start, end = int(road_map.offsets[node1]), int(road_map.offsets[node1 + 1])
+        weights = [w for t, w in zip(road_map.targets[start:end].tolist(), road_map.weights[start:end].tolist())
+                   if t == node2]
+        assert weights, 'no edge between ' + label1 + ' and ' + label2
+        cost += min(weights)
+    return cost
+
+
+def quietSearcher(search_algo, road_map):
+    """
+    Returns a Searcher of the road_map that prints nothing
+    """
+    return searcher.Searcher(search_algo, road_map, False, quiet=True)
+
+
+def bestResults(road_map, pairs):
+    """
+    Returns the QueryResults of the 'best' search for pairs, the reference of the other searches
+    """
+    return quietSearcher('best', road_map).queryMany(pairs)
+
+
+@pytest.mark.parametrize('map_name', MAPS)
+@pytest.mark.parametrize('search_algo', EXACT_MODES)
+def test_mode_matches_best(map_name, search_algo):
+    road_map = loadMap(map_name)
+    pairs = randomPairs(road_map)
+    for best, result in zip(bestResults(road_map, pairs), quietSearcher(search_algo, road_map).queryMany(pairs)):
+        assert result.found == best.found, (result.start, result.goal)
+        if best.found:
+            assert result.cost == pytest.approx(best.cost), (result.start, result.goal)
+            assert result.path[0] == result.start and result.path[-1] == result.goal
+            assert pathCost(road_map, result.path) == pytest.approx(best.cost), (result.start, result.goal)
+
+
+@pytest.mark.parametrize('map_name', MAPS)
+@pytest.mark.parametrize('search_algo', OTHER_MODES)
+def test_mode_finds_a_path_no_cheaper_than_best(map_name, search_algo):
+    road_map = loadMap(map_name)
+    pairs = randomPairs(road_map)
+    for best, result in zip(bestResults(road_map, pairs), quietSearcher(search_algo, road_map).queryMany(pairs)):
+        assert result.found == best.found, (result.start, result.goal)
+        if best.found:
+            assert result.path[0] == result.start and result.path[-1] == result.goal
+            assert pathCost(road_map, result.path) <= result.cost + 1e-9, (result.start, result.goal)
+            assert result.cost >= best.cost - 1e-9, (result.start, result.goal)
+
+
+@pytest.mark.parametrize('map_name', MAPS)
+def test_hub_labels_match_best(map_name):
+    road_map = loadMap(map_name)
+    pairs = randomPairs(road_map)
+    labelled = quietSearcher('best', road_map)
+    labelled.buildHubLabels()
+    for best, (start, goal) in zip(bestResults(road_map, pairs), pairs):
+        result = labelled.distance(start, goal, with_path=True)
+        assert result.search_algo == 'hub_labels'
+        assert result.found == best.found, (start, goal)
+        if best.found:
+            assert result.cost == pytest.approx(best.cost), (start, goal)
+            assert result.path[0] == start and result.path[-1] == goal
+            assert pathCost(road_map, result.path) == pytest.approx(best.cost), (start, goal)
+
+
+def test_distance_looks_for_missing_hub_labels_once(monkeypatch):
+    road_map = loadMap('30node.txt')
+    reads = []
+    read_index = roadmap.readIndex
+
+    def countedReadIndex(road_map, suffix):
+        reads.append(suffix)
+        return read_index(road_map, suffix)
+
+    monkeypatch.setattr(roadmap, 'readIndex', countedReadIndex)
+    monkeypatch.setattr(hublabels, '_loaded_labels', {})
+    pairs = randomPairs(road_map, 5)
+    for s in (quietSearcher('best', road_map), quietSearcher('a_star', road_map)):
+        for start, goal in pairs:
+            assert s.distance(start, goal).search_algo == s.search_algo
+    assert reads.count(hublabels.SUFFIX) == 1
+    quietSearcher('best', road_map).buildHubLabels()
+    assert quietSearcher('a_star', road_map).distance(*pairs[0]).search_algo == 'hub_labels'
+
+
+@pytest.mark.parametrize('map_name', MAPS)
+def test_binary_map_matches_text(map_name, tmp_path):
+    text_map = loadMap(map_name)
+    binary_file = str(tmp_path / 'map.rmap')
+    text_map.save(binary_file)
+    binary_map = roadmap.RoadMap(binary_file)
+    assert binary_map.fingerprint == text_map.fingerprint
+    assert binary_map.heuristic_scale == text_map.heuristic_scale
+    assert len(binary_map) == len(text_map)
+    assert list(binary_map.labels) == list(text_map.labels)
+    assert all(binary_map.index[label] == node_id for node_id, label in enumerate(text_map.labels))
+    for name in ('xs', 'ys', 'offsets', 'targets', 'weights', 'edge_nodes', 'edge_values'):
+        np.testing.assert_array_equal(getattr(binary_map, name), getattr(text_map, name), err_msg=name)
+    pairs = randomPairs(text_map)
+    for text_result, binary_result in zip(bestResults(text_map, pairs), bestResults(binary_map, pairs)):
+        assert (binary_result.found, binary_result.path, binary_result.cost) == \
+               (text_result.found, text_result.path, text_result.cost)
+
+
+VERBOSE_OPEN_LISTS = {
+    ('breadth', 'D', 'J'): ["['C;1;137.0;0;137.0', 'E;1;57.0;0;57.0', 'I;1;126.0;0;126.0']",
+                            "['E;1;57.0;0;57.0', 'I;1;126.0;0;204.0', 'G;2;36.0;0;173.0']"],
+    ('best', 'H', 'I'): ["['E;1;31.0;0;31.0', 'I;1;49.0;0;49.0', 'J;1;41.0;0;41.0']",
+                         "['J;1;41.0;0;41.0', 'I;1;49.0;0;49.0', 'D;2;57.0;0;88.0']",
+                         "['I;1;49.0;0;49.0', 'D;2;57.0;0;88.0', 'A;2;39.0;0;80.0']"],
+    ('a_star', 'I', 'G'): ["['A;1;53.0;79.71198153351854;132.71198153351855', "
+                           "'B;1;31.0;18.24828759089466;49.24828759089466', "
+                           "'C;1;67.0;83.6719785830358;150.6719785830358', "
+                           "'D;1;126.0;172.00290695217916;298.00290695217916', 'G;1;42.0;0.0;42.0', "
+                           "'H;1;49.0;78.54934754662193;127.54934754662193']"],
+}
+
+
+@pytest.mark.parametrize('search_algo, start, goal', sorted(VERBOSE_OPEN_LISTS))
+def test_verbose_open_lists_keep_their_format(search_algo, start, goal, capsys):
+    s = searcher.Searcher(search_algo, loadMap('tenNode.txt'), True)
+    s.setStartGoal(start, goal)
+    s.go()
+    open_lists = [line[len('Open list: '):] for line in capsys.readouterr().out.splitlines()
+                  if line.startswith('Open list: ')]
+    assert open_lists[:len(VERBOSE_OPEN_LISTS[search_algo, start, goal])] == \
+        VERBOSE_OPEN_LISTS[search_algo, start, goal]
+
+
+@pytest.mark.parametrize('map_name', MAPS)
+@pytest.mark.parametrize('goal_mode', ('nearest', 'all'))
+def test_breadth_levels_node_by_node_match_levels_at_once(map_name, goal_mode, monkeypatch):
+    road_map = loadMap(map_name)
+    pairs = randomPairs(road_map, 10)
+    goals = [goal for _, goal in pairs[:3]]
+    runs = []
+    for scalar_level_size in (0, len(road_map) + 1):
+        monkeypatch.setattr(searcher, 'SCALAR_LEVEL_SIZE', scalar_level_size)
+        s = searcher.Searcher('breadth', road_map, False, quiet=True, instrument=True)
+        s.setStartGoal(pairs[0][0], goals, goal_mode)
+        s.search()
+        runs.append((s.traversal, s.settled_goals, list(s.open_list), list(s.state.parent), list(s.state.level),
+                     s.stats.summary(), s.instrumentation.toDict()['counters']))
+    assert runs[0] == runs[1]
+
+
+def test_set_start_goal_leaves_the_search_setup_to_go():
+    road_map = loadMap('30node.txt')
+    (start, goal), = randomPairs(road_map, 1)
+    s = searcher.Searcher('a_star', road_map, False, quiet=True, instrument=True)
+    s.setStartGoal(start, goal)
+    assert s.state is None
+    assert s.start_node == road_map.index[start] and s.goal_ids == [road_map.index[goal]]
+    s.go()
+    assert s.instrumentation.counters['heuristic_evaluations'] == len(road_map)
+
+
+def test_hSLD_takes_a_label_and_matches_the_a_star_column():
+    road_map = loadMap('30node.txt')
+    start, goal = randomPairs(road_map, 1)[0]
+    s = searcher.Searcher('a_star', road_map, False, quiet=True)
+    s.setStartGoal(start, goal)
+    assert s.hSLD(goal) == 0.0
+    s.resetSearch()
+    s.openStart()
+    for node_id, label in enumerate(road_map.labels):
+        assert s.hSLD(label) == s.hSLDById(node_id) == pytest.approx(s.state.hSLD[node_id])
+
+
+@pytest.mark.parametrize('search_algo', ('best', 'alt', 'ch'))
+def test_query_many_in_worker_processes_matches_one_process(search_algo):
+    road_map = loadMap('300node.txt')
+    pairs = randomPairs(road_map, 40)
+    s = quietSearcher(search_algo, road_map)
+    in_process = s.queryMany(pairs)
+    in_workers = s.queryMany(pairs, workers=2, chunk_size=7)
+    assert [(r.start, r.goal, r.found, r.path, r.cost) for r in in_workers] == \
+        [(r.start, r.goal, r.found, r.path, r.cost) for r in in_process]
+
+
+@pytest.mark.parametrize('search_algo', ('ch', 'best'))
+def test_query_many_uses_the_hierarchy_set_on_the_searcher(search_algo, monkeypatch):
+    road_map = loadMap('300node.txt')
+    pairs = randomPairs(road_map, 10)
+    s = quietSearcher(search_algo, road_map)
+    hierarchy = contraction.build(road_map, 1, 1)
+    s.contraction_hierarchy = hierarchy
+
+    def noLoad(road_map):
+        raise AssertionError('the hierarchy set on the Searcher was not used')
+
+    monkeypatch.setattr(contraction, 'load', noLoad)
+    results = s.queryMany(pairs, 'ch')
+    assert s.contraction_hierarchy is hierarchy
+    for best, result in zip(bestResults(road_map, pairs), results):
+        assert result.search_algo == 'ch' and result.cost == pytest.approx(best.cost)
@@ -0,0 +1,114 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks the RunningStat aggregates against numpy on the same values: batching of add/addMany/flush, mean and
+# variance, the percentile bounds of the quantile sketch and merging.
+# Usage:
+#   python -m pytest -q test_stats.py
+
+import numpy as np
+import pytest
+
+import stats
+
+PRECISION = 0.01
+
+
+def values(count, seed=0):
+    """
+    Returns count non negative integers, some of them 0, the same ones on every run
+    """
+    return np.random.default_rng(seed).integers(0, 5000, count)
+
+
+def addAll(running_stat, data, batch):
+    """
+    Adds data to running_stat with add (batch 1) or in addMany batches of batch values
+    """
+    if batch == 1:
+        for value in data.tolist():
+            running_stat.add(value)
+    else:
+        for i in range(0, len(data), batch):
+            running_stat.addMany(data[i:i + batch])
+
+
+def test_values_wait_in_pending_until_a_batch_is_full():
+    running_stat = stats.RunningStat()
+    running_stat.addMany([1, 2, 3])
+    running_stat.add(4)
+    assert running_stat.count == 0 and running_stat.pending == [1, 2, 3, 4]
+    running_stat.addMany(list(range(running_stat.batch_size - 4)))
+    assert running_stat.count == running_stat.batch_size and running_stat.pending == []
+    running_stat.add(7)
+    running_stat.flush()
+    assert running_stat.count == running_stat.batch_size + 1 and running_stat.pending == []
+
+
+@pytest.mark.parametrize('batch', (1, 10, 5000))
+def test_aggregates_match_numpy(batch):
+    data = values(12345)
+    running_stat = stats.RunningStat(PRECISION)
+    addAll(running_stat, data, batch)
+    summary = running_stat.summary()
+    assert summary['count'] == len(data)
+    assert running_stat.total == data.sum()
+    assert (summary['min'], summary['max']) == (data.min(), data.max())
+    assert summary['mean'] == pytest.approx(data.mean())
+    assert running_stat.variance() == pytest.approx(data.var())
+    assert summary['std'] == pytest.approx(data.std())
+
+
+@pytest.mark.parametrize('q', (0, 1, 25, 50, 90, 99, 100))
+def test_percentiles_are_within_the_precision(q):
+    data = values(20000, seed=q)
+    running_stat = stats.RunningStat(PRECISION)
+    running_stat.addMany(data)
+    exact = np.sort(data)[int(q / 100 * (len(data) - 1))]
+    assert abs(running_stat.percentile(q) - exact) <= PRECISION * exact + 1e-9
+
+
+def test_percentiles_of_nothing_and_without_a_sketch():
+    assert stats.RunningStat(PRECISION).percentile(50) == 0
+    running_stat = stats.RunningStat()
+    running_stat.addMany(values(100))
+    assert running_stat.percentile(50) is None
+    assert 'p50' not in running_stat.summary()
+
+
+def test_merge_equals_adding_everything_to_one():
+    data = values(7000)
+    merged, one = stats.RunningStat(PRECISION), stats.RunningStat(PRECISION)
+    parts = [stats.RunningStat(PRECISION) for _ in range(3)]
+    for part, chunk in zip(parts, np.array_split(data, 3)):
+        part.addMany(chunk[:-1])
+        part.add(int(chunk[-1]))
+        merged.merge(part)
+    one.addMany(data)
+    assert merged.summary() == pytest.approx(one.summary())
+    assert merged.buckets == one.buckets and merged.zeros == one.zeros
+
+
+@pytest.mark.parametrize('other_precision', (None, 0.05))
+def test_merge_rejects_another_precision(other_precision):
+    running_stat = stats.RunningStat(PRECISION)
+    other = stats.RunningStat(other_precision)
+    other.addMany(values(100))
+    with pytest.raises(ValueError):
+        running_stat.merge(other)
+    running_stat.merge(stats.RunningStat(other_precision))
+    assert running_stat.count == 0
+
+
+def test_merge_all_keeps_percentiles_only_at_the_precision_of_the_stats():
+    searches = []
+    for seed in range(4):
+        search = stats.Stats(PRECISION)
+        search.addFrontierSizes(values(300, seed))
+        searches.append(search)
+    merged = stats.mergeAll(searches, PRECISION)
+    assert merged.queries == 4 and merged.frontier_sizes.count == 1200
+    assert merged.report()['frontier_size']['p50'] is not None
+    assert 'p50' not in stats.mergeAll(searches).report()['frontier_size']
+    with pytest.raises(ValueError):
+        stats.mergeAll(searches, 0.05)
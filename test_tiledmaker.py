@@ -0,0 +1,81 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Checks TiledGraphMaker against one Delaunay triangulation of all its nodes: the edges the tiles keep must be edges
+# of it, each kept by one tile only, and the ones left out may only run along the border of the map. Small tiles are
+# used, so the maps span many of them.
+# Usage:
+#   python -m pytest -q test_tiledmaker.py
+
+import numpy as np
+import pytest
+import scipy.spatial as spatial
+
+import roadmap
+import tiledmaker
+from node import Node
+
+LAYOUTS = ((1000, 8, 4), (700, 6, 6), (2000, 10, 3))
+
+
+def tileEdgeKeys(maker):
+    """
+    Returns the (lower, higher) node index pairs of the edges of every tile of maker, tile after tile
+    """
+    keys = []
+    tile_rows, tile_cols = maker.tileCount()
+    for tile_row in range(tile_rows):
+        for tile_col in range(tile_cols):
+            keys.extend((min(u, v), max(u, v)) for u, v in maker.tileEdges(tile_row, tile_col)[0].tolist())
+    return keys
+
+
+def delaunayKeys(points):
+    """
+    Returns the set of the (lower, higher) point index pairs of the Delaunay triangulation of points
+    """
+    return {(min(a, b), max(a, b)) for simplex in spatial.Delaunay(points).simplices.tolist()
+            for a, b in ((simplex[0], simplex[1]), (simplex[1], simplex[2]), (simplex[2], simplex[0]))}
+
+
+@pytest.mark.parametrize('node_count, tile_cells, halo', LAYOUTS)
+@pytest.mark.parametrize('seed', (0, 1))
+def test_tile_edges_are_global_delaunay_edges_once_each(node_count, tile_cells, halo, seed):
+    maker = tiledmaker.TiledGraphMaker(node_count, seed=seed, edge_loss=0, tile_cells=tile_cells, halo=halo)
+    assert maker.tileCount()[0] * maker.tileCount()[1] >= 9
+    indices, points = maker.regionNodes(0, maker.rows, 0, maker.cols)
+    assert indices.tolist() == list(range(node_count))
+    keys = tileEdgeKeys(maker)
+    assert len(keys) == len(set(keys))
+    triangulated = delaunayKeys(points)
+    assert set(keys) <= triangulated
+    # the edges left out run along the border of the map: both their ends are in the outer halo of cells
+    rows, cols = indices // maker.cols, indices % maker.cols
+    near_border = (rows < halo) | (rows >= maker.rows - 1 - halo) | (cols < halo) | (cols >= maker.cols - halo)
+    left_out = triangulated - set(keys)
+    assert all(near_border[u] and near_border[v] for u, v in left_out)
+    assert len(left_out) < 0.03 * len(triangulated)
+
+
+def test_nodes_keep_their_distance_and_labels():
+    maker = tiledmaker.TiledGraphMaker(1500, seed=3, tile_cells=8)
+    _, points = maker.regionNodes(0, maker.rows, 0, maker.cols)
+    distances, _ = spatial.cKDTree(points).query(points, k=2)
+    assert distances[:, 1].min() >= maker.mindist
+    Node.reset(Node)
+    assert [tiledmaker.nodeLabel(i) for i in range(1500)] == [Node(0, 0).label for _ in range(1500)]
+
+
+def test_same_seed_gives_the_same_export(tmp_path):
+    outfiles = [str(tmp_path / name) for name in ('first', 'second', 'other')]
+    written = [tiledmaker.TiledGraphMaker(900, seed=seed, tile_cells=8).export(outfile)
+               for seed, outfile in zip((7, 7, 8), outfiles)]
+    texts = []
+    for outfile in outfiles:
+        with open(outfile + '.txt') as f:
+            texts.append(f.read())
+    assert texts[0] == texts[1] and texts[0] != texts[2]
+    assert written[0] == texts[0].count('\n')
+    road_map = roadmap.RoadMap(outfiles[0] + '.txt')
+    assert len(road_map.edge_values) == written[0] and len(road_map) <= 900
+    assert np.all(road_map.edge_values > 0)
@@ -0,0 +1,308 @@
+# This code is written by Goutamkumar Tulajappa Kalburgi. NAU Email ID: gk325@nau.edu
+__author__ = "Goutamkumar Tulajappa Kalburgi (gk325@nau.edu)"
+
+# Generates very large random road maps in bounded memory, in the text format GraphMaker.export writes.
+# Usage:
+#   python tiledmaker.py 4000000 big          # writes big.txt, a 4M node map (about 10M edges)
+#   python tiledmaker.py 4000000 big 7        # the same with seed 7: the same seed always gives the same map
+
+import sys
+
+import numpy as np
+import scipy.sparse as sparse
+import scipy.spatial as spatial
+from scipy.sparse import csgraph
+
+
+def nodeLabel(index):
+    """
+    Returns the label of the node at index (from 0), the same label GraphMaker gives its index-th Node:
+    A to Y, then AA, AB, ..., counting in base 26
+    """
+    index += 1
+    out = []
+    while index > 25:
+        out.append(index % 26)
+        index = int(index / 26)
+    out.append(index - 1)
+    return ''.join(chr(65 + x) for x in reversed(out))
+
+
+def onCircle(a, b, c, d):
+    """
+    Tells, for (n, 2) arrays of integer points, where d lies exactly on the circle through a, b and c. The in-circle
+    determinant is worked out in floating point first, and again with Python integers wherever it is too close to 0
+    for rounding to be ruled out
+    """
+    def determinant(a, b, c):
+        def lift(p):
+            return p[:, 0] * p[:, 0] + p[:, 1] * p[:, 1]
+
+        def cross(p, q):
+            return p[:, 0] * q[:, 1] - p[:, 1] * q[:, 0]
+        terms = (lift(a) * cross(b, c), lift(b) * cross(c, a), lift(c) * cross(a, b))
+        return sum(terms), sum(abs(t) for t in terms)
+
+    rounded, bound = determinant(*((p - d).astype(np.float64) for p in (a, b, c)))
+    close = np.abs(rounded) <= bound * 1e-12
+    result = np.zeros(len(d), dtype=bool)
+    if close.any():
+        exact, _ = determinant(*((p[close] - d[close]).astype(object) for p in (a, b, c)))
+        result[close] = exact == 0
+    return result
+
+
+def clearOf(centers, radii, boxes):
+    """
+    Tells which of the circles of the given centers ((n, 2) array) and radii have no point strictly inside any of
+    the boxes, given as (left, top, right, bottom)
+    """
+    clear = np.isfinite(radii) & np.isfinite(centers).all(axis=1)
+    for left, top, right, bottom in boxes:
+        gaps = centers - np.clip(centers, (left, top), (right, bottom))
+        clear &= np.hypot(gaps[:, 0], gaps[:, 1]) >= radii
+    return clear
+
+
+class TiledGraphMaker:
+    """A class to represent a generator of very large random road maps, made tile by tile in bounded memory.
+    ...
+    The nodes sit one per cell of a square grid of spacing x spacing cells, each at a random spot at least mindist/2
+    from the borders of its cell, so any two nodes are at least mindist apart. The random spots of a tile of
+    tile_cells x tile_cells cells only depend on the seed and the tile, so the nodes of any tile can be made again
+    whenever they are needed. The map is made one tile at a time: the nodes of the tile plus a halo of cells around
+    it are triangulated (Delaunay, as GraphMaker does) and the tile keeps the edges whose midpoint lies inside it and
+    that are no longer than the halo. Only the triangles whose circumcircle lies inside the cells triangulated count
+    (see triangulate), so every edge kept is an edge of the triangulation of the whole map, and is kept by exactly
+    one tile; the edges of the map never cross. Now and then a long edge along the border of the map, which no tile
+    can vouch for, is left out. The edges of a tile are written to the map file as soon as the tile
+    is done; memory use depends on tile_cells only, never on node_count.
+
+    Attributes
+    ----------
+    node_count : int
+        number of nodes (cells) of the map
+    seed : int
+        seed of every random choice; the same seed always gives the same map
+    mindist : float
+        minimum distance between two nodes
+    spacing : float
+        width and height of a cell
+    dist_distortion : float
+        edge values are the straight line distance made longer by a random part of up to dist_distortion of it,
+        as GraphMaker.distDistortion
+    edge_loss : float
+        share of the edges randomly dropped, as GraphMaker.edgeLoss
+    tile_cells : int
+        width and height of a tile, in cells
+    halo : int
+        width of the border of cells around a tile triangulated with it
+    cols : int
+        number of cells in a row of the grid
+    rows : int
+        number of rows of cells of the grid; the last one may be partly empty
+    """
+
+    def __init__(self, node_count, seed=None, mindist=60, spacing=None, dist_distortion=0.3, edge_loss=0.1,
+                 tile_cells=256, halo=4):
+        self.node_count = node_count
+        self.seed = int(np.random.SeedSequence(seed).entropy)
+        self.mindist = mindist
+        self.spacing = 2 * mindist if spacing is None else spacing
+        self.dist_distortion = dist_distortion
+        self.edge_loss = edge_loss
+        self.tile_cells = tile_cells
+        self.halo = min(halo, tile_cells)
+        self.cols = max(1, int(np.ceil(np.sqrt(node_count))))
+        self.rows = -(-node_count // self.cols)
+
+    def tileCount(self):
+        """
+        Returns the number of (rows, columns) of tiles
+        """
+        return -(-self.rows // self.tile_cells), -(-self.cols // self.tile_cells)
+
+    def tileSpots(self, tile_row, tile_col):
+        """
+        Returns the (x, y) spots of every cell of a tile, as a (tile_cells, tile_cells, 2) array of integer
+        coordinates; cells outside the grid get spots too, they are just never used
+        """
+        rng = np.random.default_rng((self.seed, tile_row, tile_col))
+        offsets = self.mindist / 2 + rng.random((self.tile_cells, self.tile_cells, 2)) * (self.spacing - self.mindist)
+        cells = np.arange(self.tile_cells) * self.spacing
+        xs = 1 + (tile_col * self.tile_cells * self.spacing + cells)[np.newaxis, :] + offsets[:, :, 0]
+        ys = 1 + (tile_row * self.tile_cells * self.spacing + cells)[:, np.newaxis] + offsets[:, :, 1]
+        return np.stack((xs, ys), axis=2).astype(np.int64)
+
+    def regionNodes(self, row0, row1, col0, col1):
+        """
+        Returns the node indices and (x, y) locations of the nodes in the cells of rows row0:row1 and columns
+        col0:col1 of the grid, making the spots of every tile the region overlaps
+        """
+        row0, row1 = max(row0, 0), min(row1, self.rows)
+        col0, col1 = max(col0, 0), min(col1, self.cols)
+        t = self.tile_cells
+        spots = np.empty((row1 - row0, col1 - col0, 2), dtype=np.int64)
+        for tile_row in range(row0 // t, (row1 - 1) // t + 1):
+            for tile_col in range(col0 // t, (col1 - 1) // t + 1):
+                r0, r1 = max(row0, tile_row * t), min(row1, (tile_row + 1) * t)
+                c0, c1 = max(col0, tile_col * t), min(col1, (tile_col + 1) * t)
+                tile = self.tileSpots(tile_row, tile_col)
+                spots[r0 - row0:r1 - row0, c0 - col0:c1 - col0] = \
+                    tile[r0 - tile_row * t:r1 - tile_row * t, c0 - tile_col * t:c1 - tile_col * t]
+        indices = (np.arange(row0, row1)[:, np.newaxis] * self.cols + np.arange(col0, col1)).ravel()
+        valid = indices < self.node_count
+        return indices[valid], spots.reshape(-1, 2)[valid]
+
+    def outsideBoxes(self, row0, row1, col0, col1):
+        """
+        Returns the boxes, as (left, top, right, bottom), that together cover the nodes of the map outside the cells of
+        rows row0:row1 and columns col0:col1; a node is never closer than mindist/2 to the border of its cell
+        """
+        margin = self.mindist / 2 - 1
+        boxes = []
+        full, rest = divmod(self.node_count, self.cols)
+        for top, bottom, width in ((0, full, self.cols), (full, full + 1, rest)):
+            for r0, r1, c0, c1 in ((top, min(bottom, row0), 0, width), (max(top, row1), bottom, 0, width),
+                                   (max(top, row0), min(bottom, row1), 0, min(width, col0)),
+                                   (max(top, row0), min(bottom, row1), max(col1, 0), width)):
+                if r0 < r1 and c0 < c1:
+                    boxes.append((1 + c0 * self.spacing + margin, 1 + r0 * self.spacing + margin,
+                                  1 + c1 * self.spacing - margin, 1 + r1 * self.spacing - margin))
+        return boxes
+
+    def triangulate(self, indices, points, row0, row1, col0, col1):
+        """
+        Triangulates the nodes of the cells of rows row0:row1 and columns col0:col1 (node indices and locations as
+        regionNodes gives them) and returns the pairs of positions in points, lowest first, of the edges that are
+        sure to be edges of the triangulation of the whole map: those of the triangles whose circumcircle lies
+        inside these cells or off the map, where no other node can be. Where four or more nodes lie on one circle,
+        which nodes at integer coordinates often do, every triangulation of the polygon they make is a Delaunay one
+        and Qhull picks any; the polygon is then always cut into a fan from its node of lowest index, so the
+        tiles around it never pick different, crossing, edges
+        """
+        triangulation = spatial.Delaunay(points)
+        simplices, neighbors = triangulation.simplices.astype(np.int64), triangulation.neighbors
+        boxes = self.outsideBoxes(row0, row1, col0, col1)
+        corners = points[simplices].astype(np.float64)
+        b, c = corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            twice_area = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+            b2, c2 = (b * b).sum(axis=1), (c * c).sum(axis=1)
+            offsets = np.column_stack((c[:, 1] * b2 - b[:, 1] * c2, b[:, 0] * c2 - c[:, 0] * b2)) / twice_area[:, None]
+        centers, radii = corners[:, 0] + offsets, np.hypot(offsets[:, 0], offsets[:, 1])
+        sure = clearOf(centers, radii, boxes)
+
+        # an edge on the hull of these nodes is one of the map too when a circle through its ends, bulging out of the
+        # hull more than the circumcircle of its triangle (so still with no node of these cells in it), is clear
+        hull_triangle, hull_side = np.nonzero(neighbors == -1)
+        hull_ends = np.column_stack((simplices[hull_triangle, (hull_side + 1) % 3],
+                                     simplices[hull_triangle, (hull_side + 2) % 3]))
+        middles = (points[hull_ends[:, 0]] + points[hull_ends[:, 1]]) / 2
+        along = (points[hull_ends[:, 1]] - points[hull_ends[:, 0]]).astype(np.float64)
+        lengths = np.hypot(along[:, 0], along[:, 1])
+        normals = np.column_stack((along[:, 1], -along[:, 0])) / lengths[:, None]
+        normals[((middles - points[simplices[hull_triangle, hull_side]]) * normals).sum(axis=1) < 0] *= -1
+        bulges = np.maximum(((centers[hull_triangle] - middles) * normals).sum(axis=1), 0)
+        hull = np.zeros(len(hull_ends), dtype=bool)
+        for k in range(8):
+            bulge = bulges + lengths * 4 ** k / 8
+            hull |= clearOf(middles + normals * bulge[:, None], np.hypot(lengths / 2, bulge), boxes)
+
+        # the edges between two triangles with the same circumcircle: the diagonals of polygons of cocircular nodes
+        count = len(simplices)
+        triangle, side = np.repeat(np.arange(count), 3), np.tile(np.arange(3), count)
+        other = neighbors.ravel()
+        inner = other > triangle
+        triangle, side, other = triangle[inner], side[inner], other[inner]
+        ends = np.column_stack((simplices[triangle, (side + 1) % 3], simplices[triangle, (side + 2) % 3]))
+        far = simplices[other, (neighbors[other] == triangle[:, None]).argmax(axis=1)]
+        ties = onCircle(points[ends[:, 0]], points[ends[:, 1]], points[simplices[triangle, side]], points[far])
+
+        pairs = np.concatenate((simplices[sure][:, [0, 1]], simplices[sure][:, [1, 2]], simplices[sure][:, [2, 0]],
+                                hull_ends[hull]))
+        pairs.sort(axis=1)
+        keys = np.unique(pairs[:, 0] * len(points) + pairs[:, 1])
+        if ties.any():
+            ends = np.sort(ends[ties], axis=1)
+            keys = np.setdiff1d(keys, ends[:, 0] * len(points) + ends[:, 1])
+            links = sparse.coo_matrix((np.ones(ties.sum()), (triangle[ties], other[ties])), shape=(count, count))
+            labels = csgraph.connected_components(links, directed=False)[1]
+            fans = []
+            for label in np.unique(labels[triangle[ties]]).tolist():
+                members = np.flatnonzero(labels == label)
+                if not sure[members].any():
+                    continue
+                polygon = np.unique(simplices[members])
+                around = points[polygon] - points[polygon].mean(axis=0)
+                polygon = polygon[np.argsort(np.arctan2(around[:, 1], around[:, 0]))]
+                polygon = np.roll(polygon, -int(np.argmin(indices[polygon])))
+                fans.extend((polygon[0], v) for v in polygon[2:-1].tolist())
+            if fans:
+                fans = np.sort(np.array(fans, dtype=np.int64), axis=1)
+                keys = np.union1d(keys, fans[:, 0] * len(points) + fans[:, 1])
+        return np.column_stack((keys // len(points), keys % len(points)))
+
+    def tileEdges(self, tile_row, tile_col):
+        """
+        Makes the edges a tile keeps
+        :return:
+            (node index pairs, edge values, locations of the first ends, locations of the second ends) of the edges
+        """
+        t, h = self.tile_cells, self.halo
+        region = (tile_row * t - h, (tile_row + 1) * t + h, tile_col * t - h, (tile_col + 1) * t + h)
+        indices, points = self.regionNodes(*region)
+        empty = np.empty((0, 2), dtype=np.int64)
+        if len(indices) < 2:
+            return empty, np.empty(0, dtype=np.int64), empty, empty
+        if len(indices) == 2:
+            pairs = np.array([[0, 1]])
+        else:
+            pairs = self.triangulate(indices, points, *region)
+        p1, p2 = points[pairs[:, 0]], points[pairs[:, 1]]
+        # a tile can only vouch for edges shorter than its halo; longer ones are slivers along the hull of the map
+        short = np.hypot(p1[:, 0] - p2[:, 0], p1[:, 1] - p2[:, 1]) <= h * self.spacing
+        pairs, p1, p2 = pairs[short], p1[short], p2[short]
+        middle = (p1 + p2) / 2
+        low = 1 + np.array([tile_col, tile_row]) * t * self.spacing
+        owned = ((middle >= low) & (middle < low + t * self.spacing)).all(axis=1)
+        pairs, p1, p2 = pairs[owned], p1[owned], p2[owned]
+        rng = np.random.default_rng((self.seed, tile_row, tile_col, 1))
+        kept = rng.random(len(pairs)) > self.edge_loss
+        pairs, p1, p2 = pairs[kept], p1[kept], p2[kept]
+        dists = np.hypot(p1[:, 0] - p2[:, 0], p1[:, 1] - p2[:, 1]).astype(np.int64)
+        values = (dists + rng.random(len(dists)) * (dists * self.dist_distortion)).astype(np.int64)
+        return indices[pairs], values, p1, p2
+
+    def tileLines(self, tile_row, tile_col):
+        """
+        Returns the text lines (see GraphMaker.export) of the edges a tile keeps
+        """
+        ends, values, p1, p2 = self.tileEdges(tile_row, tile_col)
+        labels = {i: nodeLabel(i) for i in np.unique(ends).tolist()}
+        return ["('%s', '%s', %d, [%d, %d], [%d, %d])\n" % (labels[u], labels[v], w, x1, y1, x2, y2)
+                for (u, v), w, (x1, y1), (x2, y2) in zip(ends.tolist(), values.tolist(), p1.tolist(), p2.tolist())]
+
+    def export(self, outfile):
+        """
+        Writes the map to outfile.txt tile by tile, as GraphMaker.export does
+        :return:
+            number of edges written
+        """
+        written = 0
+        tile_rows, tile_cols = self.tileCount()
+        with open(outfile + '.txt', 'w') as out:
+            for tile_row in range(tile_rows):
+                for tile_col in range(tile_cols):
+                    lines = self.tileLines(tile_row, tile_col)
+                    out.write(''.join(lines))
+                    written += len(lines)
+        return written
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (3, 4):
+        print('usage: python tiledmaker.py node_count outfile [seed]')
+        sys.exit(2)
+    maker = TiledGraphMaker(int(sys.argv[1]), None if len(sys.argv) == 3 else int(sys.argv[3]))
+    print('Wrote', maker.export(sys.argv[2]), 'edges to', sys.argv[2] + '.txt')